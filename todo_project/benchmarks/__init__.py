@@ -0,0 +1,5 @@
+"""Performance benchmarks for the todo API.
+
+Each module is runnable from the ``todo_project`` directory, e.g.
+``python -m benchmarks.db_writes --help``.
+"""
@@ -0,0 +1,256 @@
+"""Latency, query-count and memory benchmark of the task and auth endpoints.
+
+For every dataset size a fresh user is seeded with that many tasks, then each
+``TaskViewSet`` action and the ``register``/``login``/``logout`` views are called
+``--iterations`` times through the API client. Afterwards the in-process load generator
+hits the WSGI and ASGI applications concurrently. The report is written as JSON; with
+``--baseline`` it is compared against a previous report and the command exits with
+status 1 on any regression.
+
+Example::
+
+    python -m benchmarks.api --sizes 10,1000,100000 --output bench.json
+    python -m benchmarks.api --sizes 10,1000 --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import os
+import platform
+import sys
+import tempfile
+import time
+from itertools import count
+from pathlib import Path
+
+from .harness import compare, measure, read_report, setup_django, write_report
+
+DEFAULT_SIZES = "10,1000,100000"
+PASSWORD = "Password123!"
+_usernames = count()
+
+
+def _scenarios(user, token):
+    """Returns ``(name, setup, call)`` triples covering every endpoint."""
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+    from tasks.models import Task
+    from tests.factories.tasks import TaskFactory
+    from tests.factories.users import UserFactory
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    anonymous = APIClient()
+    sample = Task.objects.filter(user=user).order_by("-created", "id").first()
+    sample = sample or TaskFactory(user=user)
+    detail = f"/api/tasks/{sample.pk}/"
+    # Logout deletes the caller's token, so it runs as a separate user.
+    logout_user = UserFactory()
+
+    def fresh_task():
+        return TaskFactory(user=user)
+
+    def fresh_token():
+        Token.objects.filter(user=logout_user).delete()
+        return Token.objects.create(user=logout_user)
+
+    return [
+        ("tasks-list", None, lambda _: client.get("/api/tasks/")),
+        (
+            "tasks-list-filtered",
+            None,
+            lambda _: client.get(
+                "/api/tasks/", {"is_completed": "true", "ordering": "title"}
+            ),
+        ),
+        ("tasks-list-search", None, lambda _: client.get("/api/tasks/?search=task")),
+        ("tasks-retrieve", None, lambda _: client.get(detail)),
+        (
+            "tasks-create",
+            None,
+            lambda _: client.post("/api/tasks/", {"title": "New"}, format="json"),
+        ),
+        (
+            "tasks-update",
+            None,
+            lambda _: client.put(detail, {"title": "Replaced"}, format="json"),
+        ),
+        (
+            "tasks-partial-update",
+            None,
+            lambda _: client.patch(detail, {"is_completed": True}, format="json"),
+        ),
+        (
+            "tasks-destroy",
+            fresh_task,
+            lambda task: client.delete(f"/api/tasks/{task.pk}/"),
+        ),
+        ("tasks-export", None, lambda _: _drain(client.get("/api/tasks/export/"))),
+        (
+            "tasks-bulk",
+            lambda: TaskFactory.create_batch(10, user=user),
+            lambda tasks: client.post(
+                "/api/tasks/bulk/",
+                {
+                    "create": [{"title": f"Bulk {i}"} for i in range(10)],
+                    "update": [{"id": t.pk, "is_completed": True} for t in tasks[:5]],
+                    "delete": [t.pk for t in tasks[5:]],
+                },
+                format="json",
+            ),
+        ),
+        ("tasks-changes", None, lambda _: client.get("/api/tasks/changes/")),
+        ("tasks-stats", None, lambda _: client.get("/api/tasks/stats/")),
+        (
+            "auth-register",
+            lambda: f"bench-{next(_usernames)}",
+            lambda username: anonymous.post(
+                "/api/auth/register/",
+                {"username": username, "password": PASSWORD},
+                format="json",
+            ),
+        ),
+        (
+            "auth-login",
+            None,
+            lambda _: anonymous.post(
+                "/api/auth/login/",
+                {"username": user.username, "password": PASSWORD},
+                format="json",
+            ),
+        ),
+        (
+            "auth-logout",
+            fresh_token,
+            lambda fresh: anonymous.post(
+                "/api/auth/logout/", HTTP_AUTHORIZATION=f"Token {fresh.key}"
+            ),
+        ),
+    ]
+
+
+def _drain(response):
+    # Streaming responses do their work while the body is consumed; chunks are discarded
+    # so the peak memory reflects the server side only.
+    for _ in response.streaming_content:
+        pass
+    return response
+
+
+def run_scenarios(sizes, iterations):
+    """Seeds each dataset size and measures every endpoint against it.
+
+    Args:
+        sizes (list): Task counts to seed, one user per size.
+        iterations (int): Timed calls per endpoint and size.
+
+    Returns:
+        tuple: ``{"<size>/<endpoint>": metrics}`` and ``{size: (user, token)}``.
+    """
+    from .seed import seed_user
+
+    results = {}
+    users = {}
+    for size in sizes:
+        user, token = seed_user(size)
+        users[size] = (user, token)
+        for name, setup, call in _scenarios(user, token):
+            key = f"{size}/{name}"
+            results[key] = measure(call, iterations, setup=setup)
+            if results[key]["status"] >= 400:
+                raise RuntimeError(f"{key} answered {results[key]['status']}")
+    return results, users
+
+
+def run_load_tests(env, token, sample_id, concurrency, requests):
+    """Runs the read-mostly load mix against both interfaces."""
+    from .load import run_load
+
+    paths = [
+        "/api/tasks/",
+        "/api/tasks/?is_completed=true",
+        f"/api/tasks/{sample_id}/",
+    ]
+    return {
+        interface: run_load(interface, env, token.key, paths, concurrency, requests)
+        for interface in ("wsgi", "asgi")
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Tasks per seeded user.")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--no-load", action="store_true", help="Skip the load tests.")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="Previous report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            "DB_ENGINE": "sqlite",
+            "DB_NAME": str(Path(directory) / "bench.sqlite3"),
+            # Keep the per-call hashing cost of login/register out of the endpoint figures
+            # unless the caller asks for it; benchmarks.password_hashing measures it.
+            "PASSWORD_PBKDF2_ITERATIONS": os.getenv(
+                "PASSWORD_PBKDF2_ITERATIONS", "1000"
+            ),
+        }
+        setup_django(env)
+        import django
+        from django.core.management import call_command
+        from django.db import connection
+
+        call_command("migrate", verbosity=0)
+        began = time.perf_counter()
+        results, users = run_scenarios(sizes, args.iterations)
+        load = {}
+        if not args.no_load:
+            connection.close()
+            user, token = users[max(sizes)]
+            sample = user.tasks.order_by("-created", "id").first()
+            load = run_load_tests(
+                env, token, sample.pk, args.concurrency, args.requests
+            )
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "cpus": os.cpu_count(),
+            "sizes": sizes,
+            "iterations": args.iterations,
+            "seconds": round(time.perf_counter() - began, 1),
+        },
+        "results": results,
+        "load": load,
+    }
+    write_report(report, args.output)
+
+    print(f"{'endpoint':<34}{'p50 ms':>9}{'p99 ms':>9}{'queries':>9}{'peak KiB':>10}")
+    for key, row in results.items():
+        print(
+            f"{key:<34}{row['p50_ms']:>9}{row['p99_ms']:>9}"
+            f"{row['queries']:>9}{row['peak_kib']:>10}"
+        )
+    for interface, row in load.items():
+        print(
+            f"load/{interface:<29}{row['p50_ms']:>9}{row['p99_ms']:>9}"
+            f"  {row['requests_per_second']} req/s, {row['errors']} errors"
+        )
+    print(f"Report written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, read_report(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
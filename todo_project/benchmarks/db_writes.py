@@ -0,0 +1,122 @@
+"""Concurrent write throughput for each database profile.
+
+Every profile runs in fresh processes with its own environment, so the settings module picks
+up the profile exactly as a deployed worker would. All writer processes start together and
+each inserts tasks one at a time, in its own transaction, through the ORM.
+
+Example::
+
+    python -m benchmarks.db_writes --profiles sqlite-default,sqlite-tuned --workers 8
+    DB_HOST=localhost python -m benchmarks.db_writes --profiles postgres,postgres-pool
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+PROFILES = {
+    "sqlite-default": {"DB_ENGINE": "sqlite", "DB_SQLITE_TUNING": "False"},
+    "sqlite-tuned": {"DB_ENGINE": "sqlite", "DB_SQLITE_TUNING": "True"},
+    "postgres": {"DB_ENGINE": "postgres", "DB_POOL": "False"},
+    "postgres-pool": {"DB_ENGINE": "postgres", "DB_POOL": "True"},
+}
+
+
+def _setup_django(env):
+    os.environ.update(env)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo_project.settings")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+    import django
+
+    django.setup()
+
+
+def _prepare(env, result):
+    _setup_django(env)
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    user, _ = get_user_model().objects.get_or_create(username="bench-writer")
+    result.put(user.pk)
+
+
+def _writer(env, user_id, writes, start, result):
+    _setup_django(env)
+    from django.db import OperationalError, connection
+    from tasks.models import Task
+
+    connection.ensure_connection()
+    errors = 0
+    start.wait()
+    for index in range(writes):
+        try:
+            Task.objects.create(user_id=user_id, title=f"Task {os.getpid()}-{index}")
+        except OperationalError:
+            errors += 1
+    result.put(errors)
+
+
+def run_profile(name, workers, writes):
+    """Runs one profile and returns its throughput figures."""
+    context = multiprocessing.get_context("spawn")
+    env = dict(PROFILES[name])
+    with tempfile.TemporaryDirectory() as directory:
+        if env["DB_ENGINE"] == "sqlite":
+            env["DB_NAME"] = str(Path(directory) / "bench.sqlite3")
+
+        result = context.Queue()
+        prepare = context.Process(target=_prepare, args=(env, result))
+        prepare.start()
+        prepare.join()
+        user_id = result.get()
+
+        start = context.Event()
+        processes = [
+            context.Process(target=_writer, args=(env, user_id, writes, start, result))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        time.sleep(1)  # Let every writer import Django and connect.
+        began = time.perf_counter()
+        start.set()
+        errors = sum(result.get() for _ in processes)
+        elapsed = time.perf_counter() - began
+        for process in processes:
+            process.join()
+
+    committed = workers * writes - errors
+    return {
+        "profile": name,
+        "workers": workers,
+        "committed": committed,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "writes_per_second": round(committed / elapsed, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", default="sqlite-default,sqlite-tuned")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="Inserts per worker.")
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'profile':<16}{'workers':>8}{'committed':>11}{'errors':>8}{'writes/s':>10}"
+    )
+    for name in args.profiles.split(","):
+        row = run_profile(name.strip(), args.workers, args.writes)
+        print(
+            f"{row['profile']:<16}{row['workers']:>8}{row['committed']:>11}"
+            f"{row['errors']:>8}{row['writes_per_second']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Cost of deleting a user with many tasks, as one cascade and in batches.
+
+For each task count a user is seeded and deleted with ``user.delete()`` (``cascade``) and
+with ``tasks.services.delete_user`` (``batched``, pausing ``--pause`` seconds between
+batches). While the deletion runs, a second thread keeps inserting tasks for another user,
+one short transaction at a time, and records how long each insert took: the longest one is
+how long the deletion kept other writers out of the database at a stretch. A separate
+traced run reports the peak Python memory.
+
+Example::
+
+    python -m benchmarks.deletion --tasks 1000,10000,100000 --batch-size 1000
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from tasks.constants import DELETE_BATCH_PAUSE, DELETE_BATCH_SIZE
+
+from .harness import setup_django
+
+STRATEGIES = ("cascade", "batched")
+
+# Pause between the concurrent writer's inserts, so it measures waits, not throughput.
+WRITER_PAUSE = 0.002
+
+
+def _delete(strategy, user, batch_size, pause):
+    from tasks.services import delete_user
+
+    if strategy == "cascade":
+        user.delete()
+    else:
+        delete_user(user, batch_size=batch_size, pause=pause)
+
+
+def _writer(user_id, stop, waits, errors):
+    from django.db import OperationalError, connection
+    from tasks.models import Task
+
+    try:
+        while not stop.is_set():
+            began = time.perf_counter()
+            try:
+                Task.objects.create(user_id=user_id, title="Concurrent write")
+            except OperationalError:
+                errors.append(1)
+            waits.append(time.perf_counter() - began)
+            time.sleep(WRITER_PAUSE)
+    finally:
+        connection.close()
+
+
+def run_strategy(strategy, task_count, batch_size, pause):
+    """Deletes a freshly seeded user twice (timed, then traced) and reports the costs.
+
+    Returns:
+        dict: Seconds taken, peak KiB, and the concurrent writer's longest wait and errors.
+    """
+    from tests.factories.users import UserFactory
+
+    from .seed import seed_user
+
+    bystander = UserFactory()
+    user, _ = seed_user(task_count)
+    stop = threading.Event()
+    waits, errors = [], []
+    writer = threading.Thread(target=_writer, args=(bystander.pk, stop, waits, errors))
+    writer.start()
+    time.sleep(0.05)
+    began = time.perf_counter()
+    _delete(strategy, user, batch_size, pause)
+    elapsed = time.perf_counter() - began
+    stop.set()
+    writer.join()
+
+    user, _ = seed_user(task_count)
+    tracemalloc.start()
+    try:
+        _delete(strategy, user, batch_size, pause)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(elapsed, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "writer_max_wait_ms": round(max(waits) * 1000, 1),
+        "writer_errors": len(errors),
+    }
+
+
+def run_strategies(task_counts, batch_size, pause):
+    """Runs every strategy for every task count.
+
+    Returns:
+        dict: ``{"<tasks>/<strategy>": {...}}`` as returned by ``run_strategy``.
+    """
+    return {
+        f"{count}/{strategy}": run_strategy(strategy, count, batch_size, pause)
+        for count in task_counts
+        for strategy in STRATEGIES
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", default="1000,10000,100000")
+    parser.add_argument("--batch-size", type=int, default=DELETE_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=DELETE_BATCH_PAUSE)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(
+            {"DB_ENGINE": "sqlite", "DB_NAME": str(Path(directory) / "bench.sqlite3")}
+        )
+        from django.core.management import call_command
+
+        call_command("migrate", verbosity=0)
+        results = run_strategies(
+            [int(count) for count in args.tasks.split(",")], args.batch_size, args.pause
+        )
+
+    print(
+        f"{'tasks/strategy':<20}{'seconds':>9}{'peak KiB':>10}"
+        f"{'writer max ms':>15}{'errors':>8}"
+    )
+    for key, row in results.items():
+        print(
+            f"{key:<20}{row['seconds']:>9}{row['peak_kib']:>10}"
+            f"{row['writer_max_wait_ms']:>15}{row['writer_errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Measurement and reporting helpers shared by the benchmarks."""
+
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+PERCENTILES = (50, 90, 99)
+
+
+def setup_django(env=None):
+    """Configures Django for a standalone benchmark process.
+
+    Must run before anything imports models; ``env`` is applied to ``os.environ`` first so
+    the settings module picks up the profile (database, hashers, ...) being measured.
+    """
+    os.environ.update(env or {})
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo_project.settings")
+    # The load generator sends far more requests per user than the API rate limits allow.
+    os.environ.setdefault("THROTTLE_ENABLED", "False")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+    import django
+
+    django.setup()
+
+
+def summarize(samples):
+    """Returns latency statistics in milliseconds for a list of durations in seconds."""
+    ordered = sorted(samples)
+    summary = {
+        f"p{percentile}_ms": round(_percentile(ordered, percentile) * 1000, 3)
+        for percentile in PERCENTILES
+    }
+    summary["mean_ms"] = round(statistics.fmean(ordered) * 1000, 3)
+    summary["max_ms"] = round(ordered[-1] * 1000, 3)
+    return summary
+
+
+def _percentile(ordered, percentile):
+    # Nearest-rank percentile: stable for small sample counts and never interpolates.
+    rank = max(1, -(-len(ordered) * percentile // 100))
+    return ordered[rank - 1]
+
+
+def measure(call, iterations, setup=None):
+    """Times ``call`` and records its query count and peak Python memory.
+
+    Each iteration runs ``setup()`` untimed (when given) and passes its result to ``call``.
+    Latencies come from untraced runs; a final traced run reports the peak memory, since
+    tracing allocations would distort the timings.
+
+    Args:
+        call (callable): The operation to measure, returning an HTTP response.
+        iterations (int): How many timed runs to make.
+        setup (callable): Optional per-iteration preparation.
+
+    Returns:
+        dict: Latency percentiles, queries per call, peak KiB and the last status code.
+    """
+
+    def run_once():
+        argument = setup() if setup else None
+        began = time.perf_counter()
+        response = call(argument)
+        return time.perf_counter() - began, response
+
+    samples = []
+    queries = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            elapsed, response = run_once()
+        samples.append(elapsed)
+        queries.append(len(captured))
+
+    tracemalloc.start()
+    try:
+        argument = setup() if setup else None
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        call(argument)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    return {
+        **summarize(samples),
+        "queries": max(queries),
+        "peak_kib": round(peak / 1024, 1),
+        "status": response.status_code,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Lists the regressions of ``results`` against a ``baseline`` report.
+
+    Latency and memory may grow by ``tolerance`` (a fraction) before they count as a
+    regression; query counts are deterministic, so any increase does.
+
+    Args:
+        results (dict): The report produced by this run.
+        baseline (dict): A previous report.
+        tolerance (float): Allowed relative growth, e.g. ``0.2`` for 20%.
+
+    Returns:
+        list: One message per regression, empty if there is none.
+    """
+    regressions = []
+    for key, before in baseline.get("results", {}).items():
+        after = results.get("results", {}).get(key)
+        if after is None:
+            continue
+        for metric in ("p50_ms", "p99_ms", "peak_kib"):
+            if after[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{key}: {metric} {before[metric]} -> {after[metric]}"
+                )
+        if after["queries"] > before["queries"]:
+            regressions.append(
+                f"{key}: queries {before['queries']} -> {after['queries']}"
+            )
+
+    for key, before in baseline.get("load", {}).items():
+        after = results.get("load", {}).get(key)
+        if after is None:
+            continue
+        if after["requests_per_second"] < before["requests_per_second"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"load/{key}: requests_per_second {before['requests_per_second']}"
+                f" -> {after['requests_per_second']}"
+            )
+    return regressions
+
+
+def write_report(report, path):
+    """Writes ``report`` as indented JSON."""
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def read_report(path):
+    """Reads a report written by ``write_report``."""
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
@@ -0,0 +1,175 @@
+"""In-process concurrent load generator for the WSGI and ASGI applications.
+
+Requests are handed straight to ``todo_project.wsgi.application`` (from a thread pool) or
+``todo_project.asgi.application`` (from concurrent coroutines), so the full middleware
+stack and URLconf of each interface are exercised without sockets or an external server.
+Each interface runs in its own spawned process, because the ASGI entry point selects its
+URLconf and middleware when settings load.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from .harness import setup_django, summarize
+
+HOST = "testserver"
+
+
+def _summary(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        **summarize(latencies),
+    }
+
+
+def run_wsgi_load(application, authorization, paths, concurrency, requests):
+    """Sends ``requests`` GETs, cycling through ``paths``, from ``concurrency`` threads.
+
+    Returns:
+        dict: Throughput, error count and latency percentiles.
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def send(index):
+        url = urlsplit(paths[index % len(paths)])
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "HTTP_HOST": HOST,
+            "HTTP_AUTHORIZATION": authorization,
+            "wsgi.input": io.BytesIO(b""),
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        began = time.perf_counter()
+        body = application(environ, lambda status, headers: statuses.append(status))
+        try:
+            for _ in body:
+                pass
+        finally:
+            # Closing the iterable fires ``request_finished``, as a WSGI server would.
+            body.close()
+        elapsed = time.perf_counter() - began
+        with lock:
+            latencies.append(elapsed)
+            if int(statuses[0].split()[0]) >= 400:
+                errors.append(statuses[0])
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(requests)))
+    return _summary(latencies, len(errors), time.perf_counter() - began)
+
+
+async def run_asgi_load(application, authorization, paths, concurrency, requests):
+    """Async counterpart of ``run_wsgi_load``: ``concurrency`` coroutines share the requests."""
+    latencies = []
+    errors = []
+    counter = iter(range(requests))
+
+    async def send(index):
+        url = urlsplit(paths[index % len(paths)])
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": url.path,
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", HOST.encode()),
+                (b"authorization", authorization.encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": (HOST, 80),
+        }
+        finished = asyncio.Event()
+        sent_body = False
+        statuses = []
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def reply(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+            elif not message.get("more_body", False):
+                finished.set()
+
+        began = time.perf_counter()
+        await application(scope, receive, reply)
+        latencies.append(time.perf_counter() - began)
+        if statuses[0] >= 400:
+            errors.append(statuses[0])
+
+    async def worker():
+        for index in counter:
+            await send(index)
+
+    began = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summary(latencies, len(errors), time.perf_counter() - began)
+
+
+def _load_process(interface, env, authorization, paths, concurrency, requests, result):
+    setup_django({**env, "DJANGO_SERVER_INTERFACE": interface})
+    if interface == "asgi":
+        from todo_project.asgi import application
+
+        summary = asyncio.run(
+            run_asgi_load(application, authorization, paths, concurrency, requests)
+        )
+    else:
+        from todo_project.wsgi import application
+
+        summary = run_wsgi_load(
+            application, authorization, paths, concurrency, requests
+        )
+    result.put(summary)
+
+
+def run_load(interface, env, token, paths, concurrency, requests):
+    """Runs the load generator against ``interface`` (``wsgi`` or ``asgi``) in a new process.
+
+    Args:
+        interface (str): Which application to load.
+        env (dict): Environment for the process; must point at a database file that already
+            holds the seeded data.
+        token (str): Token key sent with every request.
+        paths (list): Request paths (with query strings) to cycle through.
+        concurrency (int): Concurrent threads (WSGI) or coroutines (ASGI).
+        requests (int): Total number of requests.
+
+    Returns:
+        dict: The load summary.
+    """
+    context = multiprocessing.get_context("spawn")
+    result = context.Queue()
+    process = context.Process(
+        target=_load_process,
+        args=(interface, env, f"Token {token}", paths, concurrency, requests, result),
+    )
+    process.start()
+    summary = result.get()
+    process.join()
+    return summary
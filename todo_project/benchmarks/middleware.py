@@ -0,0 +1,123 @@
+"""Per-request cost of the middleware stack on a no-op API endpoint.
+
+``GET /api/health/`` does no work of its own, so its latency is the cost of the request
+handler and the middleware around it. It is requested ``--iterations`` times through the
+WSGI and ASGI test clients with each stack: ``full`` runs every middleware for every
+request (``API_LEAN_MIDDLEWARE=False``), ``lean`` is the default stack whose browser-only
+middleware let API requests through, and ``bare`` has no middleware at all, the floor
+either could reach. As under ``todo_project.asgi``, the ASGI stacks leave out WhiteNoise.
+
+Example::
+
+    python -m benchmarks.middleware --iterations 5000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from .harness import setup_django, summarize
+
+PATH = "/api/health/"
+INTERFACES = ("wsgi", "asgi")
+
+
+def stacks(interface="wsgi"):
+    """Returns the ``MIDDLEWARE`` list of each stack, derived from the current settings."""
+    from django.conf import settings
+
+    lean_paths = {
+        path: "tasks.middleware.Browser" + path.rsplit(".", 1)[1]
+        for path in settings.BROWSER_ONLY_MIDDLEWARE
+    }
+    full_paths = {lean: path for path, lean in lean_paths.items()}
+    full = [full_paths.get(path, path) for path in settings.MIDDLEWARE]
+    if interface == "asgi":
+        full = [path for path in full if not path.startswith("whitenoise.")]
+    return {
+        "full": full,
+        "lean": [lean_paths.get(path, path) for path in full],
+        "bare": [],
+    }
+
+
+def _time_wsgi(iterations):
+    from django.test import Client
+
+    client = Client()
+    client.get(PATH)
+    samples = []
+    for _ in range(iterations):
+        began = time.perf_counter()
+        client.get(PATH)
+        samples.append(time.perf_counter() - began)
+    return samples
+
+
+def _time_asgi(iterations):
+    from django.test import AsyncClient
+
+    async def run():
+        client = AsyncClient()
+        await client.get(PATH)
+        samples = []
+        for _ in range(iterations):
+            began = time.perf_counter()
+            await client.get(PATH)
+            samples.append(time.perf_counter() - began)
+        return samples
+
+    return asyncio.run(run())
+
+
+def run_stacks(iterations):
+    """Times the no-op endpoint through every stack and interface.
+
+    Returns:
+        dict: ``{"<interface>/<stack>": {...}}`` with the latency summary and the
+        microseconds per request saved against the full stack.
+    """
+    from django.test import override_settings
+
+    timers = {"wsgi": _time_wsgi, "asgi": _time_asgi}
+    results = {}
+    for interface in INTERFACES:
+        for name, middleware in stacks(interface).items():
+            # Each test client builds its own handler, which loads MIDDLEWARE afresh.
+            with override_settings(MIDDLEWARE=middleware):
+                samples = timers[interface](iterations)
+            results[f"{interface}/{name}"] = {
+                **summarize(samples),
+                "us_per_request": round(sum(samples) * 1e6 / iterations, 2),
+            }
+        full = results[f"{interface}/full"]["us_per_request"]
+        for name in ("lean", "bare"):
+            row = results[f"{interface}/{name}"]
+            row["us_saved"] = round(full - row["us_per_request"], 2)
+        results[f"{interface}/full"]["us_saved"] = 0.0
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(
+            {"DB_ENGINE": "sqlite", "DB_NAME": str(Path(directory) / "bench.sqlite3")}
+        )
+        results = run_stacks(args.iterations)
+
+    print(f"{'interface/stack':<18}{'us/request':>12}{'p99 ms':>10}{'us saved':>10}")
+    for key, row in results.items():
+        print(
+            f"{key:<18}{row['us_per_request']:>12}{row['p99_ms']:>10}"
+            f"{row['us_saved']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Login throughput for each password hasher profile, inline and on the hashing pool.
+
+Each run starts a fresh process with its own environment and SQLite database, creates one
+user and then has ``--threads`` threads call ``authenticate()`` (the same path as
+``POST /api/auth/login/``) for ``--seconds`` seconds. With ``--pool-workers 0`` the hashing
+runs on the calling threads and the GIL caps the process at one core; with a pool it is
+spread over that many processes. ``logins/s/core`` divides by the cores actually hashing.
+
+Example::
+
+    python -m benchmarks.password_hashing --profiles pbkdf2,scrypt,argon2 --pool-workers 0,4
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+USERNAME = "bench-login"
+PASSWORD = "bench-Password-123"
+
+
+def _run(env, threads, seconds, result):
+    os.environ.update(env)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo_project.settings")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+    import django
+
+    django.setup()
+    from django.contrib.auth import authenticate
+    from django.core.management import call_command
+    from django.db import connection
+    from tasks import hashing
+    from tasks.services import create_user
+
+    call_command("migrate", verbosity=0)
+    create_user(USERNAME, PASSWORD)
+    connection.close()
+    # Warm the pool so process start-up is not measured.
+    authenticate(username=USERNAME, password=PASSWORD)
+
+    counts = []
+    deadline = time.perf_counter() + seconds
+
+    def login_loop():
+        done = 0
+        while time.perf_counter() < deadline:
+            assert authenticate(username=USERNAME, password=PASSWORD) is not None
+            done += 1
+        counts.append(done)
+        connection.close()
+
+    workers = [threading.Thread(target=login_loop) for _ in range(threads)]
+    began = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - began
+    hashing.shutdown()
+    result.put((sum(counts), elapsed))
+
+
+def run_profile(profile, pool_workers, threads, seconds):
+    """Runs one profile/pool combination and returns its throughput figures."""
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            "DB_ENGINE": "sqlite",
+            "DB_NAME": str(Path(directory) / "bench.sqlite3"),
+            "PASSWORD_HASHER_PROFILE": profile,
+            "PASSWORD_HASHING_WORKERS": str(pool_workers),
+        }
+        result = context.Queue()
+        process = context.Process(target=_run, args=(env, threads, seconds, result))
+        process.start()
+        logins, elapsed = result.get()
+        process.join()
+
+    cores = min(pool_workers or 1, os.cpu_count() or 1)
+    rate = logins / elapsed
+    return {
+        "profile": profile,
+        "pool_workers": pool_workers,
+        "threads": threads,
+        "logins": logins,
+        "logins_per_second": round(rate, 1),
+        "logins_per_second_per_core": round(rate / cores, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", default="pbkdf2,scrypt")
+    parser.add_argument(
+        "--pool-workers",
+        default=f"0,{os.cpu_count() or 1}",
+        help="Comma-separated PASSWORD_HASHING_WORKERS values (0 hashes inline).",
+    )
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'profile':<10}{'pool':>6}{'threads':>9}{'logins':>8}"
+        f"{'logins/s':>10}{'logins/s/core':>15}"
+    )
+    for profile in args.profiles.split(","):
+        for pool_workers in args.pool_workers.split(","):
+            row = run_profile(
+                profile.strip(), int(pool_workers), args.threads, args.seconds
+            )
+            print(
+                f"{row['profile']:<10}{row['pool_workers']:>6}{row['threads']:>9}"
+                f"{row['logins']:>8}{row['logins_per_second']:>10}"
+                f"{row['logins_per_second_per_core']:>15}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Throughput of ``GET /api/tasks/`` with the stdlib JSON, orjson and MessagePack renderers.
+
+A user is seeded with ``--tasks`` tasks (10k by default) and the list endpoint is called
+``--iterations`` times per renderer and page size through the API client. ``stdlib-json``
+is DRF's ``JSONRenderer``, the renderer the API used before ``FastJSONRenderer``. Besides
+the request figures, ``render ms`` times the renderer alone on the same page, which shows
+how much of the request encoding accounts for.
+
+Example::
+
+    python -m benchmarks.renderers --tasks 10000 --page-sizes 50,500
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from .harness import measure, setup_django
+
+
+def _variants():
+    from rest_framework.renderers import JSONRenderer
+    from tasks.renderers import (
+        MSGPACK_MEDIA_TYPE,
+        FastJSONRenderer,
+        MessagePackRenderer,
+    )
+
+    return [
+        ("stdlib-json", [JSONRenderer], "application/json"),
+        ("orjson", [FastJSONRenderer], "application/json"),
+        ("msgpack", [MessagePackRenderer], MSGPACK_MEDIA_TYPE),
+    ]
+
+
+def run_variants(token, page_sizes, iterations):
+    """Measures the list endpoint for every renderer and page size.
+
+    Returns:
+        dict: ``{"<renderer>/<page size>": metrics}`` with ``requests_per_second``, the
+            renderer-only ``render_ms`` and the body size added to the harness figures.
+    """
+    from rest_framework.test import APIClient
+    from tasks.task_views import TaskViewSet
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    renderer_classes = TaskViewSet.renderer_classes
+    results = {}
+    try:
+        for name, renderers, accept in _variants():
+            TaskViewSet.renderer_classes = renderers
+            for page_size in page_sizes:
+
+                def call(_):
+                    return client.get(
+                        "/api/tasks/", {"page_size": page_size}, HTTP_ACCEPT=accept
+                    )
+
+                row = measure(call, iterations)
+                row["requests_per_second"] = round(1000 / row["mean_ms"], 1)
+                response = call(None)
+                row["body_bytes"] = len(response.content)
+                row["render_ms"] = _render_ms(renderers[0](), response.data, iterations)
+                results[f"{name}/{page_size}"] = row
+    finally:
+        TaskViewSet.renderer_classes = renderer_classes
+    return results
+
+
+def _render_ms(renderer, data, iterations):
+    began = time.perf_counter()
+    for _ in range(iterations):
+        renderer.render(data, renderer.media_type)
+    return round((time.perf_counter() - began) * 1000 / iterations, 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--page-sizes", default="50,500")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(
+            {"DB_ENGINE": "sqlite", "DB_NAME": str(Path(directory) / "bench.sqlite3")}
+        )
+        from django.core.management import call_command
+
+        from .seed import seed_user
+
+        call_command("migrate", verbosity=0)
+        _, token = seed_user(args.tasks)
+        page_sizes = [int(size) for size in args.page_sizes.split(",")]
+        results = run_variants(token, page_sizes, args.iterations)
+
+    print(
+        f"{'renderer/page':<20}{'p50 ms':>9}{'p99 ms':>9}{'req/s':>9}"
+        f"{'render ms':>11}{'bytes':>9}"
+    )
+    for key, row in results.items():
+        print(
+            f"{key:<20}{row['p50_ms']:>9}{row['p99_ms']:>9}"
+            f"{row['requests_per_second']:>9}{row['render_ms']:>11}{row['body_bytes']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
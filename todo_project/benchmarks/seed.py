@@ -0,0 +1,35 @@
+"""Seeds benchmark data with the test factories."""
+
+from rest_framework.authtoken.models import Token
+from tasks.models import Task
+from tasks.stats import rebuild_task_stats
+from tests.factories.tasks import TaskFactory
+from tests.factories.users import UserFactory
+
+BATCH_SIZE = 2000
+
+
+def seed_user(task_count, completed_every=3):
+    """Creates a user owning ``task_count`` tasks and returns ``(user, token)``.
+
+    The user comes from ``UserFactory``; tasks are built with ``TaskFactory`` and written
+    with ``bulk_create`` in batches, so seeding 100k tasks takes seconds instead of minutes.
+    Every ``completed_every``-th task is completed, giving the filters something to select.
+    Bulk inserts bypass the statistics bookkeeping, so the user's counters are rebuilt.
+    """
+    user = UserFactory()
+    # The factory sets the password after saving and does not save again.
+    user.save(update_fields=["password"])
+    batch = []
+    for index in range(task_count):
+        task = TaskFactory.build(user=user, is_completed=index % completed_every == 0)
+        task.sync_completed_at()
+        batch.append(task)
+        if len(batch) == BATCH_SIZE:
+            Task.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Task.objects.bulk_create(batch)
+    rebuild_task_stats([user.pk])
+    token, _ = Token.objects.get_or_create(user=user)
+    return user, token
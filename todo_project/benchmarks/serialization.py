@@ -0,0 +1,98 @@
+"""Rows per second of ``TaskSerializer`` against the ``TaskRowSerializer`` fast path.
+
+A user is seeded with ``--rows`` tasks, then each path fetches them all, serializes them and
+renders the JSON body ``--repeat`` times; the best run is reported, split into fetch,
+serialize and render time. Both outputs are checked to be byte-identical first.
+
+Example::
+
+    python -m benchmarks.serialization --rows 10000,100000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from .harness import setup_django
+
+
+def _model_serializer(queryset):
+    from tasks.serializers import TaskSerializer
+
+    tasks = list(queryset.all())
+    fetched = time.perf_counter()
+    data = TaskSerializer(tasks, many=True).data
+    return fetched, data
+
+
+def _row_serializer(queryset):
+    from tasks.serializers import TaskRowSerializer
+
+    serializer = TaskRowSerializer()
+    rows = list(serializer.rows(queryset))
+    fetched = time.perf_counter()
+    return fetched, serializer.serialize(rows)
+
+
+PATHS = {
+    "TaskSerializer": _model_serializer,
+    "TaskRowSerializer": _row_serializer,
+}
+
+
+def run_path(path, queryset, repeat):
+    """Returns the best of ``repeat`` runs of one path and its rendered body."""
+    from rest_framework.renderers import JSONRenderer
+
+    renderer = JSONRenderer()
+    best = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fetched, data = PATHS[path](queryset)
+        serialized = time.perf_counter()
+        body = renderer.render(data)
+        rendered = time.perf_counter()
+        timings = (fetched - began, serialized - fetched, rendered - serialized)
+        if best is None or sum(timings) < sum(best):
+            best = timings
+    return best, body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(
+            {"DB_ENGINE": "sqlite", "DB_NAME": str(Path(directory) / "bench.sqlite3")}
+        )
+        from django.core.management import call_command
+
+        from .seed import seed_user
+
+        call_command("migrate", verbosity=0)
+        print(
+            f"{'rows':>8}  {'path':<18}{'fetch ms':>10}{'serialize ms':>14}"
+            f"{'render ms':>11}{'rows/s':>11}"
+        )
+        for size in (int(rows) for rows in args.rows.split(",")):
+            user, _ = seed_user(size)
+            queryset = user.tasks.order_by("-created", "id")
+            bodies = set()
+            for path in PATHS:
+                (fetch, serialize, render), body = run_path(path, queryset, args.repeat)
+                bodies.add(body)
+                rate = size / (fetch + serialize + render)
+                print(
+                    f"{size:>8}  {path:<18}{fetch * 1000:>10.1f}"
+                    f"{serialize * 1000:>14.1f}{render * 1000:>11.1f}{rate:>11.0f}"
+                )
+            if len(bodies) != 1:
+                raise SystemExit(f"Outputs differ for {size} rows")
+
+
+if __name__ == "__main__":
+    main()
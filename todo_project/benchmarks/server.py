@@ -0,0 +1,228 @@
+"""Throughput of the gunicorn worker modes configured in ``gunicorn.conf.py``.
+
+For each ``GUNICORN_WORKER_MODE`` (``sync``, ``gthread``, ``asgi``) a real gunicorn server is
+started on a local port with the repository's configuration, and ``--concurrency`` client
+threads, each holding a keep-alive connection, send ``--requests`` GETs over HTTP. Two mixes
+are measured: ``health`` (the no-op ``/api/health/``, i.e. server and framework overhead)
+and ``tasks`` (authenticated task list, filtered list and detail of a user seeded with
+``--tasks`` tasks). The client runs in this process, so on a small machine it competes with
+the server for CPU; compare modes with each other rather than with production figures.
+Worker recycling (``GUNICORN_MAX_REQUESTS``) is off unless ``--max-requests`` is given, so
+the restarts do not show up as dropped keep-alive connections.
+
+Example::
+
+    python -m benchmarks.server --modes sync,gthread,asgi --concurrency 16 --requests 3000
+"""
+
+import argparse
+import http.client
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .harness import setup_django, summarize
+
+MODES = ("sync", "gthread", "asgi")
+HOST = "127.0.0.1"
+STARTUP_TIMEOUT = 60
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_serving(port, server):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {server.returncode}")
+        connection = http.client.HTTPConnection(HOST, port, timeout=1)
+        try:
+            connection.request("GET", "/api/health/")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+        finally:
+            connection.close()
+    raise RuntimeError(f"gunicorn did not answer within {STARTUP_TIMEOUT} s")
+
+
+def start_server(mode, env=None):
+    """Starts gunicorn with ``gunicorn.conf.py`` in ``mode`` on a free local port.
+
+    Args:
+        mode (str): The ``GUNICORN_WORKER_MODE``.
+        env (dict): Extra environment for the server, e.g. ``GUNICORN_WORKERS``.
+
+    Returns:
+        tuple: The ``subprocess.Popen`` of the master and its port, once it answers.
+    """
+    from django.conf import settings
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py"],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            **(env or {}),
+            "GUNICORN_WORKER_MODE": mode,
+            "GUNICORN_BIND": f"{HOST}:{port}",
+            "GUNICORN_LOG_LEVEL": "warning",
+        },
+    )
+    try:
+        _wait_until_serving(port, server)
+    except Exception:
+        stop_server(server)
+        raise
+    return server, port
+
+
+def stop_server(server):
+    """Stops the gunicorn master gracefully, killing it if it does not exit in time."""
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def run_http_load(port, paths, headers, concurrency, requests):
+    """Sends ``requests`` GETs, cycling through ``paths``, from ``concurrency`` threads.
+
+    Returns:
+        dict: Throughput, error count and latency percentiles.
+    """
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies = []
+    errors = []
+
+    def client():
+        connection = http.client.HTTPConnection(HOST, port, timeout=30)
+        try:
+            while (index := next(counter)) < requests:
+                began = time.perf_counter()
+                try:
+                    connection.request(
+                        "GET", paths[index % len(paths)], headers=headers
+                    )
+                    response = connection.getresponse()
+                    response.read()
+                    status = response.status
+                except (ConnectionError, http.client.HTTPException) as error:
+                    # Counted, then retried on a fresh connection by the next request.
+                    connection.close()
+                    status = type(error).__name__
+                elapsed = time.perf_counter() - began
+                with lock:
+                    latencies.append(elapsed)
+                    if not isinstance(status, int) or status >= 400:
+                        errors.append(status)
+        finally:
+            connection.close()
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(client) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - began
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        **summarize(latencies),
+    }
+
+
+def run_modes(modes, mixes, concurrency, requests, env=None):
+    """Serves each mix with each worker mode and measures it.
+
+    Args:
+        modes (list): ``GUNICORN_WORKER_MODE`` values to compare.
+        mixes (dict): ``{name: (paths, headers)}`` request mixes.
+        concurrency (int): Client threads.
+        requests (int): Requests per mix.
+        env (dict): Extra server environment.
+
+    Returns:
+        dict: ``{"<mode>/<mix>": {...}}`` as returned by ``run_http_load``.
+    """
+    results = {}
+    for mode in modes:
+        server, port = start_server(mode, env)
+        try:
+            for name, (paths, headers) in mixes.items():
+                results[f"{mode}/{name}"] = run_http_load(
+                    port, paths, headers, concurrency, requests
+                )
+        finally:
+            stop_server(server)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks of the user.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--workers", type=int, help="GUNICORN_WORKERS for every mode.")
+    parser.add_argument("--max-requests", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(
+            {"DB_ENGINE": "sqlite", "DB_NAME": str(Path(directory) / "bench.sqlite3")}
+        )
+        from django.core.management import call_command
+        from django.db import connection
+
+        from .seed import seed_user
+
+        call_command("migrate", verbosity=0)
+        user, token = seed_user(args.tasks)
+        sample = user.tasks.order_by("-created", "id").first()
+        connection.close()
+
+        mixes = {
+            "health": (["/api/health/"], {}),
+            "tasks": (
+                [
+                    "/api/tasks/",
+                    "/api/tasks/?is_completed=true",
+                    f"/api/tasks/{sample.pk}/",
+                ],
+                {"Authorization": f"Token {token.key}"},
+            ),
+        }
+        env = {"GUNICORN_MAX_REQUESTS": str(args.max_requests)}
+        if args.workers:
+            env["GUNICORN_WORKERS"] = str(args.workers)
+        results = run_modes(
+            args.modes.split(","), mixes, args.concurrency, args.requests, env
+        )
+
+    print(f"{'mode/mix':<18}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for key, row in results.items():
+        print(
+            f"{key:<18}{row['requests_per_second']:>9}{row['p50_ms']:>9}"
+            f"{row['p99_ms']:>9}{row['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
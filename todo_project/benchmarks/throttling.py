@@ -0,0 +1,121 @@
+"""Cost of one throttle check with DRF's ``SimpleRateThrottle`` and the sliding-window limiter.
+
+Each variant runs ``allow_request`` ``--iterations`` times for requests spread over
+``--clients`` IPs, once with a rate every request fits in and once with a rate the clients
+exceed, so both the allowed and the refused paths are timed. ``drf-cache`` is DRF's
+timestamp-list throttle on the local memory cache, the throttle the API would use without
+``tasks.throttling``; ``sliding-memory`` and ``sliding-cache`` are the two limiter backends.
+
+Example::
+
+    python -m benchmarks.throttling --iterations 100000 --clients 1000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from .harness import setup_django
+
+RATES = {"allowed": "1000000/min", "refused": "5/min"}
+
+
+def _variants():
+    from rest_framework.throttling import SimpleRateThrottle
+    from tasks.throttling import AuthIPThrottle
+
+    class DRFThrottle(SimpleRateThrottle):
+        scope = "auth_ip"
+
+        def get_cache_key(self, request, view):
+            return self.cache_format % {
+                "scope": self.scope,
+                "ident": self.get_ident(request),
+            }
+
+        def get_rate(self):
+            from rest_framework.settings import api_settings
+
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+
+    return [
+        ("drf-cache", DRFThrottle, "memory"),
+        ("sliding-memory", AuthIPThrottle, "memory"),
+        ("sliding-cache", AuthIPThrottle, "cache"),
+    ]
+
+
+def run_variants(iterations, clients):
+    """Times ``allow_request`` for every throttle variant and rate.
+
+    Returns:
+        dict: ``{"<variant>/<rate>": {"us_per_request": ..., "allowed": ...}}``.
+    """
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.test import override_settings
+    from django.test.client import RequestFactory
+    from rest_framework.request import Request
+    from tasks.throttling import limiter
+
+    factory = RequestFactory()
+    requests = [
+        Request(
+            factory.post("/api/auth/login/", REMOTE_ADDR=f"10.0.{i // 256}.{i % 256}")
+        )
+        for i in range(clients)
+    ]
+    results = {}
+    for name, throttle_class, backend in _variants():
+        for label, rate in RATES.items():
+            with override_settings(
+                # Large enough that culling does not drop counts and let clients through.
+                CACHES={
+                    **settings.CACHES,
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                        "OPTIONS": {"MAX_ENTRIES": 10 * clients},
+                    },
+                },
+                THROTTLING={"ENABLED": True, "BACKEND": backend, "CACHE": "default"},
+                REST_FRAMEWORK={
+                    **settings.REST_FRAMEWORK,
+                    "DEFAULT_THROTTLE_RATES": {"auth_ip": rate},
+                },
+            ):
+                limiter.clear()
+                caches["default"].clear()
+                allowed = 0
+                began = time.perf_counter()
+                for index in range(iterations):
+                    throttle = throttle_class()
+                    allowed += throttle.allow_request(requests[index % clients], None)
+                elapsed = time.perf_counter() - began
+            results[f"{name}/{label}"] = {
+                "us_per_request": round(elapsed * 1e6 / iterations, 2),
+                "allowed": allowed,
+            }
+    limiter.clear()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--clients", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(
+            {"DB_ENGINE": "sqlite", "DB_NAME": str(Path(directory) / "bench.sqlite3")}
+        )
+        results = run_variants(args.iterations, args.clients)
+
+    print(f"{'throttle/rate':<26}{'us/request':>12}{'allowed':>10}")
+    for key, row in results.items():
+        print(f"{key:<26}{row['us_per_request']:>12}{row['allowed']:>10}")
+
+
+if __name__ == "__main__":
+    main()
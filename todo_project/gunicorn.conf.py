@@ -0,0 +1,102 @@
+"""Gunicorn configuration for the Todo API.
+
+Gunicorn reads this file from the working directory, so from ``todo_project/`` a bare
+``gunicorn`` serves the application selected by ``GUNICORN_WORKER_MODE``:
+
+* ``sync``: one request at a time per worker process, ``2 * CPUs + 1`` workers.
+* ``gthread`` (the default): ``CPUs + 1`` workers with ``GUNICORN_THREADS`` threads each (4
+  by default), so requests waiting on the database do not hold a whole process.
+* ``asgi``: ``todo_project.asgi`` on uvicorn workers, one per CPU, serving the async API.
+
+``GUNICORN_WORKERS`` (or the ``WEB_CONCURRENCY`` convention) overrides the worker count.
+The application is preloaded in the master, so the workers share its memory copy-on-write,
+and each worker is recycled after ``GUNICORN_MAX_REQUESTS`` requests (plus a random jitter,
+so they do not all restart at once) to bound slow leaks.
+
+Benchmark the modes with ``python -m benchmarks.server``.
+"""
+
+import os
+import sys
+
+WORKER_MODES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "asgi": "uvicorn.workers.UvicornWorker",
+}
+
+
+def _cpus():
+    # Honour a container's CPU set rather than counting every core of the host.
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _default_workers(mode, cpus):
+    if mode == "sync":
+        return 2 * cpus + 1
+    if mode == "gthread":
+        return cpus + 1
+    return cpus
+
+
+worker_mode = os.getenv("GUNICORN_WORKER_MODE", "gthread")
+if worker_mode not in WORKER_MODES:
+    raise RuntimeError(
+        f"GUNICORN_WORKER_MODE must be one of {', '.join(WORKER_MODES)}, "
+        f"not {worker_mode!r}."
+    )
+
+wsgi_app = (
+    "todo_project.asgi:application"
+    if worker_mode == "asgi"
+    else "todo_project.wsgi:application"
+)
+worker_class = WORKER_MODES[worker_mode]
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(
+    os.getenv("GUNICORN_WORKERS")
+    or os.getenv("WEB_CONCURRENCY")
+    or _default_workers(worker_mode, _cpus())
+)
+threads = int(os.getenv("GUNICORN_THREADS", "4")) if worker_mode == "gthread" else 1
+# Read by the settings (SERVER_WORKERS) to pick caches that every worker shares.
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def _close_db_connections():
+    # Only once the application, and with it Django, has been loaded in this process.
+    if "django.db" in sys.modules:
+        from django.db import connections
+
+        connections.close_all()
+
+
+def pre_fork(server, worker):
+    """Closes any connection the preloaded application opened in the master.
+
+    A socket inherited by several workers would interleave their queries on one session.
+    """
+    _close_db_connections()
+
+
+def post_fork(server, worker):
+    """Starts each worker without database connections of its own yet."""
+    _close_db_connections()
+
+
+def worker_exit(server, worker):
+    """Closes the worker's connections so the database sees a clean disconnect."""
+    _close_db_connections()
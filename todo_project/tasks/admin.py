@@ -1 +1,58 @@
-# Register your models here.
+from functools import partial
+
+from django.contrib import admin, messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.db import transaction
+
+from .services import USER_BATCH_DELETED_MODELS, delete_user, purge_tasks
+
+User = get_user_model()
+
+
+class BatchDeletingUserAdmin(UserAdmin):
+    """``UserAdmin`` that deletes a user's tasks in short batches.
+
+    Deleting from the change page or with the bulk action goes through ``delete_user``
+    instead of a single cascade, and the confirmation page shows how many rows each model
+    will lose rather than collecting and listing every one of them.
+    """
+
+    actions = ["purge_selected_tasks"]
+
+    def get_deleted_objects(self, objs, request):
+        users = list(objs)
+        model_count = {self.opts.verbose_name_plural: len(users)}
+        for model in USER_BATCH_DELETED_MODELS:
+            model_count[model._meta.verbose_name_plural] = model.objects.filter(
+                user__in=users
+            ).count()
+        perms_needed = (
+            set() if self.has_delete_permission(request) else {self.opts.verbose_name}
+        )
+        return [str(user) for user in users], model_count, perms_needed, []
+
+    def delete_model(self, request, obj):
+        # ``delete_view`` runs inside ``transaction.atomic``, which would turn every batch
+        # into a savepoint of one long transaction holding the write lock throughout, so
+        # the batches start once it has committed.
+        transaction.on_commit(partial(delete_user, obj))
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            delete_user(user)
+
+    @admin.action(
+        permissions=["delete"], description="Delete all tasks of selected users"
+    )
+    def purge_selected_tasks(self, request, queryset):
+        purged = sum(purge_tasks(user) for user in queryset)
+        self.message_user(
+            request,
+            f"Deleted {purged} tasks of {queryset.count()} users.",
+            messages.SUCCESS,
+        )
+
+
+admin.site.unregister(User)
+admin.site.register(User, BatchDeletingUserAdmin)
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from . import async_views
+
+# Task CRUD, statistics and auth are served by the async views; anything else under ``/api/`` (bulk,
+# export, delta sync, jobs) falls through to the sync URLconf that ``todo_project.async_urls``
+# mounts after these routes.
+urlpatterns = [
+    path("auth/register/", async_views.RegisterView.as_view(), name="auth-register"),
+    path("auth/login/", async_views.LoginView.as_view(), name="auth-login"),
+    path("auth/logout/", async_views.LogoutView.as_view(), name="auth-logout"),
+    path("tasks/", async_views.TaskListView.as_view(), name="tasks-list"),
+    path("tasks/stats/", async_views.TaskStatsView.as_view(), name="tasks-stats"),
+    path("tasks/<int:pk>/", async_views.TaskDetailView.as_view(), name="tasks-detail"),
+]
@@ -0,0 +1,394 @@
+"""Async implementation of the task CRUD and auth endpoints.
+
+These views are mounted by ``todo_project.async_urls``, the URLconf used by the ASGI entry
+point. They run on the event loop and reach the database through Django's async ORM, so an
+idle or slow client holds a coroutine instead of a worker thread. Request parsing,
+validation, pagination cursors and rendering reuse the DRF pieces of the sync API, which
+keeps both APIs wire-compatible.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import aauthenticate, get_user_model
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from . import fts
+from .authentication import AsyncTokenAuthentication
+from .conditional import (
+    atask_list_validators,
+    not_modified,
+    set_validators,
+    task_validators,
+)
+from .constants import (
+    AUTH_ERROR_INVALID_CREDENTIALS,
+    AUTH_ERROR_MISSING_CREDENTIALS,
+    AUTH_ERROR_USER_EXISTS,
+    FILTER_SEARCH_PARAM,
+    IDEMPOTENCY_REPLAYED_HEADER,
+    JSON_KEY_DETAIL,
+    JSON_KEY_TOKEN,
+    ORDERING_FIELDS,
+    TASK_ERROR_NOT_FOUND,
+)
+from .filters import TaskOrderingFilter, filter_tasks
+from .idempotency import run_idempotent
+from .metrics import serialization_timer
+from .models import Task
+from .pagination import TaskCursorPagination
+from .response_cache import cache_response
+from .serializers import TaskRowSerializer, TaskSerializer
+from .services import acreate_user, create_task, delete_task, update_task
+from .stats import atask_stats, stats_days
+from .throttling import AuthIPThrottle, LoginUsernameThrottle, TaskUserThrottle
+
+
+def render(request, data=None, status_code=status.HTTP_200_OK):
+    """Renders ``data`` with the renderer negotiated for ``request``, like DRF's ``Response``."""
+    if data is None:
+        return HttpResponse(status=status_code)
+    renderer = request.accepted_renderer
+    with serialization_timer():
+        content = renderer.render(data, request.accepted_media_type)
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f"{content_type}; charset={renderer.charset}"
+    return HttpResponse(content, status=status_code, content_type=content_type)
+
+
+class AsyncAPIView(View):
+    """Base class for async endpoints.
+
+    Wraps the request in a DRF ``Request`` (for ``data`` and ``query_params``), authenticates
+    it with ``AsyncTokenAuthentication``, negotiates the renderer from ``Accept`` with the
+    sync API's renderers (the browsable API aside), applies ``throttle_classes`` and turns DRF
+    exceptions into the same error bodies and status codes the sync API returns.
+    """
+
+    authentication = AsyncTokenAuthentication()
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    renderer_classes = [
+        renderer
+        for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+        if renderer.format != "api"
+    ]
+    content_negotiation = api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS()
+    throttle_classes = [TaskUserThrottle]
+    requires_authentication = True
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token auth is not cookie based, so like DRF's APIView the API skips CSRF checks.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, parsers=[parser() for parser in self.parser_classes])
+        try:
+            self.perform_content_negotiation(request)
+            handler = None
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            if self.requires_authentication:
+                await self.authenticate(request)
+            self.check_throttles(request)
+            response = await handler(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            response = self.handle_exception(request, exc)
+        if len(self.renderer_classes) > 1:
+            patch_vary_headers(response, ["Accept"])
+        return response
+
+    def perform_content_negotiation(self, request, force=False):
+        """Sets ``accepted_renderer`` and ``accepted_media_type`` on ``request``.
+
+        Raises:
+            NotAcceptable: If no renderer matches ``Accept`` and ``force`` is not set.
+        """
+        renderers = [renderer() for renderer in self.renderer_classes]
+        try:
+            renderer, media_type = self.content_negotiation.select_renderer(
+                request, renderers
+            )
+        except exceptions.NotAcceptable:
+            if not force:
+                raise
+            renderer, media_type = renderers[0], renderers[0].media_type
+        request.accepted_renderer, request.accepted_media_type = renderer, media_type
+
+    def check_throttles(self, request):
+        """Raises ``Throttled`` if any of ``throttle_classes`` refuses the request, like DRF.
+
+        The limiter only touches memory (or a fast cache), so it runs on the event loop.
+        """
+        durations = [
+            throttle.wait()
+            for throttle in (
+                throttle_class() for throttle_class in self.throttle_classes
+            )
+            if not throttle.allow_request(request, self)
+        ]
+        if durations:
+            waits = [wait for wait in durations if wait is not None]
+            raise exceptions.Throttled(wait=max(waits, default=None))
+
+    async def authenticate(self, request):
+        """Authenticates ``request`` and sets ``request.user`` and ``request.auth``.
+
+        Raises:
+            NotAuthenticated: If the request carries no token.
+            AuthenticationFailed: If the token is not valid.
+        """
+        pair = await self.authentication.aauthenticate(request._request)
+        if pair is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = pair
+
+    def handle_exception(self, request, exc):
+        """Builds the error response DRF's exception handler would return."""
+        if not hasattr(request, "accepted_renderer"):
+            self.perform_content_negotiation(request, force=True)
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {JSON_KEY_DETAIL: exc.detail}
+
+        response = render(request, data, status_code=exc.status_code)
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+            response["WWW-Authenticate"] = self.authentication.authenticate_header(
+                request
+            )
+        if getattr(exc, "wait", None):
+            response["Retry-After"] = "%d" % exc.wait
+        if isinstance(exc, exceptions.MethodNotAllowed):
+            response["Allow"] = ", ".join(
+                method.upper()
+                for method in self.http_method_names
+                if hasattr(self, method)
+            )
+        return response
+
+
+class TaskListView(AsyncAPIView):
+    """Lists and creates the authenticated user's tasks (``/api/tasks/``)."""
+
+    http_method_names = ["get", "post", "head"]
+    filter_backends = [TaskOrderingFilter]
+    ordering_fields = ORDERING_FIELDS
+    ordering = TaskCursorPagination.ordering
+
+    @cache_response("tasks-list")
+    async def get(self, request):
+        """Lists the user's tasks with the filters, ordering and cursors of the sync API.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            HttpResponse: A page of tasks, or 304 Not Modified.
+        """
+        queryset = Task.objects.filter(user=request.user)
+        etag, last_modified = await atask_list_validators(request, queryset)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        if request.query_params.get(FILTER_SEARCH_PARAM, "").strip():
+            # Probing for the FTS table introspects the schema, once per database.
+            alias = queryset.db
+            await sync_to_async(lambda: fts.is_available(connections[alias]))()
+        queryset = filter_tasks(queryset, request.query_params)
+
+        paginator = TaskCursorPagination()
+        serializer = TaskRowSerializer()
+        page = await paginator.apaginate_queryset(
+            serializer.rows(queryset), request, view=self
+        )
+        data = paginator.get_paginated_response(serializer.serialize(page)).data
+        return set_validators(render(request, data), etag, last_modified)
+
+    async def post(self, request):
+        """Creates a task for the authenticated user.
+
+        Args:
+            request (Request): The HTTP request object containing task data.
+
+        Returns:
+            HttpResponse: The created task, or the stored response of a request retried
+            with the same ``Idempotency-Key``.
+        """
+
+        def create():
+            serializer = TaskSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            task = create_task(request.user, **serializer.validated_data)
+            return TaskSerializer(task).data, status.HTTP_201_CREATED
+
+        # Counting the task in the user's statistics, and storing the response of an
+        # idempotent request with it, needs a transaction, which the async ORM does not
+        # offer yet.
+        data, status_code, replayed = await sync_to_async(run_idempotent)(
+            request, create
+        )
+        response = render(request, data, status_code=status_code)
+        if replayed:
+            response[IDEMPOTENCY_REPLAYED_HEADER] = "true"
+        return response
+
+
+class TaskDetailView(AsyncAPIView):
+    """Retrieves, updates and deletes one of the user's tasks (``/api/tasks/<id>/``)."""
+
+    http_method_names = ["get", "put", "patch", "delete", "head"]
+
+    async def get_task(self, request, pk):
+        """Returns the user's task ``pk``.
+
+        Raises:
+            NotFound: If the task does not exist or belongs to someone else.
+        """
+        try:
+            return await Task.objects.filter(user=request.user).aget(pk=pk)
+        except Task.DoesNotExist:
+            raise exceptions.NotFound(TASK_ERROR_NOT_FOUND)
+
+    @cache_response("tasks-detail")
+    async def get(self, request, pk):
+        """Retrieves a task, answering a matching conditional request with 304."""
+        task = await self.get_task(request, pk)
+        etag, last_modified = task_validators(request, task)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(
+            render(request, TaskSerializer(task).data), etag, last_modified
+        )
+
+    async def put(self, request, pk):
+        """Replaces a task's editable fields."""
+        return await self.save_task(request, pk, partial=False)
+
+    async def patch(self, request, pk):
+        """Updates some of a task's editable fields."""
+        return await self.save_task(request, pk, partial=True)
+
+    async def delete(self, request, pk):
+        """Deletes a task, leaving a tombstone for delta sync clients."""
+        task = await self.get_task(request, pk)
+        await sync_to_async(delete_task)(request.user, task)
+        return render(request, status_code=status.HTTP_204_NO_CONTENT)
+
+    async def save_task(self, request, pk, partial):
+        """Validates the payload against the task and saves the changed fields.
+
+        Args:
+            request (Request): The HTTP request object containing task data.
+            pk (int): The task's primary key.
+            partial (bool): Whether fields missing from the payload keep their value.
+
+        Returns:
+            HttpResponse: The updated task.
+        """
+        task = await self.get_task(request, pk)
+        serializer = TaskSerializer(task, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        task = await sync_to_async(update_task)(task, serializer.validated_data)
+        return render(request, TaskSerializer(task).data)
+
+
+class TaskStatsView(AsyncAPIView):
+    """Returns the user's task statistics (``/api/tasks/stats/``)."""
+
+    http_method_names = ["get", "head"]
+
+    async def get(self, request):
+        """Reads the maintained counters with two indexed lookups."""
+        data = await atask_stats(request.user, stats_days(request.query_params))
+        return render(request, data)
+
+
+class RegisterView(AsyncAPIView):
+    """Registers a new user and returns an authentication token."""
+
+    http_method_names = ["post"]
+    throttle_classes = [AuthIPThrottle]
+    requires_authentication = False
+
+    async def post(self, request):
+        username = request.data.get("username")
+        password = request.data.get("password")
+        email = request.data.get("email", "")
+
+        if not username or not password:
+            return render(
+                request,
+                {JSON_KEY_DETAIL: AUTH_ERROR_MISSING_CREDENTIALS},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user_model = get_user_model()
+        if await user_model.objects.filter(username=username).aexists():
+            return render(
+                request,
+                {JSON_KEY_DETAIL: AUTH_ERROR_USER_EXISTS},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = await acreate_user(username=username, password=password, email=email)
+        token, _ = await Token.objects.aget_or_create(user=user)
+        return render(
+            request, {JSON_KEY_TOKEN: token.key}, status_code=status.HTTP_201_CREATED
+        )
+
+
+class LoginView(AsyncAPIView):
+    """Authenticates a user and returns an authentication token."""
+
+    http_method_names = ["post"]
+    throttle_classes = [AuthIPThrottle, LoginUsernameThrottle]
+    requires_authentication = False
+
+    async def post(self, request):
+        username = request.data.get("username")
+        password = request.data.get("password")
+
+        if not username or not password:
+            return render(
+                request,
+                {JSON_KEY_DETAIL: AUTH_ERROR_MISSING_CREDENTIALS},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = await aauthenticate(
+            request._request, username=username, password=password
+        )
+        if not user:
+            return render(
+                request,
+                {JSON_KEY_DETAIL: AUTH_ERROR_INVALID_CREDENTIALS},
+                status_code=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        token, _ = await Token.objects.aget_or_create(user=user)
+        return render(request, {JSON_KEY_TOKEN: token.key})
+
+
+class LogoutView(AsyncAPIView):
+    """Logs out the authenticated user by deleting their authentication token."""
+
+    http_method_names = ["post"]
+
+    async def post(self, request):
+        await request.auth.adelete()
+        return render(request, status_code=status.HTTP_204_NO_CONTENT)
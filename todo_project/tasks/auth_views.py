@@ -1,7 +1,7 @@
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
@@ -12,17 +12,24 @@ from .constants import (
     JSON_KEY_DETAIL,
     JSON_KEY_TOKEN,
 )
-from .docs.auth_docs import login_schema, logout_schema, register_schema
+from .docs import load_docs
+from .services import create_user
+from .throttling import AuthIPThrottle, LoginUsernameThrottle
 
+auth_docs = load_docs("auth_docs")
 
-@register_schema
+
+@auth_docs.register_schema
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle])
 def register(request):
     """Registers a new user and returns an authentication token.
 
     This endpoint creates a new user account with the provided username, password, and optional email.
     If the username already exists or required fields are missing, an error is returned.
+    The password is hashed on the hashing pool when one is configured (see ``tasks.hashing``).
+    Attempts are rate limited per client IP before any of this runs.
 
     Args:
         request: The HTTP request object containing user registration data.
@@ -47,22 +54,24 @@ def register(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    user = user_model.objects.create_user(
-        username=username, password=password, email=email
-    )
+    user = create_user(username=username, password=password, email=email)
     token, _ = Token.objects.get_or_create(user=user)
     return Response({JSON_KEY_TOKEN: token.key}, status=status.HTTP_201_CREATED)
 
 
-@login_schema
+@auth_docs.login_schema
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, LoginUsernameThrottle])
 def login(request):
     """Authenticates a user and returns an authentication token.
 
     This endpoint verifies the provided username and password,
     and returns a token if authentication is successful.
-    If the credentials are invalid, an error message is returned.
+    If the credentials are invalid, an error message is returned. Passwords are verified by
+    ``PooledHashingModelBackend``, which also upgrades hashes made with an outdated hasher.
+    Attempts are rate limited per client IP and per username, and a throttled request is
+    refused with 429 before any password is hashed.
 
     Args:
         request: The HTTP request object containing user login data.
@@ -90,7 +99,7 @@ def login(request):
     return Response({JSON_KEY_TOKEN: token.key})
 
 
-@logout_schema
+@auth_docs.logout_schema
 @api_view(["POST"])
 def logout(request):
     """Logs out the authenticated user by deleting their authentication token.
@@ -0,0 +1,321 @@
+"""Token authentication backed by an in-process LRU and, optionally, Django's cache."""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from .constants import TOKEN_CACHE_KEY_PREFIX
+from .throttling import TokenFailureThrottle
+
+DEFAULT_TOKEN_AUTH_CACHE = {
+    "MAX_SIZE": 1024,
+    "TTL": 60,
+    "SHARED_CACHE": None,
+    "REVOCATION_CACHE": None,
+}
+
+
+class TokenCache:
+    """Maps token keys to ``(user, token)`` pairs for a bounded amount of time.
+
+    Entries live in a per-process LRU bounded by ``MAX_SIZE`` and expire after ``TTL``
+    seconds. When ``SHARED_CACHE`` names a cache alias, entries are also written there so
+    that other workers can skip the database lookup too. Configuration is read from the
+    ``TOKEN_AUTH_CACHE`` setting on first use.
+
+    Every entry remembers when its lookup started. Revoking a user's tokens records the
+    time of the revocation, in the ``REVOCATION_CACHE`` alias (``SHARED_CACHE`` when unset)
+    so that every worker sees it, and an entry looked up before the latest revocation of its
+    user is discarded on the next hit. A local hit therefore costs one read of that cache,
+    but a logged-out or deactivated user is refused by every worker, not only the one that
+    revoked the token. The alias must not evict entries before they expire: a lost marker
+    would let other workers accept a revoked token again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._revoked = {}
+        self._config = None
+
+    @property
+    def config(self):
+        if self._config is None:
+            self._config = {
+                **DEFAULT_TOKEN_AUTH_CACHE,
+                **getattr(settings, "TOKEN_AUTH_CACHE", {}),
+            }
+        return self._config
+
+    @property
+    def shared(self):
+        alias = self.config["SHARED_CACHE"]
+        return caches[alias] if alias else None
+
+    @property
+    def revocations(self):
+        """The cache alias holding revocation markers, or None to keep them per process."""
+        alias = self.config["REVOCATION_CACHE"] or self.config["SHARED_CACHE"]
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _shared_key(key):
+        return TOKEN_CACHE_KEY_PREFIX + hashlib.sha256(key.encode()).hexdigest()
+
+    @staticmethod
+    def _revoked_key(user_id):
+        return f"{TOKEN_CACHE_KEY_PREFIX}revoked:{user_id}"
+
+    def get(self, key):
+        """Returns a private copy of the cached ``(user, token)`` pair, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+
+        if entry is not None:
+            _, pair, looked_up_at = entry
+            if self._is_current(pair, looked_up_at):
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                return self._copy(pair)
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        if self.shared is None:
+            return None
+        cached = self.shared.get(self._shared_key(key))
+        if cached is None:
+            return None
+        pair, looked_up_at = cached
+        if not self._is_current(pair, looked_up_at):
+            return None
+        self._store_local(key, pair, looked_up_at)
+        return self._copy(pair)
+
+    def set(self, key, pair, looked_up_at):
+        """Caches a ``(user, token)`` pair for the configured TTL.
+
+        Args:
+            key (str): The token key.
+            pair (tuple): The user and token read from the database.
+            looked_up_at (float): ``time.time()`` taken before the database was queried, so
+                a pair read before a concurrent revocation committed is never served.
+        """
+        pair = self._copy(pair)
+        self._store_local(key, pair, looked_up_at)
+        if self.shared is not None:
+            self.shared.set(
+                self._shared_key(key), (pair, looked_up_at), self.config["TTL"]
+            )
+
+    def invalidate_user(self, user_id):
+        """Revokes every cached token of ``user_id``, in this process and in all others."""
+        revoked_at = time.time()
+        ttl = self.config["TTL"]
+        with self._lock:
+            stale = [
+                key
+                for key, (_, (user, _token), _) in self._entries.items()
+                if user.pk == user_id
+            ]
+            for key in stale:
+                del self._entries[key]
+            # Entries looked up before the TTL have expired anyway.
+            self._revoked = {
+                pk: at for pk, at in self._revoked.items() if at > revoked_at - ttl
+            }
+            self._revoked[user_id] = revoked_at
+        if self.revocations is not None:
+            self.revocations.set(self._revoked_key(user_id), revoked_at, ttl + 1)
+
+    def clear(self):
+        """Empties the local tier and forgets the configuration."""
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+        self._config = None
+
+    def _is_current(self, pair, looked_up_at):
+        user_id = pair[0].pk
+        if self.revocations is not None:
+            revoked_at = self.revocations.get(self._revoked_key(user_id))
+        else:
+            revoked_at = self._revoked.get(user_id)
+        return revoked_at is None or looked_up_at > revoked_at
+
+    def _store_local(self, key, pair, looked_up_at):
+        max_size = self.config["MAX_SIZE"]
+        if max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.config["TTL"]
+        with self._lock:
+            self._entries[key] = (expires_at, pair, looked_up_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _copy(pair):
+        # Requests must not share mutable model instances across threads.
+        user, token = pair
+        user, token = copy.copy(user), copy.copy(token)
+        token.user = user
+        return user, token
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in replacement for ``TokenAuthentication`` that caches token lookups.
+
+    A cache hit skips the ``authtoken_token`` + ``auth_user`` query entirely. Deleting a token
+    (logout) or saving its user (password change, deactivation) revokes the user's entries in
+    every worker, see ``TokenCache`` and ``tasks.signals``. Cache misses from an IP that sent
+    too many invalid tokens are refused with 429 before querying, see ``TokenFailureThrottle``.
+    """
+
+    def authenticate(self, request):
+        """Returns the ``(user, token)`` pair for the request, or None without a token header.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            tuple: The authenticated user and its token, or None.
+
+        Raises:
+            AuthenticationFailed: If the header is malformed or the token is not valid.
+            Throttled: If the client is over its budget of failed lookups.
+        """
+        key = self.get_token_key(request)
+        if key is None:
+            return None
+        return self.authenticate_credentials(key, request)
+
+    def get_token_key(self, request):
+        """Parses the ``Authorization`` header exactly like DRF's ``TokenAuthentication``.
+
+        Returns:
+            str: The token key, or None if the header does not use this keyword.
+
+        Raises:
+            AuthenticationFailed: If the header is malformed.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            msg = _("Invalid token header. No credentials provided.")
+            raise exceptions.AuthenticationFailed(msg)
+        if len(auth) > 2:
+            msg = _("Invalid token header. Token string should not contain spaces.")
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            msg = _(
+                "Invalid token header. Token string should not contain invalid characters."
+            )
+            raise exceptions.AuthenticationFailed(msg)
+
+    def authenticate_credentials(self, key, request=None):
+        """Returns the ``(user, token)`` pair for ``key``, from cache when possible.
+
+        Args:
+            key (str): The token key sent by the client.
+            request (Request): The request, used to rate limit failed lookups per IP.
+
+        Returns:
+            tuple: The authenticated user and its token.
+
+        Raises:
+            AuthenticationFailed: If the token is unknown or its user is inactive.
+            Throttled: If the client is over its budget of failed lookups.
+        """
+        pair = token_cache.get(key)
+        if pair is None:
+            looked_up_at = time.time()
+            with _failed_lookups(request):
+                pair = super().authenticate_credentials(key)
+            token_cache.set(key, pair, looked_up_at)
+        return pair
+
+
+class AsyncTokenAuthentication(CachedTokenAuthentication):
+    """Token authentication for the async API.
+
+    Parses the ``Authorization`` header exactly like DRF and shares ``token_cache`` with the
+    sync authenticator, but a cache miss is resolved with the async ORM instead of a blocking
+    query, so it can run on the event loop.
+    """
+
+    async def aauthenticate(self, request):
+        """Async counterpart of ``authenticate``.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            tuple: The authenticated user and its token, or None.
+
+        Raises:
+            AuthenticationFailed: If the header is malformed or the token is not valid.
+            Throttled: If the client is over its budget of failed lookups.
+        """
+        key = self.get_token_key(request)
+        if key is None:
+            return None
+        return await self.aauthenticate_credentials(key, request)
+
+    async def aauthenticate_credentials(self, key, request=None):
+        """Async counterpart of ``authenticate_credentials``."""
+        pair = token_cache.get(key)
+        if pair is not None:
+            return pair
+
+        model = self.get_model()
+        looked_up_at = time.time()
+        with _failed_lookups(request):
+            try:
+                token = await model.objects.select_related("user").aget(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        pair = (token.user, token)
+        token_cache.set(key, pair, looked_up_at)
+        return pair
+
+
+@contextmanager
+def _failed_lookups(request):
+    """Refuses the lookup if the client is over its failure budget, and counts failures."""
+    if request is None:
+        yield
+        return
+    throttle = TokenFailureThrottle()
+    throttle.check(request)
+    try:
+        yield
+    except exceptions.AuthenticationFailed:
+        throttle.record_failure(request)
+        raise
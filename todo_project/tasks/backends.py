@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import ahash_password, averify_password, hash_password, verify_password
+
+UserModel = get_user_model()
+
+
+class PooledHashingModelBackend(ModelBackend):
+    """``ModelBackend`` that verifies passwords on the hashing pool (see ``tasks.hashing``).
+
+    A stored hash that uses an outdated algorithm or cost is replaced by the upgraded hash
+    the pool computed alongside the check, saving only the ``password`` column.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway so unknown usernames take as long as wrong passwords.
+            hash_password(password)
+            return None
+
+        valid, upgraded = verify_password(password, user.password)
+        if not valid or not self.user_can_authenticate(user):
+            return None
+        if upgraded:
+            user.password = upgraded
+            user.save(update_fields=["password"])
+        return user
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            await ahash_password(password)
+            return None
+
+        valid, upgraded = await averify_password(password, user.password)
+        if not valid or not self.user_can_authenticate(user):
+            return None
+        if upgraded:
+            user.password = upgraded
+            await user.asave(update_fields=["password"])
+        return user
@@ -0,0 +1,98 @@
+"""Validators (ETag / Last-Modified) for conditional GET on task endpoints."""
+
+import hashlib
+
+from django.db.models import Count, Max, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import UserTaskSummary
+
+
+def _etag(*parts):
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _timestamp(*values):
+    values = [value for value in values if value is not None]
+    return int(max(values).timestamp()) if values else None
+
+
+def _list_state_aggregates(request):
+    summary = UserTaskSummary.objects.filter(user=request.user)
+    return {
+        "last_modified": Max("modified"),
+        "count": Count("id"),
+        "delete_version": Max(Subquery(summary.values("delete_version")[:1])),
+        "last_deleted_at": Max(Subquery(summary.values("last_deleted_at")[:1])),
+    }
+
+
+def _list_validators(request, state):
+    etag = _etag(
+        request.get_full_path(),
+        _media_type(request),
+        state["count"],
+        state["last_modified"] and state["last_modified"].isoformat(),
+        state["delete_version"] or 0,
+    )
+    return etag, _timestamp(state["last_modified"], state["last_deleted_at"])
+
+
+def _media_type(request):
+    # Requests that went through no content negotiation render JSON.
+    return getattr(request, "accepted_media_type", "application/json")
+
+
+def task_list_validators(request, queryset):
+    """Computes validators for a task list without loading any task row.
+
+    A single aggregate reads the newest ``modified`` value, the row count and the owner's
+    delete version, so creates, updates and deletes all change the ETag.
+
+    Args:
+        request (Request): The list request; its path, query string and media type are part of the ETag.
+        queryset (QuerySet): The tasks the list is built from.
+
+    Returns:
+        tuple: The strong ETag and the Last-Modified timestamp (or None for an empty list).
+    """
+    state = queryset.aggregate(**_list_state_aggregates(request))
+    return _list_validators(request, state)
+
+
+async def atask_list_validators(request, queryset):
+    """Async counterpart of ``task_list_validators``."""
+    state = await queryset.aaggregate(**_list_state_aggregates(request))
+    return _list_validators(request, state)
+
+
+def task_validators(request, task):
+    """Computes validators for a single task.
+
+    Args:
+        request (Request): The detail request; its media type is part of the ETag.
+        task (Task): The requested task.
+
+    Returns:
+        tuple: The strong ETag and the Last-Modified timestamp.
+    """
+    etag = _etag(task.pk, task.modified.isoformat(), _media_type(request))
+    return etag, _timestamp(task.modified)
+
+
+def not_modified(request, etag, last_modified):
+    """Returns a 304 response if the client's copy is current, otherwise None."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    """Adds ETag and Last-Modified headers to ``response``."""
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -7,10 +7,118 @@ AUTH_ERROR_INVALID_CREDENTIALS = "Invalid credentials."
 AUTH_ERROR_INVALID_OR_MISSING_TOKEN = "Invalid or missing token."
 AUTH_ERROR_FORBIDDEN = "You do not have permission to perform this action."
 AUTH_ERROR_NOT_FOUND = "Task not found."
+# Same wording as DRF's 404 for the sync viewset.
+TASK_ERROR_NOT_FOUND = "No Task matches the given query."
+BULK_ERROR_EMPTY = "At least one create, update or delete operation is required."
+BULK_ERROR_TOO_MANY_OPERATIONS = "A batch may contain at most {limit} operations."
+BULK_ERROR_DUPLICATE_IDS = (
+    "A task may appear only once across update and delete operations."
+)
+EXPORT_ERROR_INVALID_FORMAT = "Unsupported export format. Use 'json' or 'ndjson'."
+SYNC_ERROR_INVALID_CURSOR = "Invalid sync cursor."
+SYNC_ERROR_EXPIRED_CURSOR = (
+    "Sync cursor expired. Perform a full resync without 'since'."
+)
+FILTER_ERROR_INVALID_BOOLEAN = "Must be one of: true, false, 1, 0."
+FILTER_ERROR_INVALID_DATETIME = "Must be an ISO 8601 date or datetime."
+MSGPACK_ERROR_INVALID = "MessagePack parse error - {error}"
+JOB_ERROR_TOO_MANY_TASKS = "An import may contain at most {limit} tasks."
+JOB_ERROR_EXPORT_NOT_READY = "The job has no export file to download."
+JOB_ERROR_STALE = "The worker running this job stopped before it finished."
+IDEMPOTENCY_ERROR_INVALID_KEY = (
+    "Must be a non-empty string of at most {limit} characters."
+)
+IDEMPOTENCY_ERROR_KEY_REUSED = (
+    "This Idempotency-Key was already used for a different request."
+)
+
+# Filtering and search
+FILTER_IS_COMPLETED_PARAM = "is_completed"
+FILTER_SEARCH_PARAM = "search"
+FILTER_RANGE_PARAMS = {
+    "created_after": "created__gte",
+    "created_before": "created__lt",
+    "modified_after": "modified__gte",
+    "modified_before": "modified__lt",
+}
+ORDERING_PARAM = "ordering"
+ORDERING_FIELDS = ["created", "modified", "title"]
+
+# Delta sync
+SYNC_SINCE_PARAM = "since"
+SYNC_PAGE_SIZE_PARAM = "page_size"
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 1000
+
+# Task statistics
+STATS_DAYS_PARAM = "days"
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+STATS_REBUILD_BATCH_SIZE = 500
+
+# Task export
+EXPORT_FORMAT_PARAM = "as"
+EXPORT_FORMAT_JSON = "json"
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_CONTENT_TYPES = {
+    EXPORT_FORMAT_JSON: "application/json",
+    EXPORT_FORMAT_NDJSON: "application/x-ndjson",
+}
+EXPORT_CHUNK_SIZE = 2000
+
+# Caching
+TOKEN_CACHE_KEY_PREFIX = "tasks:token:"
+RESPONSE_CACHE_KEY_PREFIX = "tasks:response:"
+RESPONSE_CACHE_GENERATION_PREFIX = "tasks:generation:"
+THROTTLE_CACHE_KEY_PREFIX = "tasks:throttle:"
+
+# Throttling
+# Number of keys the in-memory limiter holds before dropping expired ones
+THROTTLE_PRUNE_THRESHOLD = 10000
+
+# Bulk operations
+BULK_MAX_OPERATIONS = 500
+BULK_OP_CREATE = "create"
+BULK_OP_UPDATE = "update"
+BULK_OP_DELETE = "delete"
+
+# Batched deletion
+# Rows deleted per transaction when purging tasks or deleting a user
+DELETE_BATCH_SIZE = 1000
+# Seconds between batches, so writers waiting on SQLite's busy handler get the lock
+DELETE_BATCH_PAUSE = 0.01
+
+# Idempotent writes
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+# Set on responses answered from the idempotency store instead of by running the request
+IDEMPOTENCY_REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Background jobs
+JOB_KIND_IMPORT = "import"
+JOB_KIND_EXPORT = "export"
+JOB_KIND_PURGE = "purge"
+JOB_KINDS = [JOB_KIND_IMPORT, JOB_KIND_EXPORT, JOB_KIND_PURGE]
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+JOB_STATUSES = [
+    JOB_STATUS_PENDING,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_SUCCEEDED,
+    JOB_STATUS_FAILED,
+]
+JOB_IMPORT_MAX_TASKS = 10000
+# Tasks written or deleted per transaction by import and purge jobs
+JOB_CHUNK_SIZE = BULK_MAX_OPERATIONS
+# Seconds between an idle ``run_jobs`` worker's checks for stale jobs and expired exports
+JOB_HOUSEKEEPING_INTERVAL = 60
 
 # Swagger metadata
 SWAGGER_TAG_AUTH = ["Authentication"]
 SWAGGER_TAG_TASKS = ["Tasks"]
+SWAGGER_TAG_JOBS = ["Jobs"]
 
 SWAGGER_SUMMARY_REGISTER = "Register user"
 SWAGGER_DESC_REGISTER = "Creates a new user and returns an authentication token."
@@ -28,6 +136,10 @@ SWAGGER_RESPONSE_LOGIN_INVALID = AUTH_ERROR_INVALID_CREDENTIALS
 SWAGGER_SUMMARY_LOGOUT = "Logout user"
 SWAGGER_DESC_LOGOUT = "Deletes the user's authentication token."
 SWAGGER_HEADER_AUTHORIZATION = "Authorization"
+SWAGGER_PARAM_IDEMPOTENCY_KEY_DESC = (
+    "Optional client-generated key (e.g. a UUID). Retrying with the same key returns the "
+    "stored response instead of applying the request again."
+)
 SWAGGER_PARAM_AUTH_TOKEN_DESC = "Authentication token. Format: `Token <key>`"
 SWAGGER_RESPONSE_LOGOUT_SUCCESS = "Logout successful."
 SWAGGER_RESPONSE_LOGOUT_UNAUTHORIZED = "Unauthorized or invalid token."
@@ -40,7 +152,10 @@ SWAGGER_EXAMPLE_TASK_TITLE = "Buy groceries"
 SWAGGER_EXAMPLE_TASK_DESCRIPTION = "Pick up milk, eggs, and bread."
 
 SWAGGER_SUMMARY_LIST_TASKS = "List tasks"
-SWAGGER_DESC_LIST_TASKS = "Returns tasks owned by the authenticated user."
+SWAGGER_DESC_LIST_TASKS = (
+    "Returns tasks owned by the authenticated user, newest first, "
+    "one cursor-paginated page at a time."
+)
 
 SWAGGER_SUMMARY_CREATE_TASK = "Create task"
 SWAGGER_DESC_CREATE_TASK = "Creates a new task for the authenticated user."
@@ -54,13 +169,97 @@ SWAGGER_DESC_UPDATE_TASK = "Updates an existing task owned by the authenticated
 SWAGGER_SUMMARY_DELETE_TASK = "Delete task"
 SWAGGER_DESC_DELETE_TASK = "Deletes an existing task owned by the authenticated user."
 
+SWAGGER_SUMMARY_EXPORT_TASKS = "Export tasks"
+SWAGGER_DESC_EXPORT_TASKS = (
+    "Streams every task owned by the authenticated user as a JSON array "
+    "or as newline-delimited JSON."
+)
+SWAGGER_PARAM_EXPORT_FORMAT_DESC = "Output format: `json` (default) or `ndjson`."
+
+SWAGGER_SUMMARY_BULK_TASKS = "Bulk create, update and delete tasks"
+SWAGGER_DESC_BULK_TASKS = (
+    "Applies a batch of create, update and delete operations in a single transaction. "
+    "Either every operation is applied or none is; the response reports one result per item."
+)
+
+SWAGGER_SUMMARY_TASK_CHANGES = "Task changes since cursor"
+SWAGGER_DESC_TASK_CHANGES = (
+    "Returns tasks created or modified after the cursor and the ids of tasks deleted since, "
+    "together with the cursor for the next call. Omit `since` for an initial sync."
+)
+SWAGGER_PARAM_SYNC_SINCE_DESC = "Cursor returned by the previous call."
+SWAGGER_PARAM_SYNC_PAGE_SIZE_DESC = (
+    f"Maximum number of changed tasks (up to {SYNC_MAX_PAGE_SIZE})."
+)
+
+SWAGGER_SUMMARY_TASK_STATS = "Task statistics"
+SWAGGER_DESC_TASK_STATS = (
+    "Returns the user's total, completed and pending task counts and, for each of the last "
+    "`days` days with activity, how many of the existing tasks were created and completed "
+    "that day. Counters are kept up to date on every write, so the cost does not depend on "
+    "the number of tasks."
+)
+SWAGGER_PARAM_STATS_DAYS_DESC = (
+    f"Number of days of daily counts (up to {STATS_MAX_DAYS})."
+)
+
+SWAGGER_SUMMARY_CREATE_JOB = "Submit job"
+SWAGGER_DESC_CREATE_JOB = (
+    "Queues a background job on the authenticated user's tasks: `import` creates the "
+    "given tasks, `export` writes every task to a file and `purge` deletes tasks in "
+    "chunks. Returns immediately; poll the job until it has succeeded or failed."
+)
+SWAGGER_SUMMARY_LIST_JOBS = "List jobs"
+SWAGGER_DESC_LIST_JOBS = "Returns the authenticated user's jobs, newest first."
+SWAGGER_SUMMARY_RETRIEVE_JOB = "Retrieve job"
+SWAGGER_DESC_RETRIEVE_JOB = "Returns the status, progress and result of a job."
+SWAGGER_SUMMARY_DOWNLOAD_JOB = "Download export"
+SWAGGER_DESC_DOWNLOAD_JOB = "Downloads the file written by a succeeded export job."
+
+SWAGGER_PARAM_IS_COMPLETED_DESC = "Only completed (`true`) or pending (`false`) tasks."
+SWAGGER_PARAM_RANGE_DESC = (
+    "ISO 8601 date or datetime bound (`*_after` inclusive, `*_before` exclusive)."
+)
+SWAGGER_PARAM_SEARCH_DESC = (
+    "Words that must all appear (as prefixes) in the title or description."
+)
+SWAGGER_PARAM_ORDERING_DESC = (
+    "One of: created, modified, title; prefix with `-` for descending."
+)
+
 SWAGGER_RESPONSE_TASK_LIST = "List of tasks returned successfully."
 SWAGGER_RESPONSE_TASK_CREATED = "Task created successfully."
 SWAGGER_RESPONSE_TASK_RETRIEVED = "Task retrieved successfully."
 SWAGGER_RESPONSE_TASK_UPDATED = "Task updated successfully."
 SWAGGER_RESPONSE_TASK_DELETED = "Task deleted successfully."
+SWAGGER_RESPONSE_TASK_BULK = "Batch applied successfully."
+SWAGGER_RESPONSE_TASK_CHANGES = "Changes returned successfully."
+SWAGGER_RESPONSE_TASK_STATS = "Statistics returned successfully."
+SWAGGER_RESPONSE_SYNC_EXPIRED = SYNC_ERROR_EXPIRED_CURSOR
+SWAGGER_RESPONSE_TASK_EXPORT = "Task export streamed successfully."
+SWAGGER_RESPONSE_JOB_ACCEPTED = "Job queued."
+SWAGGER_RESPONSE_JOB_LIST = "List of jobs returned successfully."
+SWAGGER_RESPONSE_JOB_RETRIEVED = "Job retrieved successfully."
+SWAGGER_RESPONSE_JOB_DOWNLOAD = "Export file streamed successfully."
 SWAGGER_RESPONSE_VALIDATION_ERROR = "Validation error."
+SWAGGER_RESPONSE_IDEMPOTENCY_KEY_REUSED = IDEMPOTENCY_ERROR_KEY_REUSED
+SWAGGER_RESPONSE_NOT_MODIFIED = (
+    "Not modified since the ETag or date sent by the client."
+)
 
 # Common JSON keys
 JSON_KEY_DETAIL = "detail"
 JSON_KEY_TOKEN = "token"
+JSON_KEY_ID = "id"
+JSON_KEY_STATUS = "status"
+JSON_KEY_TASK = "task"
+JSON_KEY_CHANGED = "changed"
+JSON_KEY_DELETED = "deleted"
+JSON_KEY_CURSOR = "cursor"
+JSON_KEY_HAS_MORE = "has_more"
+JSON_KEY_TOTAL = "total"
+JSON_KEY_COMPLETED = "completed"
+JSON_KEY_PENDING = "pending"
+JSON_KEY_DAILY = "daily"
+JSON_KEY_DATE = "date"
+JSON_KEY_CREATED = "created"
@@ -0,0 +1,38 @@
+"""Swagger schema decorators of the API views, imported only when the API docs are enabled.
+
+The ``*_docs`` modules build their ``swagger_auto_schema`` decorators at import time, which
+pulls in drf_yasg. Views get them through ``load_docs`` so that with
+``API_DOCS_ENABLED=False`` neither is imported and every decorator leaves the view as is.
+"""
+
+from importlib import import_module
+
+from django.conf import settings
+
+
+def _no_schema(view):
+    return view
+
+
+class InertDocs:
+    """Stands in for a docs module while the API docs are disabled."""
+
+    def __init__(self, name):
+        self.__name__ = name
+
+    def __getattr__(self, attribute):
+        return _no_schema
+
+
+def load_docs(name):
+    """Returns the ``tasks.docs`` module ``name``, or an ``InertDocs`` when docs are off.
+
+    Args:
+        name (str): The module name within ``tasks.docs``, e.g. ``"task_docs"``.
+
+    Returns:
+        module | InertDocs: Where the views take their schema decorators from.
+    """
+    if not settings.API_DOCS_ENABLED:
+        return InertDocs(f"{__name__}.{name}")
+    return import_module(f"{__name__}.{name}")
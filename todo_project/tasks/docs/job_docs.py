@@ -0,0 +1,157 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+
+from ..constants import (
+    EXPORT_CONTENT_TYPES,
+    JOB_ERROR_EXPORT_NOT_READY,
+    JOB_IMPORT_MAX_TASKS,
+    JOB_KINDS,
+    JOB_STATUSES,
+    JSON_KEY_DETAIL,
+    SWAGGER_DESC_CREATE_JOB,
+    SWAGGER_DESC_DOWNLOAD_JOB,
+    SWAGGER_DESC_LIST_JOBS,
+    SWAGGER_DESC_RETRIEVE_JOB,
+    SWAGGER_RESPONSE_JOB_ACCEPTED,
+    SWAGGER_RESPONSE_JOB_DOWNLOAD,
+    SWAGGER_RESPONSE_JOB_LIST,
+    SWAGGER_RESPONSE_JOB_RETRIEVED,
+    SWAGGER_RESPONSE_VALIDATION_ERROR,
+    SWAGGER_SUMMARY_CREATE_JOB,
+    SWAGGER_SUMMARY_DOWNLOAD_JOB,
+    SWAGGER_SUMMARY_LIST_JOBS,
+    SWAGGER_SUMMARY_RETRIEVE_JOB,
+    SWAGGER_TAG_JOBS,
+)
+from .task_docs import (
+    AUTH_HEADER_PARAMETER,
+    NOT_FOUND_RESPONSE,
+    TASK_CREATE_UPDATE_SCHEMA,
+    UNAUTHORIZED_RESPONSE,
+)
+
+JOB_REQUEST_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "kind": openapi.Schema(type=openapi.TYPE_STRING, enum=JOB_KINDS),
+        "params": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            description=(
+                f"import: `tasks` (up to {JOB_IMPORT_MAX_TASKS}); "
+                "export: `format` (`json` or `ndjson`); purge: `completed_only`."
+            ),
+            properties={
+                "tasks": openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=TASK_CREATE_UPDATE_SCHEMA
+                ),
+                "format": openapi.Schema(
+                    type=openapi.TYPE_STRING, enum=list(EXPORT_CONTENT_TYPES)
+                ),
+                "completed_only": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+            },
+        ),
+    },
+    required=["kind"],
+)
+
+JOB_RESPONSE_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "id": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+        "kind": openapi.Schema(type=openapi.TYPE_STRING, enum=JOB_KINDS),
+        "status": openapi.Schema(type=openapi.TYPE_STRING, enum=JOB_STATUSES),
+        "result": openapi.Schema(
+            type=openapi.TYPE_OBJECT, x_nullable=True, example={"imported": 500}
+        ),
+        "error": openapi.Schema(type=openapi.TYPE_STRING),
+        **{
+            name: openapi.Schema(
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATETIME,
+                x_nullable=name in ("started_at", "finished_at"),
+            )
+            for name in ("created", "modified", "started_at", "finished_at")
+        },
+    },
+)
+
+JOB_PAGE_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "next": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, x_nullable=True
+        ),
+        "previous": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, x_nullable=True
+        ),
+        "results": openapi.Schema(type=openapi.TYPE_ARRAY, items=JOB_RESPONSE_SCHEMA),
+    },
+)
+
+
+create_job_schema = swagger_auto_schema(
+    tags=SWAGGER_TAG_JOBS,
+    operation_summary=SWAGGER_SUMMARY_CREATE_JOB,
+    operation_description=SWAGGER_DESC_CREATE_JOB,
+    manual_parameters=[AUTH_HEADER_PARAMETER],
+    request_body=JOB_REQUEST_SCHEMA,
+    responses={
+        202: openapi.Response(
+            description=SWAGGER_RESPONSE_JOB_ACCEPTED,
+            schema=JOB_RESPONSE_SCHEMA,
+        ),
+        400: openapi.Response(description=SWAGGER_RESPONSE_VALIDATION_ERROR),
+        401: UNAUTHORIZED_RESPONSE,
+    },
+)
+
+
+list_jobs_schema = swagger_auto_schema(
+    tags=SWAGGER_TAG_JOBS,
+    operation_summary=SWAGGER_SUMMARY_LIST_JOBS,
+    operation_description=SWAGGER_DESC_LIST_JOBS,
+    manual_parameters=[AUTH_HEADER_PARAMETER],
+    responses={
+        200: openapi.Response(
+            description=SWAGGER_RESPONSE_JOB_LIST,
+            schema=JOB_PAGE_SCHEMA,
+        ),
+        401: UNAUTHORIZED_RESPONSE,
+    },
+)
+
+
+retrieve_job_schema = swagger_auto_schema(
+    tags=SWAGGER_TAG_JOBS,
+    operation_summary=SWAGGER_SUMMARY_RETRIEVE_JOB,
+    operation_description=SWAGGER_DESC_RETRIEVE_JOB,
+    manual_parameters=[AUTH_HEADER_PARAMETER],
+    responses={
+        200: openapi.Response(
+            description=SWAGGER_RESPONSE_JOB_RETRIEVED,
+            schema=JOB_RESPONSE_SCHEMA,
+        ),
+        401: UNAUTHORIZED_RESPONSE,
+        404: NOT_FOUND_RESPONSE,
+    },
+)
+
+
+download_job_schema = swagger_auto_schema(
+    method="get",
+    tags=SWAGGER_TAG_JOBS,
+    operation_summary=SWAGGER_SUMMARY_DOWNLOAD_JOB,
+    operation_description=SWAGGER_DESC_DOWNLOAD_JOB,
+    manual_parameters=[AUTH_HEADER_PARAMETER],
+    responses={
+        200: openapi.Response(description=SWAGGER_RESPONSE_JOB_DOWNLOAD),
+        401: UNAUTHORIZED_RESPONSE,
+        404: NOT_FOUND_RESPONSE,
+        409: openapi.Response(
+            description=JOB_ERROR_EXPORT_NOT_READY,
+            examples={
+                "application/json": {JSON_KEY_DETAIL: JOB_ERROR_EXPORT_NOT_READY}
+            },
+        ),
+    },
+)
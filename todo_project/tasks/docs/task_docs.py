@@ -5,28 +5,86 @@ from ..constants import (
     AUTH_ERROR_FORBIDDEN,
     AUTH_ERROR_INVALID_OR_MISSING_TOKEN,
     AUTH_ERROR_NOT_FOUND,
+    BULK_MAX_OPERATIONS,
+    BULK_OP_CREATE,
+    BULK_OP_DELETE,
+    BULK_OP_UPDATE,
+    EXPORT_ERROR_INVALID_FORMAT,
+    EXPORT_FORMAT_JSON,
+    EXPORT_FORMAT_NDJSON,
+    EXPORT_FORMAT_PARAM,
+    FILTER_IS_COMPLETED_PARAM,
+    FILTER_RANGE_PARAMS,
+    FILTER_SEARCH_PARAM,
+    IDEMPOTENCY_KEY_HEADER,
+    JSON_KEY_CHANGED,
+    JSON_KEY_COMPLETED,
+    JSON_KEY_CREATED,
+    JSON_KEY_CURSOR,
+    JSON_KEY_DAILY,
+    JSON_KEY_DATE,
+    JSON_KEY_DELETED,
     JSON_KEY_DETAIL,
+    JSON_KEY_HAS_MORE,
+    JSON_KEY_ID,
+    JSON_KEY_PENDING,
+    JSON_KEY_STATUS,
+    JSON_KEY_TASK,
+    JSON_KEY_TOTAL,
+    ORDERING_FIELDS,
+    ORDERING_PARAM,
+    STATS_DAYS_PARAM,
+    STATS_DEFAULT_DAYS,
+    SWAGGER_DESC_BULK_TASKS,
     SWAGGER_DESC_CREATE_TASK,
     SWAGGER_DESC_DELETE_TASK,
+    SWAGGER_DESC_EXPORT_TASKS,
     SWAGGER_DESC_LIST_TASKS,
     SWAGGER_DESC_RETRIEVE_TASK,
+    SWAGGER_DESC_TASK_CHANGES,
+    SWAGGER_DESC_TASK_STATS,
     SWAGGER_DESC_UPDATE_TASK,
     SWAGGER_EXAMPLE_TASK_DESCRIPTION,
     SWAGGER_EXAMPLE_TASK_TITLE,
     SWAGGER_HEADER_AUTHORIZATION,
     SWAGGER_PARAM_AUTH_TOKEN_DESC,
+    SWAGGER_PARAM_EXPORT_FORMAT_DESC,
+    SWAGGER_PARAM_IDEMPOTENCY_KEY_DESC,
+    SWAGGER_PARAM_IS_COMPLETED_DESC,
+    SWAGGER_PARAM_ORDERING_DESC,
+    SWAGGER_PARAM_RANGE_DESC,
+    SWAGGER_PARAM_SEARCH_DESC,
+    SWAGGER_PARAM_STATS_DAYS_DESC,
+    SWAGGER_PARAM_SYNC_PAGE_SIZE_DESC,
+    SWAGGER_PARAM_SYNC_SINCE_DESC,
+    SWAGGER_RESPONSE_IDEMPOTENCY_KEY_REUSED,
+    SWAGGER_RESPONSE_NOT_MODIFIED,
+    SWAGGER_RESPONSE_SYNC_EXPIRED,
+    SWAGGER_RESPONSE_TASK_BULK,
+    SWAGGER_RESPONSE_TASK_CHANGES,
     SWAGGER_RESPONSE_TASK_CREATED,
     SWAGGER_RESPONSE_TASK_DELETED,
+    SWAGGER_RESPONSE_TASK_EXPORT,
     SWAGGER_RESPONSE_TASK_LIST,
     SWAGGER_RESPONSE_TASK_RETRIEVED,
+    SWAGGER_RESPONSE_TASK_STATS,
     SWAGGER_RESPONSE_TASK_UPDATED,
     SWAGGER_RESPONSE_VALIDATION_ERROR,
+    SWAGGER_SUMMARY_BULK_TASKS,
     SWAGGER_SUMMARY_CREATE_TASK,
     SWAGGER_SUMMARY_DELETE_TASK,
+    SWAGGER_SUMMARY_EXPORT_TASKS,
     SWAGGER_SUMMARY_LIST_TASKS,
     SWAGGER_SUMMARY_RETRIEVE_TASK,
+    SWAGGER_SUMMARY_TASK_CHANGES,
+    SWAGGER_SUMMARY_TASK_STATS,
     SWAGGER_SUMMARY_UPDATE_TASK,
     SWAGGER_TAG_TASKS,
+    SYNC_ERROR_EXPIRED_CURSOR,
+    SYNC_ERROR_INVALID_CURSOR,
+    SYNC_PAGE_SIZE,
+    SYNC_PAGE_SIZE_PARAM,
+    SYNC_SINCE_PARAM,
 )
 
 TASK_RESPONSE_SCHEMA = openapi.Schema(
@@ -53,6 +111,19 @@ TASK_RESPONSE_SCHEMA = openapi.Schema(
     },
 )
 
+TASK_PAGE_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "next": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, x_nullable=True
+        ),
+        "previous": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, x_nullable=True
+        ),
+        "results": openapi.Schema(type=openapi.TYPE_ARRAY, items=TASK_RESPONSE_SCHEMA),
+    },
+)
+
 TASK_CREATE_UPDATE_SCHEMA = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
@@ -67,6 +138,97 @@ TASK_CREATE_UPDATE_SCHEMA = openapi.Schema(
     required=["title"],
 )
 
+TASK_BULK_UPDATE_ITEM_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        JSON_KEY_ID: openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+        **TASK_CREATE_UPDATE_SCHEMA.properties,
+    },
+    required=[JSON_KEY_ID],
+)
+
+TASK_BULK_REQUEST_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    description=f"At most {BULK_MAX_OPERATIONS} operations per batch.",
+    properties={
+        BULK_OP_CREATE: openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=TASK_CREATE_UPDATE_SCHEMA
+        ),
+        BULK_OP_UPDATE: openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=TASK_BULK_UPDATE_ITEM_SCHEMA
+        ),
+        BULK_OP_DELETE: openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)
+        ),
+    },
+)
+
+TASK_BULK_RESULT_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        JSON_KEY_ID: openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+        JSON_KEY_STATUS: openapi.Schema(type=openapi.TYPE_INTEGER, example=200),
+        JSON_KEY_TASK: TASK_RESPONSE_SCHEMA,
+    },
+)
+
+TASK_BULK_RESPONSE_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        BULK_OP_CREATE: openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=TASK_BULK_RESULT_SCHEMA
+        ),
+        BULK_OP_UPDATE: openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=TASK_BULK_RESULT_SCHEMA
+        ),
+        BULK_OP_DELETE: openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=TASK_BULK_RESULT_SCHEMA
+        ),
+    },
+)
+
+TASK_CHANGES_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        JSON_KEY_CHANGED: openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=TASK_RESPONSE_SCHEMA
+        ),
+        JSON_KEY_DELETED: openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)
+        ),
+        JSON_KEY_CURSOR: openapi.Schema(type=openapi.TYPE_STRING, x_nullable=True),
+        JSON_KEY_HAS_MORE: openapi.Schema(type=openapi.TYPE_BOOLEAN, example=False),
+    },
+)
+
+TASK_STATS_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        JSON_KEY_TOTAL: openapi.Schema(type=openapi.TYPE_INTEGER, example=12),
+        JSON_KEY_COMPLETED: openapi.Schema(type=openapi.TYPE_INTEGER, example=5),
+        JSON_KEY_PENDING: openapi.Schema(type=openapi.TYPE_INTEGER, example=7),
+        JSON_KEY_DAILY: openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    JSON_KEY_DATE: openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        format=openapi.FORMAT_DATE,
+                        example="2025-01-01",
+                    ),
+                    JSON_KEY_CREATED: openapi.Schema(
+                        type=openapi.TYPE_INTEGER, example=3
+                    ),
+                    JSON_KEY_COMPLETED: openapi.Schema(
+                        type=openapi.TYPE_INTEGER, example=1
+                    ),
+                },
+            ),
+        ),
+    },
+)
+
 AUTH_HEADER_PARAMETER = openapi.Parameter(
     SWAGGER_HEADER_AUTHORIZATION,
     openapi.IN_HEADER,
@@ -75,6 +237,46 @@ AUTH_HEADER_PARAMETER = openapi.Parameter(
     required=True,
 )
 
+IDEMPOTENCY_KEY_PARAMETER = openapi.Parameter(
+    IDEMPOTENCY_KEY_HEADER,
+    openapi.IN_HEADER,
+    description=SWAGGER_PARAM_IDEMPOTENCY_KEY_DESC,
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+TASK_LIST_PARAMETERS = [
+    openapi.Parameter(
+        FILTER_IS_COMPLETED_PARAM,
+        openapi.IN_QUERY,
+        description=SWAGGER_PARAM_IS_COMPLETED_DESC,
+        type=openapi.TYPE_BOOLEAN,
+    ),
+    *[
+        openapi.Parameter(
+            name,
+            openapi.IN_QUERY,
+            description=SWAGGER_PARAM_RANGE_DESC,
+            type=openapi.TYPE_STRING,
+            format=openapi.FORMAT_DATETIME,
+        )
+        for name in FILTER_RANGE_PARAMS
+    ],
+    openapi.Parameter(
+        FILTER_SEARCH_PARAM,
+        openapi.IN_QUERY,
+        description=SWAGGER_PARAM_SEARCH_DESC,
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        ORDERING_PARAM,
+        openapi.IN_QUERY,
+        description=SWAGGER_PARAM_ORDERING_DESC,
+        type=openapi.TYPE_STRING,
+        enum=[prefix + field for field in ORDERING_FIELDS for prefix in ("", "-")],
+    ),
+]
+
 UNAUTHORIZED_RESPONSE = openapi.Response(
     description=AUTH_ERROR_INVALID_OR_MISSING_TOKEN,
     examples={
@@ -87,6 +289,8 @@ FORBIDDEN_RESPONSE = openapi.Response(
     examples={"application/json": {JSON_KEY_DETAIL: AUTH_ERROR_FORBIDDEN}},
 )
 
+NOT_MODIFIED_RESPONSE = openapi.Response(description=SWAGGER_RESPONSE_NOT_MODIFIED)
+
 NOT_FOUND_RESPONSE = openapi.Response(
     description=AUTH_ERROR_NOT_FOUND,
     examples={"application/json": {JSON_KEY_DETAIL: AUTH_ERROR_NOT_FOUND}},
@@ -97,12 +301,13 @@ list_tasks_schema = swagger_auto_schema(
     tags=SWAGGER_TAG_TASKS,
     operation_summary=SWAGGER_SUMMARY_LIST_TASKS,
     operation_description=SWAGGER_DESC_LIST_TASKS,
-    manual_parameters=[AUTH_HEADER_PARAMETER],
+    manual_parameters=[AUTH_HEADER_PARAMETER, *TASK_LIST_PARAMETERS],
     responses={
         200: openapi.Response(
             description=SWAGGER_RESPONSE_TASK_LIST,
-            schema=openapi.Schema(type=openapi.TYPE_ARRAY, items=TASK_RESPONSE_SCHEMA),
+            schema=TASK_PAGE_SCHEMA,
         ),
+        304: NOT_MODIFIED_RESPONSE,
         401: UNAUTHORIZED_RESPONSE,
     },
 )
@@ -112,7 +317,7 @@ create_task_schema = swagger_auto_schema(
     tags=SWAGGER_TAG_TASKS,
     operation_summary=SWAGGER_SUMMARY_CREATE_TASK,
     operation_description=SWAGGER_DESC_CREATE_TASK,
-    manual_parameters=[AUTH_HEADER_PARAMETER],
+    manual_parameters=[AUTH_HEADER_PARAMETER, IDEMPOTENCY_KEY_PARAMETER],
     request_body=TASK_CREATE_UPDATE_SCHEMA,
     responses={
         201: openapi.Response(
@@ -121,6 +326,7 @@ create_task_schema = swagger_auto_schema(
         ),
         400: openapi.Response(description=SWAGGER_RESPONSE_VALIDATION_ERROR),
         401: UNAUTHORIZED_RESPONSE,
+        422: openapi.Response(description=SWAGGER_RESPONSE_IDEMPOTENCY_KEY_REUSED),
     },
 )
 
@@ -135,6 +341,7 @@ retrieve_task_schema = swagger_auto_schema(
             description=SWAGGER_RESPONSE_TASK_RETRIEVED,
             schema=TASK_RESPONSE_SCHEMA,
         ),
+        304: NOT_MODIFIED_RESPONSE,
         401: UNAUTHORIZED_RESPONSE,
         403: FORBIDDEN_RESPONSE,
         404: NOT_FOUND_RESPONSE,
@@ -195,3 +402,117 @@ delete_task_schema = swagger_auto_schema(
         404: NOT_FOUND_RESPONSE,
     },
 )
+
+
+export_tasks_schema = swagger_auto_schema(
+    method="get",
+    tags=SWAGGER_TAG_TASKS,
+    operation_summary=SWAGGER_SUMMARY_EXPORT_TASKS,
+    operation_description=SWAGGER_DESC_EXPORT_TASKS,
+    manual_parameters=[
+        AUTH_HEADER_PARAMETER,
+        openapi.Parameter(
+            EXPORT_FORMAT_PARAM,
+            openapi.IN_QUERY,
+            description=SWAGGER_PARAM_EXPORT_FORMAT_DESC,
+            type=openapi.TYPE_STRING,
+            enum=[EXPORT_FORMAT_JSON, EXPORT_FORMAT_NDJSON],
+            default=EXPORT_FORMAT_JSON,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description=SWAGGER_RESPONSE_TASK_EXPORT,
+            schema=openapi.Schema(type=openapi.TYPE_ARRAY, items=TASK_RESPONSE_SCHEMA),
+        ),
+        400: openapi.Response(
+            description=EXPORT_ERROR_INVALID_FORMAT,
+            examples={
+                "application/json": {JSON_KEY_DETAIL: EXPORT_ERROR_INVALID_FORMAT}
+            },
+        ),
+        401: UNAUTHORIZED_RESPONSE,
+    },
+)
+
+
+bulk_tasks_schema = swagger_auto_schema(
+    method="post",
+    tags=SWAGGER_TAG_TASKS,
+    operation_summary=SWAGGER_SUMMARY_BULK_TASKS,
+    operation_description=SWAGGER_DESC_BULK_TASKS,
+    manual_parameters=[AUTH_HEADER_PARAMETER, IDEMPOTENCY_KEY_PARAMETER],
+    request_body=TASK_BULK_REQUEST_SCHEMA,
+    responses={
+        200: openapi.Response(
+            description=SWAGGER_RESPONSE_TASK_BULK,
+            schema=TASK_BULK_RESPONSE_SCHEMA,
+        ),
+        400: openapi.Response(description=SWAGGER_RESPONSE_VALIDATION_ERROR),
+        401: UNAUTHORIZED_RESPONSE,
+        422: openapi.Response(description=SWAGGER_RESPONSE_IDEMPOTENCY_KEY_REUSED),
+    },
+)
+
+
+task_changes_schema = swagger_auto_schema(
+    method="get",
+    tags=SWAGGER_TAG_TASKS,
+    operation_summary=SWAGGER_SUMMARY_TASK_CHANGES,
+    operation_description=SWAGGER_DESC_TASK_CHANGES,
+    manual_parameters=[
+        AUTH_HEADER_PARAMETER,
+        openapi.Parameter(
+            SYNC_SINCE_PARAM,
+            openapi.IN_QUERY,
+            description=SWAGGER_PARAM_SYNC_SINCE_DESC,
+            type=openapi.TYPE_STRING,
+        ),
+        openapi.Parameter(
+            SYNC_PAGE_SIZE_PARAM,
+            openapi.IN_QUERY,
+            description=SWAGGER_PARAM_SYNC_PAGE_SIZE_DESC,
+            type=openapi.TYPE_INTEGER,
+            default=SYNC_PAGE_SIZE,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description=SWAGGER_RESPONSE_TASK_CHANGES,
+            schema=TASK_CHANGES_SCHEMA,
+        ),
+        400: openapi.Response(
+            description=SYNC_ERROR_INVALID_CURSOR,
+            examples={"application/json": {JSON_KEY_DETAIL: SYNC_ERROR_INVALID_CURSOR}},
+        ),
+        401: UNAUTHORIZED_RESPONSE,
+        410: openapi.Response(
+            description=SWAGGER_RESPONSE_SYNC_EXPIRED,
+            examples={"application/json": {JSON_KEY_DETAIL: SYNC_ERROR_EXPIRED_CURSOR}},
+        ),
+    },
+)
+
+task_stats_schema = swagger_auto_schema(
+    method="get",
+    tags=SWAGGER_TAG_TASKS,
+    operation_summary=SWAGGER_SUMMARY_TASK_STATS,
+    operation_description=SWAGGER_DESC_TASK_STATS,
+    manual_parameters=[
+        AUTH_HEADER_PARAMETER,
+        openapi.Parameter(
+            STATS_DAYS_PARAM,
+            openapi.IN_QUERY,
+            description=SWAGGER_PARAM_STATS_DAYS_DESC,
+            type=openapi.TYPE_INTEGER,
+            default=STATS_DEFAULT_DAYS,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description=SWAGGER_RESPONSE_TASK_STATS,
+            schema=TASK_STATS_SCHEMA,
+        ),
+        401: UNAUTHORIZED_RESPONSE,
+    },
+)
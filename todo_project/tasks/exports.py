@@ -0,0 +1,49 @@
+"""Streaming serialization of a user's full task set."""
+
+from .constants import EXPORT_CHUNK_SIZE, EXPORT_FORMAT_JSON, EXPORT_FORMAT_NDJSON
+from .renderers import dumps
+from .serializers import TaskRowSerializer
+
+
+def _iter_representations(queryset, chunk_size):
+    serializer = TaskRowSerializer()
+    for row in serializer.rows(queryset).iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(row)
+
+
+def stream_tasks_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one JSON document per task, newline terminated.
+
+    Args:
+        queryset (QuerySet): The tasks to export.
+        chunk_size (int): Number of rows fetched from the database at a time.
+
+    Yields:
+        bytes: A single encoded task followed by a newline.
+    """
+    for data in _iter_representations(queryset, chunk_size):
+        yield dumps(data) + b"\n"
+
+
+def stream_tasks_json(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a JSON array of tasks piece by piece.
+
+    Args:
+        queryset (QuerySet): The tasks to export.
+        chunk_size (int): Number of rows fetched from the database at a time.
+
+    Yields:
+        bytes: The opening bracket, each encoded task and the closing bracket.
+    """
+    yield b"["
+    separator = b""
+    for data in _iter_representations(queryset, chunk_size):
+        yield separator + dumps(data)
+        separator = b","
+    yield b"]"
+
+
+EXPORT_STREAMERS = {
+    EXPORT_FORMAT_JSON: stream_tasks_json,
+    EXPORT_FORMAT_NDJSON: stream_tasks_ndjson,
+}
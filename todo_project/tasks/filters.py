@@ -0,0 +1,112 @@
+"""Server-side filtering, search and ordering for task querysets."""
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from . import fts
+from .constants import (
+    FILTER_ERROR_INVALID_BOOLEAN,
+    FILTER_ERROR_INVALID_DATETIME,
+    FILTER_IS_COMPLETED_PARAM,
+    FILTER_RANGE_PARAMS,
+    FILTER_SEARCH_PARAM,
+)
+
+BOOLEAN_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+# Every ordering gets an ``id`` tie-breaker whose direction matches the composite index
+# serving it, so cursor pagination stays stable and the database can walk the index.
+TASK_ORDERINGS = {
+    "created": ("created", "-id"),
+    "-created": ("-created", "id"),
+    "modified": ("modified", "id"),
+    "-modified": ("-modified", "-id"),
+    "title": ("title", "id"),
+    "-title": ("-title", "-id"),
+}
+
+
+def _parse_boolean(name, value):
+    try:
+        return BOOLEAN_VALUES[value.lower()]
+    except KeyError:
+        raise serializers.ValidationError({name: [FILTER_ERROR_INVALID_BOOLEAN]})
+
+
+def _parse_datetime(name, value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        date = parse_date(value)
+        if date is None:
+            raise serializers.ValidationError({name: [FILTER_ERROR_INVALID_DATETIME]})
+        parsed = parse_datetime(f"{date.isoformat()}T00:00:00")
+    return make_aware(parsed) if is_naive(parsed) else parsed
+
+
+def search_tasks(queryset, text):
+    """Restricts ``queryset`` to tasks whose title or description matches ``text``.
+
+    Uses the FTS5 index on SQLite (word-prefix matching) and falls back to case-insensitive
+    substring matching on other backends.
+    """
+    connection = connections[queryset.db]
+    if fts.is_available(connection):
+        expression = fts.match_expression(text)
+        if not expression:
+            return queryset
+        return queryset.filter(id__in=RawSQL(fts.MATCH_SQL, [expression]))
+    return queryset.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+
+def filter_tasks(queryset, params):
+    """Applies the supported query parameters to a task queryset.
+
+    Args:
+        queryset (QuerySet): The tasks to filter, already restricted to one user.
+        params (QueryDict): The request's query parameters.
+
+    Returns:
+        QuerySet: The filtered tasks.
+
+    Raises:
+        ValidationError: If a parameter has an invalid value.
+    """
+    value = params.get(FILTER_IS_COMPLETED_PARAM)
+    if value:
+        # ``is_completed=True`` compiles to a bare ``WHERE is_completed`` that SQLite cannot
+        # match against an index column; a one-element IN keeps it an equality lookup.
+        queryset = queryset.filter(
+            is_completed__in=[_parse_boolean(FILTER_IS_COMPLETED_PARAM, value)]
+        )
+
+    for name, lookup in FILTER_RANGE_PARAMS.items():
+        value = params.get(name)
+        if value:
+            queryset = queryset.filter(**{lookup: _parse_datetime(name, value)})
+
+    value = params.get(FILTER_SEARCH_PARAM, "").strip()
+    if value:
+        queryset = search_tasks(queryset, value)
+    return queryset
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """Filters tasks by completion state, date ranges and text search."""
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_tasks(queryset, request.query_params)
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """Orders tasks by a whitelisted field, adding the matching ``id`` tie-breaker."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return TASK_ORDERINGS.get(ordering[0], tuple(ordering))
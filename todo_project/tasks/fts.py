@@ -0,0 +1,94 @@
+"""SQLite FTS5 index over task titles and descriptions.
+
+The virtual table uses ``tasks_task`` as external content and is kept in sync by triggers, so
+no application code has to write to it. Migrations that rebuild ``tasks_task`` on SQLite drop
+its triggers and must call ``install`` again.
+"""
+
+FTS_TABLE = "tasks_task_fts"
+
+INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description
+    ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+UNINSTALL_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+MATCH_SQL = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+
+_availability = {}
+
+
+def _supports_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def install(apps, schema_editor):
+    """Creates the FTS table and its triggers on SQLite builds that support FTS5."""
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite" or not _supports_fts5(connection):
+        return
+    for statement in INSTALL_SQL:
+        schema_editor.execute(statement)
+
+
+def uninstall(apps, schema_editor):
+    """Drops the FTS table and its triggers."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in UNINSTALL_SQL:
+        schema_editor.execute(statement)
+
+
+def is_available(connection):
+    """Tells whether ``connection`` has the FTS table, checking once per database."""
+    key = (connection.alias, str(connection.settings_dict["NAME"]))
+    if key not in _availability:
+        _availability[key] = (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _availability[key]
+
+
+def match_expression(text):
+    """Turns free text into an FTS5 query matching every word as a prefix.
+
+    Each word is quoted, so user input can never inject FTS5 operators.
+    """
+    words = text.split()
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
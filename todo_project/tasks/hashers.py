@@ -0,0 +1,57 @@
+"""Password hashers whose cost comes from ``settings.PASSWORD_HASHING``.
+
+Each hasher keeps the algorithm name of the Django hasher it extends, so hashes stay
+interchangeable with the stock hashers. When a cost parameter changes, ``must_update``
+flags the stored hash and it is re-encoded on the next successful login.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+def _cost(name):
+    return settings.PASSWORD_HASHING[name]
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with ``PBKDF2_ITERATIONS`` iterations."""
+
+    @property
+    def iterations(self):
+        return _cost("PBKDF2_ITERATIONS")
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt with ``SCRYPT_WORK_FACTOR`` (N), ``SCRYPT_BLOCK_SIZE`` (r) and ``SCRYPT_PARALLELISM`` (p)."""
+
+    @property
+    def work_factor(self):
+        return _cost("SCRYPT_WORK_FACTOR")
+
+    @property
+    def block_size(self):
+        return _cost("SCRYPT_BLOCK_SIZE")
+
+    @property
+    def parallelism(self):
+        return _cost("SCRYPT_PARALLELISM")
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with ``ARGON2_TIME_COST``, ``ARGON2_MEMORY_COST`` (KiB) and ``ARGON2_PARALLELISM``."""
+
+    @property
+    def time_cost(self):
+        return _cost("ARGON2_TIME_COST")
+
+    @property
+    def memory_cost(self):
+        return _cost("ARGON2_MEMORY_COST")
+
+    @property
+    def parallelism(self):
+        return _cost("ARGON2_PARALLELISM")
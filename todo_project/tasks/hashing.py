@@ -0,0 +1,116 @@
+"""Password hashing on a bounded process pool.
+
+Key stretching costs hundreds of milliseconds of CPU by design. Running it on the request
+thread blocks the worker (and, through the GIL, every other thread in it) for that long, so
+a login storm stalls the whole process. With ``PASSWORD_HASHING["WORKERS"]`` set, hashes are
+computed by that many spawned processes instead: the request thread just waits on a future,
+async views await it without holding a thread, and throughput scales with the cores given
+to the pool. With ``WORKERS = 0`` (the default) everything runs inline as before.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup(set_prefix=False)
+
+
+def _verify(password, encoded):
+    # ``check_password`` calls the setter only for a valid password whose hash uses an
+    # outdated algorithm or cost, so the upgrade is computed in the same worker call.
+    upgraded = []
+    valid = check_password(
+        password, encoded, setter=lambda raw: upgraded.append(make_password(raw))
+    )
+    return valid, upgraded[0] if upgraded else None
+
+
+def get_executor():
+    """Returns the shared hashing pool, or None when hashing runs inline."""
+    global _executor
+    workers = settings.PASSWORD_HASHING["WORKERS"]
+    if not workers:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # Spawned workers do not inherit the parent's threads, locks or DB connections.
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(os.environ["DJANGO_SETTINGS_MODULE"],),
+            )
+        return _executor
+
+
+def shutdown():
+    """Stops the hashing pool; the next call starts a new one."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown()
+
+
+def _run(func, *args):
+    executor = get_executor()
+    if executor is None:
+        return func(*args)
+    return executor.submit(func, *args).result()
+
+
+async def _arun(func, *args):
+    executor = get_executor()
+    if executor is None:
+        return await sync_to_async(func, thread_sensitive=False)(*args)
+    return await asyncio.wrap_future(executor.submit(func, *args))
+
+
+def hash_password(password):
+    """Hashes ``password`` with the preferred hasher.
+
+    Args:
+        password (str): The raw password.
+
+    Returns:
+        str: The encoded hash, ready to store in ``User.password``.
+    """
+    return _run(make_password, password)
+
+
+async def ahash_password(password):
+    """Async counterpart of ``hash_password``."""
+    return await _arun(make_password, password)
+
+
+def verify_password(password, encoded):
+    """Checks ``password`` against a stored hash.
+
+    Args:
+        password (str): The raw password.
+        encoded (str): The stored hash.
+
+    Returns:
+        tuple: Whether the password matches, and the re-encoded hash when the stored one
+        uses an outdated algorithm or cost (None otherwise).
+    """
+    return _run(_verify, password, encoded)
+
+
+async def averify_password(password, encoded):
+    """Async counterpart of ``verify_password``."""
+    return await _arun(_verify, password, encoded)
@@ -0,0 +1,15 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+
+@require_GET
+def health(request):
+    """Liveness check: answers without authentication, database access or any other work.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        JsonResponse: ``{"status": "ok"}``.
+    """
+    return JsonResponse({"status": "ok"})
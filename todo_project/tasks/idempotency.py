@@ -0,0 +1,193 @@
+"""Replay of write requests retried with an ``Idempotency-Key`` header.
+
+A client that did not get the answer to a write (a dropped connection, a timeout) cannot
+tell whether it was applied, so it retries. When the request carries an
+``Idempotency-Key``, its successful outcome is stored in ``IdempotencyKey`` in the same
+transaction as the write itself, and a retry with the same key is answered from that row
+without validating or applying the request again. Keys are scoped to the user and expire
+after ``IDEMPOTENCY_KEY_TTL_HOURS``; ``purge_idempotency_keys`` deletes expired ones.
+"""
+
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+
+from .constants import (
+    DELETE_BATCH_PAUSE,
+    DELETE_BATCH_SIZE,
+    IDEMPOTENCY_ERROR_INVALID_KEY,
+    IDEMPOTENCY_ERROR_KEY_REUSED,
+    IDEMPOTENCY_KEY_HEADER,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IDEMPOTENCY_REPLAYED_HEADER,
+)
+from .models import IdempotencyKey
+from .services import id_batches
+
+
+class IdempotencyKeyReused(exceptions.APIException):
+    """The key was first sent with a different request, so its response does not apply."""
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = IDEMPOTENCY_ERROR_KEY_REUSED
+    default_code = "idempotency_key_reused"
+
+
+def idempotency_key(request):
+    """Returns the ``Idempotency-Key`` header of ``request``, or ``None`` without one.
+
+    Raises:
+        ValidationError: If the key is blank or longer than ``IDEMPOTENCY_KEY_MAX_LENGTH``.
+    """
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise exceptions.ValidationError(
+            {
+                IDEMPOTENCY_KEY_HEADER: [
+                    IDEMPOTENCY_ERROR_INVALID_KEY.format(
+                        limit=IDEMPOTENCY_KEY_MAX_LENGTH
+                    )
+                ]
+            }
+        )
+    return key
+
+
+def request_fingerprint(request):
+    """Hashes the method, path, content type and raw body of ``request``.
+
+    It must run before the body is parsed, which consumes the stream.
+    """
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, request.content_type or ""):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _expiry_cutoff(ttl_hours=None):
+    if ttl_hours is None:
+        ttl_hours = settings.IDEMPOTENCY_KEY_TTL_HOURS
+    return timezone.now() - timedelta(hours=ttl_hours)
+
+
+def _stored(user, key):
+    stored = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if stored is not None and stored.created < _expiry_cutoff():
+        # Not purged yet, but no longer valid: the key starts over.
+        stored.delete()
+        return None
+    return stored
+
+
+def _replay(stored, fingerprint):
+    if stored.fingerprint != fingerprint:
+        raise IdempotencyKeyReused()
+    return stored.response, stored.status_code, True
+
+
+def run_idempotent(request, operation):
+    """Applies ``request`` through ``operation`` at most once per ``Idempotency-Key``.
+
+    Without the header, ``operation`` simply runs. With it, a stored outcome for the user's
+    key is returned instead of running ``operation``; otherwise ``operation`` runs and a
+    successful outcome is stored in the same transaction as its writes. If a concurrent
+    request with the same key commits first, this one's writes are rolled back and its
+    outcome is returned.
+
+    Args:
+        request (Request): The authenticated write request, body not yet parsed.
+        operation (callable): Validates and applies the request; returns
+            ``(data, status_code)``.
+
+    Returns:
+        tuple: ``(data, status_code, replayed)``.
+
+    Raises:
+        ValidationError: If the key is invalid.
+        IdempotencyKeyReused: If the key was stored for a different request.
+    """
+    key = idempotency_key(request)
+    if key is None:
+        return (*operation(), False)
+
+    fingerprint = request_fingerprint(request)
+    try:
+        with transaction.atomic():
+            stored = _stored(request.user, key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+            data, status_code = operation()
+            if status.is_success(status_code):
+                IdempotencyKey.objects.create(
+                    user=request.user,
+                    key=key,
+                    fingerprint=fingerprint,
+                    status_code=status_code,
+                    response=data,
+                )
+    except IntegrityError:
+        stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if stored is None:
+            raise
+        return _replay(stored, fingerprint)
+    return data, status_code, False
+
+
+def idempotent(view):
+    """Makes the decorated viewset action honour the ``Idempotency-Key`` header.
+
+    A replayed response carries the ``Idempotent-Replayed`` header.
+    """
+
+    @wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        response = None
+
+        def operation():
+            nonlocal response
+            response = view(self, request, *args, **kwargs)
+            return response.data, response.status_code
+
+        data, status_code, replayed = run_idempotent(request, operation)
+        if replayed:
+            return Response(
+                data,
+                status=status_code,
+                headers={IDEMPOTENCY_REPLAYED_HEADER: "true"},
+            )
+        return response
+
+    return wrapper
+
+
+def purge_expired_keys(
+    ttl_hours=None, batch_size=DELETE_BATCH_SIZE, pause=DELETE_BATCH_PAUSE
+):
+    """Deletes the stored keys older than ``ttl_hours`` in id-ordered batches.
+
+    Args:
+        ttl_hours (int): Keep keys newer than this; ``IDEMPOTENCY_KEY_TTL_HOURS`` by
+            default.
+        batch_size (int): Keys deleted per transaction.
+        pause (float): Seconds to wait between batches.
+
+    Returns:
+        int: The number of keys deleted.
+    """
+    expired = IdempotencyKey.objects.filter(created__lt=_expiry_cutoff(ttl_hours))
+    purged = 0
+    for ids in id_batches(expired, batch_size, pause):
+        deleted, _ = IdempotencyKey.objects.filter(pk__in=ids).delete()
+        purged += deleted
+    return purged
@@ -0,0 +1,133 @@
+from django.http import FileResponse
+from rest_framework import mixins, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.viewsets import GenericViewSet
+
+from .authentication import CachedTokenAuthentication
+from .constants import (
+    EXPORT_CONTENT_TYPES,
+    JOB_ERROR_EXPORT_NOT_READY,
+    JOB_KIND_EXPORT,
+    JOB_STATUS_SUCCEEDED,
+    JSON_KEY_DETAIL,
+)
+from .docs import load_docs
+from .jobs import export_path, submit_job
+from .models import Job
+from .pagination import TaskCursorPagination
+from .serializers import JobSerializer
+from .throttling import TaskUserThrottle
+
+job_docs = load_docs("job_docs")
+
+
+class JobViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    GenericViewSet,
+):
+    """Submits background jobs on the user's tasks and reports their progress.
+
+    Jobs are only queued here; ``manage.py run_jobs`` runs them. Clients poll the job
+    until its status is ``succeeded`` or ``failed``.
+    """
+
+    serializer_class = JobSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [TaskUserThrottle]
+    pagination_class = TaskCursorPagination
+
+    def get_queryset(self):
+        """Returns the jobs of the authenticated user.
+
+        Returns:
+            QuerySet: The user's jobs, or an empty queryset for schema views.
+        """
+        if getattr(self, "swagger_fake_view", False):
+            return Job.objects.none()
+        return Job.objects.filter(user=self.request.user)
+
+    @job_docs.create_job_schema
+    def create(self, request, *args, **kwargs):
+        """Queues a job for the authenticated user.
+
+        Args:
+            request (Request): The HTTP request object with the job ``kind`` and ``params``.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The pending job with status 202 and its URL in ``Location``.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = submit_job(
+            request.user,
+            serializer.validated_data["kind"],
+            serializer.validated_data["params"],
+        )
+        response = Response(
+            self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED
+        )
+        response["Location"] = reverse("jobs-detail", args=[job.pk], request=request)
+        return response
+
+    @job_docs.list_jobs_schema
+    def list(self, request, *args, **kwargs):
+        """Lists the authenticated user's jobs, newest first.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: A cursor-paginated page of jobs.
+        """
+        return super().list(request, *args, **kwargs)
+
+    @job_docs.retrieve_job_schema
+    def retrieve(self, request, *args, **kwargs):
+        """Returns one of the authenticated user's jobs.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The job's status, progress or result, and error.
+        """
+        return super().retrieve(request, *args, **kwargs)
+
+    @job_docs.download_job_schema
+    @action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, pk=None):
+        """Streams the file written by a succeeded export job.
+
+        Args:
+            request (Request): The HTTP request object.
+            pk (str): The job id.
+
+        Returns:
+            FileResponse: The export file, or a 409 Response if the job is not a finished
+                export.
+        """
+        job = self.get_object()
+        path = export_path(job) if job.kind == JOB_KIND_EXPORT else None
+        if job.status != JOB_STATUS_SUCCEEDED or path is None or not path.exists():
+            return Response(
+                {JSON_KEY_DETAIL: JOB_ERROR_EXPORT_NOT_READY},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=f"tasks.{job.params['format']}",
+            content_type=EXPORT_CONTENT_TYPES[job.params["format"]],
+        )
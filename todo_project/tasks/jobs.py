@@ -0,0 +1,252 @@
+"""Background jobs on a user's tasks: submitting, claiming and running them.
+
+A job is a ``Job`` row. The API inserts it as ``pending`` and returns; ``manage.py run_jobs``
+claims pending rows oldest first and runs them on a thread or process pool, recording the
+outcome on the row for the client to poll.
+
+Claiming must hand each job to exactly one worker. Backends with row locks that can be
+skipped (PostgreSQL, MySQL 8, Oracle) lock the oldest pending row with ``SELECT ... FOR
+UPDATE SKIP LOCKED``, so concurrent workers take different rows without waiting on each
+other. SQLite has no row locks: there a worker claims a row with an ``UPDATE`` conditioned
+on the row still being pending, and moves on to the next row when another worker won.
+
+Import and purge jobs write through ``tasks.services`` in chunks of ``JOB_CHUNK_SIZE``, one
+transaction each, so statistics, tombstones and cached responses stay correct and no single
+transaction holds locks for the whole job. A failed job keeps the chunks it committed;
+``result`` reports how far it got.
+
+A worker that dies leaves its jobs ``running``. Each claim and each progress report
+refreshes ``modified``, and a running job that goes ``STALE_AFTER`` seconds without either is
+marked failed by ``fail_stale_jobs``. It is not re-queued, since an import would apply its
+committed chunks a second time. Export files are deleted ``EXPORT_RETENTION_HOURS`` after
+they were written by ``purge_expired_exports``. ``run_jobs`` runs both while it is idle.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .constants import (
+    JOB_CHUNK_SIZE,
+    JOB_ERROR_STALE,
+    JOB_KIND_EXPORT,
+    JOB_KIND_IMPORT,
+    JOB_KIND_PURGE,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_PENDING,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_SUCCEEDED,
+)
+from .exports import EXPORT_STREAMERS
+from .models import Job, Task
+from .services import apply_bulk_operations, purge_tasks
+
+logger = logging.getLogger("tasks.jobs")
+
+DEFAULT_JOBS = {
+    "WORKERS": 2,
+    "POOL": "thread",
+    "POLL_INTERVAL": 1.0,
+    "EXPORT_DIR": str(Path(tempfile.gettempdir()) / "todo_job_exports"),
+    "STALE_AFTER": 3600,
+    "EXPORT_RETENTION_HOURS": 24,
+}
+
+
+def jobs_config():
+    """Returns the ``JOBS`` setting merged over the defaults."""
+    return {**DEFAULT_JOBS, **getattr(settings, "JOBS", {})}
+
+
+def export_path(job):
+    """Returns where the export file of ``job`` is written."""
+    return Path(jobs_config()["EXPORT_DIR"]) / f"tasks-{job.pk}.{job.params['format']}"
+
+
+def submit_job(user, kind, params):
+    """Queues a job for ``user``.
+
+    Args:
+        user (User): The owner of the tasks the job works on.
+        kind (str): One of ``JOB_KINDS``.
+        params (dict): The job's validated, JSON-serializable input.
+
+    Returns:
+        Job: The pending job.
+    """
+    return Job.objects.create(user=user, kind=kind, params=params)
+
+
+def claim_job(worker):
+    """Marks the oldest pending job as running on ``worker`` and returns it.
+
+    Args:
+        worker (str): Identifies the claiming process in ``Job.worker``.
+
+    Returns:
+        Job | None: The claimed job, or None when no job is pending.
+    """
+    pending = Job.objects.filter(status=JOB_STATUS_PENDING).order_by("created", "id")
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = pending.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = JOB_STATUS_RUNNING
+            job.worker = worker
+            job.started_at = timezone.now()
+            job.save(update_fields=["status", "worker", "started_at", "modified"])
+            return job
+
+    while True:
+        job_id = pending.values_list("id", flat=True).first()
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = Job.objects.filter(pk=job_id, status=JOB_STATUS_PENDING).update(
+            status=JOB_STATUS_RUNNING, worker=worker, started_at=now, modified=now
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+
+
+def fail_stale_jobs(stale_after=None):
+    """Marks running jobs whose worker stopped reporting as failed.
+
+    Args:
+        stale_after (float): Seconds without a claim or progress report after which a
+            running job is given up; ``JOBS["STALE_AFTER"]`` by default.
+
+    Returns:
+        int: The number of jobs marked failed.
+    """
+    if stale_after is None:
+        stale_after = jobs_config()["STALE_AFTER"]
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=JOB_STATUS_RUNNING, modified__lt=now - timedelta(seconds=stale_after)
+    )
+    failed = stale.update(
+        status=JOB_STATUS_FAILED, error=JOB_ERROR_STALE, finished_at=now, modified=now
+    )
+    if failed:
+        logger.warning("Marked %s stale jobs as failed", failed)
+    return failed
+
+
+def purge_expired_exports(retention_hours=None):
+    """Deletes export files, and partial ones left by dead workers, past their retention.
+
+    Args:
+        retention_hours (float): Keep files written more recently than this;
+            ``JOBS["EXPORT_RETENTION_HOURS"]`` by default.
+
+    Returns:
+        int: The number of files deleted.
+    """
+    if retention_hours is None:
+        retention_hours = jobs_config()["EXPORT_RETENTION_HOURS"]
+    cutoff = time.time() - retention_hours * 3600
+    purged = 0
+    for path in Path(jobs_config()["EXPORT_DIR"]).glob("tasks-*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                purged += 1
+        except FileNotFoundError:
+            # Another worker purged it first.
+            continue
+    return purged
+
+
+def _finish(job, **fields):
+    now = timezone.now()
+    Job.objects.filter(pk=job.pk).update(finished_at=now, modified=now, **fields)
+
+
+def _progress(job, result):
+    job.result = result
+    Job.objects.filter(pk=job.pk).update(result=result, modified=timezone.now())
+
+
+def run_job(job_id):
+    """Runs a claimed job and records whether it succeeded.
+
+    This is what the worker pools execute, so it takes an id rather than a ``Job`` and
+    opens (and releases) its own database connection.
+
+    Args:
+        job_id (int): The id of a job in the ``running`` state.
+    """
+    close_old_connections()
+    try:
+        job = Job.objects.select_related("user").get(pk=job_id)
+        try:
+            result = JOB_HANDLERS[job.kind](job)
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.pk, job.kind)
+            _finish(
+                job,
+                status=JOB_STATUS_FAILED,
+                error=f"{type(exc).__name__}: {exc}",
+                result=job.result,
+            )
+        else:
+            _finish(job, status=JOB_STATUS_SUCCEEDED, result=result)
+    finally:
+        close_old_connections()
+
+
+def import_job(job):
+    """Creates the tasks in ``params["tasks"]``, one transaction per chunk."""
+    tasks = job.params["tasks"]
+    imported = 0
+    for start in range(0, len(tasks), JOB_CHUNK_SIZE):
+        created, _, _ = apply_bulk_operations(
+            job.user, tasks[start : start + JOB_CHUNK_SIZE], [], []
+        )
+        imported += len(created)
+        _progress(job, {"imported": imported})
+    return {"imported": imported}
+
+
+def export_job(job):
+    """Writes every task of the user to ``export_path(job)``.
+
+    The file is written under a temporary name and renamed when complete, so a download
+    never sees a partial export.
+    """
+    path = export_path(job)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".part")
+    streamer = EXPORT_STREAMERS[job.params["format"]]
+    with open(partial, "wb") as output:
+        for chunk in streamer(Task.objects.filter(user=job.user)):
+            output.write(chunk)
+    os.replace(partial, path)
+    return {"file": path.name, "bytes": path.stat().st_size}
+
+
+def purge_job(job):
+    """Deletes the user's tasks (only completed ones with ``completed_only``) in chunks."""
+    purged = purge_tasks(
+        job.user,
+        completed_only=job.params.get("completed_only", False),
+        batch_size=JOB_CHUNK_SIZE,
+        progress=lambda purged: _progress(job, {"purged": purged}),
+    )
+    return {"purged": purged}
+
+
+JOB_HANDLERS = {
+    JOB_KIND_IMPORT: import_job,
+    JOB_KIND_EXPORT: export_job,
+    JOB_KIND_PURGE: purge_job,
+}
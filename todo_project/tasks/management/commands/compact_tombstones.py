@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from tasks.models import TaskTombstone
+
+
+class Command(BaseCommand):
+    help = "Deletes task tombstones older than TASK_TOMBSTONE_RETENTION_DAYS in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TASK_TOMBSTONE_RETENTION_DAYS,
+            help="Keep tombstones newer than this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of tombstones deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        expired = TaskTombstone.objects.filter(deleted_at__lt=cutoff)
+        total = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            deleted, _ = TaskTombstone.objects.filter(id__in=ids).delete()
+            total += deleted
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} expired tombstones."))
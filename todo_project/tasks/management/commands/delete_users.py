@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from tasks.constants import DELETE_BATCH_PAUSE, DELETE_BATCH_SIZE
+from tasks.services import delete_user, purge_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes users, or only their tasks, in short id-ordered batches instead of one "
+        "cascading transaction, so other writers are not locked out."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            default=[],
+            help="Id of a user to delete (repeatable).",
+        )
+        parser.add_argument(
+            "--username",
+            action="append",
+            dest="usernames",
+            default=[],
+            help="Username of a user to delete (repeatable).",
+        )
+        parser.add_argument(
+            "--tasks-only",
+            action="store_true",
+            help="Keep the users and delete their tasks, with tombstones and statistics.",
+        )
+        parser.add_argument(
+            "--completed-only",
+            action="store_true",
+            help="With --tasks-only, keep the pending tasks.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DELETE_BATCH_SIZE,
+            help="Number of rows deleted per transaction.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=DELETE_BATCH_PAUSE,
+            help="Seconds to wait between batches, letting other writers in.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["user_ids"] and not options["usernames"]:
+            raise CommandError("Pass at least one --user or --username.")
+        if options["completed_only"] and not options["tasks_only"]:
+            raise CommandError("--completed-only requires --tasks-only.")
+
+        user_model = get_user_model()
+        users = list(
+            user_model.objects.filter(pk__in=options["user_ids"])
+            | user_model.objects.filter(username__in=options["usernames"])
+        )
+        found = {user.pk for user in users} | {user.username for user in users}
+        missing = [
+            str(ident)
+            for ident in options["user_ids"] + options["usernames"]
+            if ident not in found
+        ]
+        if missing:
+            raise CommandError(f"No such users: {', '.join(missing)}.")
+
+        for user in users:
+            if options["tasks_only"]:
+                purged = purge_tasks(
+                    user,
+                    completed_only=options["completed_only"],
+                    batch_size=options["batch_size"],
+                    pause=options["pause"],
+                )
+                self.stdout.write(f"Deleted {purged} tasks of {user.username}.")
+            else:
+                deleted = delete_user(
+                    user, batch_size=options["batch_size"], pause=options["pause"]
+                )
+                self.stdout.write(
+                    f"Deleted {user.username} and "
+                    f"{deleted.get('tasks.Task', 0)} tasks."
+                )
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(users)} users."))
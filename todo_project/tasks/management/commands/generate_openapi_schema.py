@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from tasks.schema_views import write_schema_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the OpenAPI schema once and writes it as JSON and YAML to "
+        "OPENAPI_SCHEMA_DIR, where the schema views serve it from."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            help="Directory to write to instead of OPENAPI_SCHEMA_DIR.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.API_DOCS_ENABLED:
+            raise CommandError(
+                "API_DOCS_ENABLED is False: the views carry no schema to generate."
+            )
+        directory = options["output_dir"] or settings.OPENAPI_SCHEMA_DIR
+        for name, document in write_schema_documents(directory).items():
+            self.stdout.write(
+                f"Wrote openapi.{name} ({len(document.content)} bytes, "
+                f"ETag {document.etag})."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Schema written to {directory}."))
@@ -0,0 +1,192 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker loads before it can answer its first request: the settings and apps, the
+# handler with its middleware, and the URLconf with every view it routes to.
+STARTUP_SCRIPTS = {
+    "wsgi": (
+        "from django.core.wsgi import get_wsgi_application\n"
+        "get_wsgi_application()\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().url_patterns\n"
+    ),
+    "asgi": (
+        "from django.core.asgi import get_asgi_application\n"
+        "get_asgi_application()\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().url_patterns\n"
+    ),
+}
+
+IMPORT_TIME_PREFIX = "import time:"
+
+ImportTime = namedtuple("ImportTime", "module self_us cumulative_us depth")
+
+
+def parse_importtime(output):
+    """Parses the report ``python -X importtime`` writes to stderr.
+
+    Args:
+        output (str): The interpreter's stderr; lines that are not import times are skipped.
+
+    Returns:
+        list[ImportTime]: One entry per imported module, in import completion order. ``depth``
+        is 0 for modules imported by the script itself.
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        self_us, cumulative_us, module = line[len(IMPORT_TIME_PREFIX) :].split("|", 2)
+        if not self_us.strip().isdigit():  # the header line
+            continue
+        name = module.lstrip()
+        depth = (len(module) - len(name) - 1) // 2
+        entries.append(ImportTime(name, int(self_us), int(cumulative_us), depth))
+    if entries:
+        top = min(entry.depth for entry in entries)
+        entries = [entry._replace(depth=entry.depth - top) for entry in entries]
+    return entries
+
+
+def by_package(entries):
+    """Sums the self time of ``entries`` per top-level package.
+
+    Returns:
+        list[ImportTime]: One entry per package, with its module count as ``depth``.
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for entry in entries:
+        package = totals[entry.module.split(".", 1)[0]]
+        package[0] += entry.self_us
+        package[1] += 1
+    return [
+        ImportTime(package, self_us, self_us, modules)
+        for package, (self_us, modules) in totals.items()
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Starts a worker's imports in a fresh interpreter under `python -X importtime` and "
+        "reports the slowest modules, to keep track of startup time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interface",
+            choices=sorted(STARTUP_SCRIPTS),
+            default="wsgi",
+            help="Which application to load, as gunicorn or an ASGI server would.",
+        )
+        parser.add_argument(
+            "--set",
+            action="append",
+            dest="overrides",
+            default=[],
+            metavar="NAME=VALUE",
+            help="Environment variable for the profiled interpreter (repeatable), "
+            "e.g. --set API_DOCS_ENABLED=False.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["cumulative", "self"],
+            default="cumulative",
+            help="Rank modules by time including or excluding their own imports.",
+        )
+        parser.add_argument(
+            "--by-package",
+            action="store_true",
+            help="Sum self time per top-level package instead of listing modules.",
+        )
+        parser.add_argument("--top", type=int, default=30, help="Rows to show.")
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+
+    def handle(self, *args, **options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", "todo_project.settings"
+            ),
+        }
+        if options["interface"] == "asgi":
+            env["DJANGO_SERVER_INTERFACE"] = "asgi"
+        for override in options["overrides"]:
+            name, sep, value = override.partition("=")
+            if not sep:
+                raise CommandError(f"--set expects NAME=VALUE, got {override!r}.")
+            env[name] = value
+
+        began = time.perf_counter()
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                STARTUP_SCRIPTS[options["interface"]],
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        wall_ms = (time.perf_counter() - began) * 1000
+        if process.returncode:
+            errors = [
+                line
+                for line in process.stderr.splitlines()
+                if not line.startswith(IMPORT_TIME_PREFIX)
+            ]
+            raise CommandError(
+                "The profiled interpreter failed:\n" + "\n".join(errors[-20:])
+            )
+
+        entries = parse_importtime(process.stderr)
+        rows = by_package(entries) if options["by_package"] else entries
+        key = "self_us" if options["sort"] == "self" else "cumulative_us"
+        rows = sorted(rows, key=lambda row: getattr(row, key), reverse=True)
+        rows = rows[: options["top"]]
+        report = {
+            "interface": options["interface"],
+            "overrides": options["overrides"],
+            "wall_ms": round(wall_ms, 1),
+            "import_ms": round(sum(entry.self_us for entry in entries) / 1000, 1),
+            "modules": len(entries),
+            "rows": [
+                {
+                    "module": row.module,
+                    "cumulative_ms": round(row.cumulative_us / 1000, 2),
+                    "self_ms": round(row.self_us / 1000, 2),
+                    ("modules" if options["by_package"] else "depth"): row.depth,
+                }
+                for row in rows
+            ],
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"{report['modules']} modules imported in {report['import_ms']} ms "
+            f"({report['wall_ms']} ms wall time including interpreter startup)."
+        )
+        last_column = "modules" if options["by_package"] else "depth"
+        self.stdout.write(
+            f"{'cumulative ms':>14}{'self ms':>10}{last_column:>9}  "
+            f"{'package' if options['by_package'] else 'module'}"
+        )
+        for row in report["rows"]:
+            self.stdout.write(
+                f"{row['cumulative_ms']:>14}{row['self_ms']:>10}"
+                f"{row[last_column]:>9}  {row['module']}"
+            )
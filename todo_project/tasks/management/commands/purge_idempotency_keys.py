@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from tasks.constants import DELETE_BATCH_PAUSE, DELETE_BATCH_SIZE
+from tasks.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL_HOURS "
+        "in small batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=settings.IDEMPOTENCY_KEY_TTL_HOURS,
+            help="Keep keys newer than this many hours.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DELETE_BATCH_SIZE,
+            help="Number of keys deleted per transaction.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=DELETE_BATCH_PAUSE,
+            help="Seconds to wait between batches, letting other writers in.",
+        )
+
+    def handle(self, *args, **options):
+        purged = purge_expired_keys(
+            options["hours"], options["batch_size"], options["pause"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Deleted {purged} expired keys."))
@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from tasks.constants import STATS_REBUILD_BATCH_SIZE
+from tasks.stats import rebuild_all_task_stats, rebuild_task_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the per-user task counters and daily statistics from the tasks, "
+        "e.g. after tasks were written without going through the API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only rebuild this user id (repeatable). Defaults to every user.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=STATS_REBUILD_BATCH_SIZE,
+            help="Number of users rebuilt per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["user_ids"]:
+            counted = rebuild_task_stats(options["user_ids"])
+        else:
+            counted = rebuild_all_task_stats(
+                get_user_model(), batch_size=options["batch_size"]
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt task statistics from {counted} tasks.")
+        )
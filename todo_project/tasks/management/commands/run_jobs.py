@@ -0,0 +1,134 @@
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from tasks.constants import JOB_HOUSEKEEPING_INTERVAL
+from tasks.jobs import (
+    claim_job,
+    fail_stale_jobs,
+    jobs_config,
+    purge_expired_exports,
+    run_job,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Claims pending background jobs and runs them on a thread or process pool. "
+        "Several workers may run at once, on one host or many. While idle, it also fails "
+        "jobs abandoned by dead workers and deletes expired export files."
+    )
+
+    def add_arguments(self, parser):
+        config = jobs_config()
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=config["WORKERS"],
+            help="Jobs run concurrently. 0 runs them one by one in this process.",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=["thread", "process"],
+            default=config["POOL"],
+            help="Run jobs on threads or on separate processes.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=config["POLL_INTERVAL"],
+            help="Seconds to wait before looking for jobs again when none is pending.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is pending or running instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = options["poll_interval"]
+        self.once = options["once"]
+        self.housekept_at = None
+        self.housekeeping()
+        if options["workers"] < 1:
+            ran = self.run_inline()
+        else:
+            ran = self.run_pool(options["workers"], options["pool"])
+        self.stdout.write(self.style.SUCCESS(f"Ran {ran} jobs."))
+
+    def housekeeping(self):
+        """Fails stale jobs and purges expired exports, at most once per interval."""
+        now = time.monotonic()
+        if (
+            self.housekept_at is not None
+            and now - self.housekept_at < JOB_HOUSEKEEPING_INTERVAL
+        ):
+            return
+        self.housekept_at = now
+        failed = fail_stale_jobs()
+        if failed:
+            self.stderr.write(f"Marked {failed} stale jobs as failed.")
+        purge_expired_exports()
+
+    def run_inline(self):
+        ran = 0
+        while True:
+            job = claim_job(self.worker)
+            if job is not None:
+                run_job(job.pk)
+                ran += 1
+            elif self.once:
+                return ran
+            else:
+                self.housekeeping()
+                time.sleep(self.poll_interval)
+
+    def run_pool(self, workers, pool):
+        if pool == "process":
+            # Spawned processes set Django up from scratch instead of inheriting this
+            # process's database connections through fork.
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        else:
+            executor = ThreadPoolExecutor(workers, thread_name_prefix="job")
+
+        ran = 0
+        running = set()
+        with executor:
+            while True:
+                # Only claim what the pool can start right away, so idle workers elsewhere
+                # can take the rest.
+                while len(running) < workers:
+                    job = claim_job(self.worker)
+                    if job is None:
+                        break
+                    running.add(executor.submit(run_job, job.pk))
+                if not running:
+                    if self.once:
+                        return ran
+                    self.housekeeping()
+                    time.sleep(self.poll_interval)
+                    continue
+                done, running = wait(
+                    running, timeout=self.poll_interval, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    ran += 1
+                    if future.exception() is not None:
+                        # The job's row could not be updated; it stays "running".
+                        self.stderr.write(f"Job runner failed: {future.exception()!r}")
@@ -0,0 +1,243 @@
+"""In-process request metrics with a Prometheus text exposition.
+
+Every request is recorded into histograms keyed by URL name and method. Recording is
+lock-free: each thread (or event loop) writes only into its own buffer, and the buffers
+are merged when ``/metrics`` is scraped. The lock is taken once per thread, to register
+its buffer, never per request.
+
+The figures are per process; with several gunicorn workers each one exposes its own.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUESTS_TOTAL = "http_requests_total"
+HISTOGRAMS = {
+    "http_request_duration_seconds": (
+        "wall",
+        DURATION_BUCKETS,
+        "Wall time spent handling the request.",
+    ),
+    "http_request_db_duration_seconds": (
+        "db",
+        DURATION_BUCKETS,
+        "Time spent executing SQL while handling the request.",
+    ),
+    "http_request_queries": (
+        "queries",
+        QUERY_BUCKETS,
+        "SQL statements executed while handling the request.",
+    ),
+    "http_request_serialization_duration_seconds": (
+        "serialization",
+        DURATION_BUCKETS,
+        "Time spent in serializers and rendering the response body.",
+    ),
+}
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Measurements for one request, filled by the middleware and its DB wrapper."""
+
+    __slots__ = ("started", "db", "queries", "serialization", "statements")
+
+    def __init__(self, capture_sql=False):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.serialization = 0.0
+        self.statements = [] if capture_sql else None
+
+    def __call__(self, execute, sql, params, many, context):
+        began = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - began
+            self.db += elapsed
+            self.queries += 1
+            if self.statements is not None:
+                self.statements.append((round(elapsed * 1000, 3), sql))
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection-wide ``execute_wrapper`` that times SQL for the current request, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def activate(metrics):
+    """Makes ``metrics`` the current request's measurements; returns a reset token."""
+    return _current.set(metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def serialization_timer():
+    """Adds the time spent in the block to the current request's serialization time."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialization += time.perf_counter() - began
+
+
+class _Series:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    """Collects request measurements into per-thread buffers."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._buffers = []
+        self._lock = threading.Lock()
+
+    def _buffer(self):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = {}
+            with self._lock:
+                self._buffers.append(buffer)
+        return buffer
+
+    def record(self, endpoint, method, status, metrics, wall):
+        """Adds one request to the calling thread's buffer."""
+        buffer = self._buffer()
+        key = (endpoint, method)
+        series = buffer.get(key)
+        if series is None:
+            series = buffer[key] = {
+                "statuses": {},
+                **{
+                    name: _Series(buckets)
+                    for name, (_, buckets, _) in HISTOGRAMS.items()
+                },
+            }
+        series["statuses"][status] = series["statuses"].get(status, 0) + 1
+        values = {
+            "wall": wall,
+            "db": metrics.db,
+            "queries": metrics.queries,
+            "serialization": metrics.serialization,
+        }
+        for name, (source, _, _) in HISTOGRAMS.items():
+            series[name].observe(values[source])
+
+    def clear(self):
+        with self._lock:
+            for buffer in self._buffers:
+                buffer.clear()
+
+    def _merged(self):
+        with self._lock:
+            buffers = list(self._buffers)
+        merged = {}
+        for buffer in buffers:
+            # ``dict.copy`` runs without releasing the GIL, so a concurrent insert by the
+            # owning thread cannot break the iteration.
+            for key, series in buffer.copy().items():
+                target = merged.setdefault(
+                    key,
+                    {
+                        "statuses": {},
+                        **{
+                            name: [[0] * (len(buckets) + 1), 0.0]
+                            for name, (_, buckets, _) in HISTOGRAMS.items()
+                        },
+                    },
+                )
+                for status, count in series["statuses"].copy().items():
+                    target["statuses"][status] = (
+                        target["statuses"].get(status, 0) + count
+                    )
+                for name in HISTOGRAMS:
+                    counts, total = target[name]
+                    for index, count in enumerate(series[name].counts):
+                        counts[index] += count
+                    target[name][1] = total + series[name].sum
+        return merged
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        merged = sorted(self._merged().items())
+        lines = [
+            f"# HELP {REQUESTS_TOTAL} Requests handled, by endpoint, method and status.",
+            f"# TYPE {REQUESTS_TOTAL} counter",
+        ]
+        for (endpoint, method), series in merged:
+            for status, count in sorted(series["statuses"].items()):
+                labels = _labels(endpoint=endpoint, method=method, status=status)
+                lines.append(f"{REQUESTS_TOTAL}{{{labels}}} {count}")
+
+        for name, (_, buckets, help_text) in HISTOGRAMS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (endpoint, method), series in merged:
+                counts, total = series[name]
+                labels = _labels(endpoint=endpoint, method=method)
+                cumulative = 0
+                for bound, count in zip((*buckets, "+Inf"), counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {round(total, 6)}")
+                lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def render_samples(name, metric_type, help_text, samples):
+    """Returns the exposition lines of one metric.
+
+    Args:
+        name (str): The metric name.
+        metric_type (str): ``counter`` or ``gauge``.
+        help_text (str): The ``# HELP`` description.
+        samples (dict): Values keyed by tuples of ``(label, value)`` pairs.
+
+    Returns:
+        list[str]: The ``# HELP``/``# TYPE`` lines followed by one line per sample.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples.items():
+        labels = _labels(**dict(labels))
+        lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+    return lines
+
+
+def _labels(**labels):
+    return ",".join(
+        '{}="{}"'.format(
+            key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "")
+        )
+        for key, value in labels.items()
+    )
+
+
+registry = Registry()
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from .metrics import registry
+from .response_cache import response_cache
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _authorized(request):
+    token = settings.METRICS["AUTH_TOKEN"]
+    if token and constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return True
+    return request.user.is_active and request.user.is_staff
+
+
+@require_GET
+def metrics(request):
+    """Exposes the process's request and response cache metrics in the Prometheus text format.
+
+    Scrapers send ``METRICS["AUTH_TOKEN"]`` as ``Authorization: Bearer <token>``; otherwise
+    only a staff session may read them.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        HttpResponse: The metrics, or 401 without the bearer token or a staff session.
+    """
+    if not _authorized(request):
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = "Bearer"
+        return response
+    return HttpResponse(
+        registry.render() + response_cache.render_metrics(),
+        content_type=PROMETHEUS_CONTENT_TYPE,
+    )
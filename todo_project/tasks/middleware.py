@@ -0,0 +1,156 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+
+logger = logging.getLogger("tasks.metrics.slow")
+
+UNMATCHED_ENDPOINT = "unmatched"
+
+
+class MetricsMiddleware:
+    """Records wall time, DB time, query count and serialization time for each request.
+
+    Place it first in ``MIDDLEWARE`` so the wall time covers the whole stack. SQL is timed by
+    the ``execute_wrapper`` that ``tasks.signals`` installs on every connection; queries a
+    streaming response runs while its body is sent are not included. Works in both sync
+    and async chains, so it adds no thread hop under ASGI.
+
+    With ``METRICS["SLOW_REQUEST_MS"]`` set, requests slower than that are logged to
+    ``tasks.metrics.slow`` together with the SQL they executed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request_metrics, token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        self._finish(request, response, request_metrics)
+        return response
+
+    async def __acall__(self, request):
+        request_metrics, token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        self._finish(request, response, request_metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        """Times the rendering of DRF responses as serialization time."""
+        request_metrics = getattr(request, "_metrics", None)
+        if request_metrics is not None:
+            began = time.perf_counter()
+
+            def rendered(response):
+                request_metrics.serialization += time.perf_counter() - began
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def _start(request):
+        request_metrics = metrics.RequestMetrics(
+            capture_sql=bool(settings.METRICS["SLOW_REQUEST_MS"])
+        )
+        request._metrics = request_metrics
+        return request_metrics, metrics.activate(request_metrics)
+
+    @staticmethod
+    def _finish(request, response, request_metrics):
+        wall = time.perf_counter() - request_metrics.started
+        match = getattr(request, "resolver_match", None)
+        endpoint = (match and match.url_name) or UNMATCHED_ENDPOINT
+        if endpoint in settings.METRICS["EXCLUDED_ENDPOINTS"]:
+            return
+        metrics.registry.record(
+            endpoint, request.method, response.status_code, request_metrics, wall
+        )
+
+        threshold = settings.METRICS["SLOW_REQUEST_MS"]
+        if threshold and wall * 1000 >= threshold:
+            logger.warning(
+                "Slow request %s %s (%s): %.1f ms, %d queries, %.1f ms in SQL",
+                request.method,
+                request.get_full_path(),
+                endpoint,
+                wall * 1000,
+                request_metrics.queries,
+                request_metrics.db * 1000,
+                extra={"sql": request_metrics.statements},
+            )
+            for elapsed, sql in request_metrics.statements:
+                logger.warning("  %.3f ms  %s", elapsed, sql)
+
+
+def is_api_request(request):
+    """Returns whether the request is for a route under ``settings.API_PATH_PREFIX``."""
+    return request.path_info.startswith(settings.API_PATH_PREFIX)
+
+
+def browser_only(middleware_class):
+    """Returns a subclass of ``middleware_class`` that API requests pass straight through.
+
+    For requests under ``settings.API_PATH_PREFIX`` the subclass calls the next middleware
+    directly and its ``process_view`` hook does nothing, so the API pays for neither the
+    middleware's request nor its response processing. Everything else (admin, API docs,
+    static files) gets the wrapped middleware unchanged. Being a subclass, it still
+    satisfies the admin's checks for the session, auth and messages middleware.
+
+    Args:
+        middleware_class (type): A Django middleware class.
+
+    Returns:
+        type: The path-scoped middleware class.
+    """
+
+    class BrowserOnlyMiddleware(middleware_class):
+        def __call__(self, request):
+            if is_api_request(request):
+                # In an async chain this returns the next middleware's coroutine.
+                return self.get_response(request)
+            return super().__call__(request)
+
+        if hasattr(middleware_class, "process_view"):
+
+            def process_view(self, request, *args, **kwargs):
+                if is_api_request(request):
+                    return None
+                return super().process_view(request, *args, **kwargs)
+
+    name = f"Browser{middleware_class.__name__}"
+    BrowserOnlyMiddleware.__name__ = BrowserOnlyMiddleware.__qualname__ = name
+    return BrowserOnlyMiddleware
+
+
+# Stand-ins for the middleware only browser pages need, used in MIDDLEWARE when
+# API_LEAN_MIDDLEWARE is on. The API authenticates with tokens: it reads no session, has no
+# CSRF cookie to check, shows no messages and is never framed.
+BrowserWhiteNoiseMiddleware = browser_only(WhiteNoiseMiddleware)
+BrowserSessionMiddleware = browser_only(SessionMiddleware)
+BrowserCsrfViewMiddleware = browser_only(CsrfViewMiddleware)
+BrowserAuthenticationMiddleware = browser_only(AuthenticationMiddleware)
+BrowserMessageMiddleware = browser_only(MessageMiddleware)
+BrowserXFrameOptionsMiddleware = browser_only(XFrameOptionsMiddleware)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:44
+
+from django.conf import settings
+from django.db import migrations, models
+from tasks import fts
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0004_tasktombstone"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "is_completed", "-created", "id"],
+                name="task_user_done_created_idx",
+            ),
+        ),
+        migrations.RunPython(fts.install, fts.uninstall),
+    ]
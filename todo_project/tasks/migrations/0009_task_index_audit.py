@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from tasks import fts
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_idempotencykey"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # Dropping the foreign key index rebuilds tasks_task on SQLite, which drops the FTS
+    # triggers: they are installed again after the rebuild, in both directions.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, fts.install),
+        migrations.AlterField(
+            model_name="task",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(fts.install, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "title", "id"], name="task_user_title_id_idx"
+            ),
+        ),
+    ]
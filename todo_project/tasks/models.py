@@ -1,7 +1,16 @@
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from django_extensions.db.models import TimeStampedModel
 
+from .constants import (
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    JOB_KINDS,
+    JOB_STATUS_PENDING,
+    JOB_STATUSES,
+)
+
 
 class Task(TimeStampedModel):
     """Todo item owned by a single user."""
@@ -10,13 +19,199 @@ class Task(TimeStampedModel):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="tasks",
+        # Every index below starts with the user, so a separate one would only cost writes.
+        db_index=False,
     )
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     is_completed = models.BooleanField(default=False)
+    completed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        ordering = ["-created"]
+        ordering = ["-created", "id"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created", "id"], name="task_user_created_id_idx"
+            ),
+            models.Index(
+                fields=["user", "modified", "id"], name="task_user_modified_id_idx"
+            ),
+            models.Index(
+                fields=["user", "is_completed", "-created", "id"],
+                name="task_user_done_created_idx",
+            ),
+            models.Index(fields=["user", "title", "id"], name="task_user_title_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
+
+    def sync_completed_at(self, now=None):
+        """Keeps ``completed_at`` in step with ``is_completed``.
+
+        A task becoming completed is stamped with ``now``; an already completed task keeps
+        its stamp and an open task has none. ``save()`` calls this; paths that bypass it
+        (``bulk_create``/``bulk_update``) must call it themselves.
+        """
+        if not self.is_completed:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = now or timezone.now()
+
+    def save(self, *args, **kwargs):
+        self.sync_completed_at()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "is_completed" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "completed_at"}
+        super().save(*args, **kwargs)
+
+
+class UserTaskSummary(models.Model):
+    """Per-user bookkeeping about a task collection, updated alongside task writes."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_summary",
+    )
+    delete_version = models.PositiveBigIntegerField(default=0)
+    last_deleted_at = models.DateTimeField(null=True, blank=True)
+    # Signed on purpose: a counter that drifted (writes that bypassed the services) must
+    # not make the next write fail; ``rebuild_task_stats`` corrects it.
+    total_count = models.BigIntegerField(default=0)
+    completed_count = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"Task summary for user {self.user_id}"
+
+
+class TaskDailyStats(models.Model):
+    """Per-user, per-day counts of the tasks created and completed that day.
+
+    Days follow ``TIME_ZONE``. Only existing tasks are counted: deleting a task takes it
+    out of the day it was created (and completed) on, and reopening one takes it out of
+    its completion day, so the rows always match a recount from scratch.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="task_daily_stats",
+        db_index=False,
+    )
+    date = models.DateField()
+    created_count = models.BigIntegerField(default=0)
+    completed_count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"], name="task_daily_stats_user_date"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"Task stats of user {self.user_id} on {self.date}"
+
+
+class TaskTombstone(models.Model):
+    """Marker left behind by a deleted task so sync clients can drop their copy.
+
+    Tombstones older than ``TASK_TOMBSTONE_RETENTION_DAYS`` are removed by the
+    ``compact_tombstones`` management command.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="task_tombstones",
+        db_index=False,
+    )
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "deleted_at"], name="tombstone_user_deleted_idx"
+            ),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Deleted task {self.task_id}"
+
+
+class Job(TimeStampedModel):
+    """Background operation on a user's tasks, run by the ``run_jobs`` worker.
+
+    ``params`` holds the validated input of the job kind and ``result`` its outcome (or its
+    progress while it runs); ``error`` is set when the job failed.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="jobs",
+        db_index=False,
+    )
+    kind = models.CharField(max_length=16, choices=[(k, k) for k in JOB_KINDS])
+    status = models.CharField(
+        max_length=16,
+        choices=[(s, s) for s in JOB_STATUSES],
+        default=JOB_STATUS_PENDING,
+    )
+    params = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=128, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created", "id"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created", "id"], name="job_user_created_id_idx"
+            ),
+            models.Index(
+                fields=["status", "created", "id"], name="job_status_created_id_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} job {self.pk} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """Outcome of a write request sent with an ``Idempotency-Key`` header.
+
+    A retry carrying the same key is answered with ``response`` and ``status_code`` instead
+    of being applied again. ``fingerprint`` identifies the original request, so a key
+    reused for a different one is refused. Keys older than ``IDEMPOTENCY_KEY_TTL_HOURS``
+    are ignored and removed by the ``purge_idempotency_keys`` management command.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+        db_index=False,
+    )
+    key = models.CharField(max_length=IDEMPOTENCY_KEY_MAX_LENGTH)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField(encoder=DjangoJSONEncoder)
+    created = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="idempotency_key_user_key"
+            )
+        ]
+        indexes = [models.Index(fields=["created"], name="idempotency_created_idx")]
+
+    def __str__(self) -> str:
+        return f"Idempotency key {self.key!r} of user {self.user_id}"
@@ -0,0 +1,32 @@
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination
+
+
+class TaskCursorPagination(CursorPagination):
+    """Keyset pagination over a user's tasks.
+
+    Pages are sliced with ``WHERE created < <cursor>`` in the ``-created``
+    order, with ``id`` as the tie-breaker, so every page is a range scan over
+    the ``(user, -created, id)`` index instead of an ``OFFSET`` scan.
+    """
+
+    ordering = ("-created", "id")
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async counterpart of ``paginate_queryset``.
+
+        The page is built by DRF's own ``paginate_queryset``, in the thread the async ORM
+        uses for its queries, so the async API returns the same pages and cursors as the
+        sync viewset.
+
+        Args:
+            queryset (QuerySet): The tasks to paginate.
+            request (Request): The list request carrying the cursor and page size.
+            view: The view, used to look up the ordering filter.
+
+        Returns:
+            list: The tasks on the requested page, or None if pagination is disabled.
+        """
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
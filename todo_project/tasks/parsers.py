@@ -0,0 +1,62 @@
+"""Request parsers backed by orjson and MessagePack; see ``tasks.renderers``."""
+
+import codecs
+import io
+import re
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .constants import MSGPACK_ERROR_INVALID
+from .renderers import MSGPACK_MEDIA_TYPE, FastJSONRenderer, MessagePackRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the package
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without the package
+    msgpack = None
+
+# orjson turns integers beyond 64 bits into floats; 19+ digit runs go to the stdlib parser.
+_LONG_DIGIT_RUN = re.compile(rb"\d{19}")
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` that decodes UTF-8 bodies with orjson.
+
+    A body orjson rejects, or one that may hold an integer above 64 bits, is parsed by DRF's
+    parser instead, so every body parses to the same data and malformed JSON gets the same
+    error message as before.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if not _LONG_DIGIT_RUN.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class MessagePackParser(BaseParser):
+    """Parses MessagePack request bodies sent as ``Content-Type: application/msgpack``."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError) as exc:
+            raise ParseError(MSGPACK_ERROR_INVALID.format(error=exc))
@@ -0,0 +1,92 @@
+"""Response renderers backed by orjson and MessagePack.
+
+Both packages are optional: without orjson ``FastJSONRenderer`` behaves exactly like DRF's
+``JSONRenderer``, and settings only offer ``MessagePackRenderer`` when msgpack is installed.
+"""
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the package
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without the package
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Types orjson does not know (Decimal, lazy strings, querysets, ...) are converted the same
+# way DRF's encoder converts them.
+_default = JSONEncoder().default
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dumps(data):
+    """Encodes ``data`` as compact UTF-8 JSON, byte for byte like DRF's ``JSONRenderer``.
+
+    Uses orjson when installed and falls back to the standard library for anything orjson
+    refuses (such as integers above 64 bits). Float exponents are the one difference left
+    (``1e20`` instead of ``1e+20``); the task API does not emit floats.
+
+    Args:
+        data: The data to encode.
+
+    Returns:
+        bytes: The encoded document.
+    """
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # Like the renderer, escape the separators that are valid JSON but not JavaScript.
+            if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+                content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                    b"\xe2\x80\xa9", b"\\u2029"
+                )
+            return content
+    return JSONRenderer().render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that encodes compact responses with orjson.
+
+    Indented output (``Accept: application/json; indent=4``, the browsable API) and
+    non-default ``UNICODE_JSON``/``COMPACT_JSON``/``STRICT_JSON`` settings are left to DRF's
+    implementation, so every response keeps its current bytes.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        fast = orjson is not None and not (
+            self.ensure_ascii or not self.compact or not self.strict
+        )
+        if not fast or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renders responses as MessagePack, selected with ``Accept: application/msgpack``.
+
+    Values MessagePack has no type for (datetimes, Decimals, ...) are converted as in JSON,
+    so a decoded body equals the JSON one.
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_default, use_bin_type=True)
@@ -0,0 +1,379 @@
+"""Per-user cache of rendered task list and detail responses.
+
+Entries are keyed by user, endpoint, query parameters, negotiated media type and the user's
+*generation*, a value replaced after every committed task write made through
+``tasks.services``. A write never has to find the entries it makes stale: they stop being
+addressed and age out of the store. Generations are nanosecond timestamps rather than
+counters, so a generation lost to eviction restarts above every value handed out before.
+
+``TASK_RESPONSE_CACHE["BACKEND"]`` selects the store:
+
+* ``memory``: a per-process LRU bounded by ``MAX_BYTES``. Generations live in the process
+  too, so it is only correct with a single worker process; with ``SERVER_WORKERS`` above
+  one the ``file`` store is used instead.
+* ``file``: the Django cache alias named by ``FILE_CACHE`` (a ``FileBasedCache``), shared by
+  every worker on the host.
+* ``none`` (the default): no caching.
+
+Writes made outside the service layer (admin, shell) do not replace the generation; their
+entries are served until ``TTL`` expires.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict, namedtuple
+from functools import partial, wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.http import parse_http_date_safe, urlencode
+
+from .conditional import not_modified, set_validators
+from .constants import RESPONSE_CACHE_GENERATION_PREFIX, RESPONSE_CACHE_KEY_PREFIX
+from .metrics import render_samples
+
+DEFAULT_TASK_RESPONSE_CACHE = {
+    "BACKEND": "none",
+    "MAX_BYTES": 32 * 1024 * 1024,
+    "TTL": 300,
+    "FILE_CACHE": "task_responses",
+}
+
+# Bookkeeping charged to every memory entry on top of its body.
+ENTRY_OVERHEAD_BYTES = 256
+
+CachedResponse = namedtuple(
+    "CachedResponse", ["content_type", "content", "etag", "last_modified"]
+)
+
+
+def _entry_size(entry):
+    return len(entry.content) + ENTRY_OVERHEAD_BYTES
+
+
+class MemoryStore:
+    """Entries in a per-process LRU bounded by the total size of their bodies."""
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[0] <= now:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def set(self, key, entry):
+        if _entry_size(entry) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, entry)
+            self.size += _entry_size(entry)
+            while self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        self.size -= _entry_size(self._entries.pop(key)[1])
+
+    def generation(self, user_id):
+        with self._lock:
+            return self._generations.setdefault(user_id, time.time_ns())
+
+    def bump(self, user_id):
+        with self._lock:
+            previous = self._generations.get(user_id, 0)
+            self._generations[user_id] = max(time.time_ns(), previous + 1)
+
+
+class SharedStore:
+    """Entries and generations in a Django cache alias shared by every worker.
+
+    The backend culls entries on its own, so evictions and size are not observable here.
+    """
+
+    evictions = None
+    size = None
+
+    def __init__(self, alias, ttl):
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, entry):
+        self.cache.set(key, entry, self.ttl)
+
+    def generation(self, user_id):
+        key = f"{RESPONSE_CACHE_GENERATION_PREFIX}{user_id}"
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, time.time_ns(), None)
+            # A fresh value is safe even if the add was culled right away: nothing else
+            # addresses entries with it.
+            generation = self.cache.get(key) or time.time_ns()
+        return generation
+
+    def bump(self, user_id):
+        self.cache.set(
+            f"{RESPONSE_CACHE_GENERATION_PREFIX}{user_id}", time.time_ns(), None
+        )
+
+
+class ResponseCache:
+    """Looks up, stores and invalidates rendered task responses.
+
+    Configuration is read from the ``TASK_RESPONSE_CACHE`` setting on first use. Hits,
+    misses and invalidations are counted per process and exposed on ``/metrics``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config = None
+        self._store = None
+        self._counts = defaultdict(int)
+
+    @property
+    def config(self):
+        if self._config is None:
+            self._config = {
+                **DEFAULT_TASK_RESPONSE_CACHE,
+                **getattr(settings, "TASK_RESPONSE_CACHE", {}),
+            }
+        return self._config
+
+    @property
+    def store(self):
+        """The configured store, or None when caching is disabled.
+
+        A memory store would let every worker serve entries the others invalidated, so with
+        more than one worker the shared store takes its place.
+        """
+        if self._store is None:
+            backend = self.config["BACKEND"]
+            if backend == "memory" and getattr(settings, "SERVER_WORKERS", 1) > 1:
+                backend = "file"
+            if backend == "memory":
+                self._store = MemoryStore(self.config["MAX_BYTES"], self.config["TTL"])
+            elif backend == "file":
+                self._store = SharedStore(self.config["FILE_CACHE"], self.config["TTL"])
+        return self._store
+
+    def key(self, request, endpoint):
+        """Returns the cache key of ``request``, or None if it must not be cached.
+
+        The generation is read before the view touches the database, so a response built
+        from rows older than a write is stored under a generation the write has replaced.
+        Responses of the browsable API embed per-request markup and are never cached.
+        """
+        if self.store is None or request.accepted_renderer.format == "api":
+            return None
+        generation = self.store.generation(request.user.pk)
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw = "|".join(
+            (
+                str(request.user.pk),
+                str(generation),
+                endpoint,
+                request.path,
+                params,
+                request.accepted_media_type,
+            )
+        )
+        return RESPONSE_CACHE_KEY_PREFIX + hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key, endpoint):
+        """Returns the ``CachedResponse`` stored under ``key``, or None."""
+        entry = self.store.get(key)
+        self._count("hit" if entry is not None else "miss", endpoint)
+        return entry
+
+    def lookup(self, request, endpoint):
+        """Returns the key of ``request`` and the entry stored under it.
+
+        Returns:
+            tuple: ``(None, None)`` when the request must not be cached, ``(key, None)`` on
+            a miss and ``(key, entry)`` on a hit.
+        """
+        key = self.key(request, endpoint)
+        if key is None:
+            return None, None
+        return key, self.get(key, endpoint)
+
+    async def alookup(self, request, endpoint):
+        """Async counterpart of ``lookup``; a shared store is read off the event loop."""
+        if isinstance(self.store, SharedStore):
+            return await sync_to_async(self.lookup)(request, endpoint)
+        return self.lookup(request, endpoint)
+
+    def set(self, key, response):
+        """Stores a rendered 200 response under ``key``."""
+        self.store.set(
+            key,
+            CachedResponse(
+                response["Content-Type"],
+                response.content,
+                response.get("ETag"),
+                parse_http_date_safe(response.get("Last-Modified", "")),
+            ),
+        )
+
+    async def aset(self, key, response):
+        """Async counterpart of ``set``."""
+        if isinstance(self.store, SharedStore):
+            await sync_to_async(self.set)(key, response)
+        else:
+            self.set(key, response)
+
+    def invalidate_user(self, user_id):
+        """Stops serving the user's entries once the current transaction commits.
+
+        Replacing the generation before the commit would let a concurrent read cache the
+        old rows under the new generation.
+        """
+        if self.store is not None:
+            transaction.on_commit(partial(self._bump, user_id))
+
+    def _bump(self, user_id):
+        self.store.bump(user_id)
+        self._count("invalidation", "")
+
+    def _count(self, event, endpoint):
+        with self._lock:
+            self._counts[event, endpoint] += 1
+
+    def counters(self):
+        """Returns ``{(event, endpoint): count}`` plus the store's evictions and size."""
+        with self._lock:
+            counts = dict(self._counts)
+        store = self.store
+        if store is not None and store.evictions is not None:
+            counts["eviction", ""] = store.evictions
+            counts["bytes", ""] = store.size
+        return counts
+
+    def render_metrics(self):
+        """Returns the counters in the Prometheus text exposition format."""
+        if self.store is None:
+            return ""
+        counts = self.counters()
+        lookups = {
+            (("endpoint", endpoint), ("result", event)): count
+            for (event, endpoint), count in sorted(counts.items())
+            if event in ("hit", "miss")
+        }
+        lines = render_samples(
+            "task_response_cache_lookups_total",
+            "counter",
+            "Task response cache lookups, by endpoint and result.",
+            lookups,
+        )
+        lines += render_samples(
+            "task_response_cache_invalidations_total",
+            "counter",
+            "Generations replaced after task writes.",
+            {(): counts.get(("invalidation", ""), 0)},
+        )
+        if ("eviction", "") in counts:
+            lines += render_samples(
+                "task_response_cache_evictions_total",
+                "counter",
+                "Entries evicted to stay within MAX_BYTES.",
+                {(): counts["eviction", ""]},
+            )
+            lines += render_samples(
+                "task_response_cache_bytes",
+                "gauge",
+                "Bytes held by the memory store.",
+                {(): counts["bytes", ""]},
+            )
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Drops the store and the counters and forgets the configuration."""
+        with self._lock:
+            self._counts.clear()
+        self._store = None
+        self._config = None
+
+
+response_cache = ResponseCache()
+
+
+def _cached(request, entry):
+    response = not_modified(request, entry.etag, entry.last_modified)
+    if response is None:
+        response = set_validators(
+            HttpResponse(entry.content, content_type=entry.content_type),
+            entry.etag,
+            entry.last_modified,
+        )
+    return response
+
+
+def cache_response(endpoint):
+    """Serves the decorated view method from ``response_cache`` when possible.
+
+    A hit is answered without touching the database: a 304 when the client's validators
+    match the stored ones, the stored body otherwise. On a miss, a 200 response is stored
+    once it has been rendered. Both viewset actions and the handlers of async views can be
+    decorated.
+
+    Args:
+        endpoint (str): The URL name the entries and counters are recorded under.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(self, request, *args, **kwargs):
+                key, entry = await response_cache.alookup(request, endpoint)
+                if key is None:
+                    return await view(self, request, *args, **kwargs)
+                if entry is not None:
+                    return _cached(request, entry)
+
+                response = await view(self, request, *args, **kwargs)
+                if response.status_code == 200:
+                    await response_cache.aset(key, response)
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            key, entry = response_cache.lookup(request, endpoint)
+            if key is None:
+                return view(self, request, *args, **kwargs)
+            if entry is not None:
+                return _cached(request, entry)
+
+            response = view(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response.add_post_render_callback(partial(response_cache.set, key))
+            return response
+
+        return wrapper
+
+    return decorator
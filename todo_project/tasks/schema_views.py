@@ -0,0 +1,161 @@
+"""OpenAPI schema views served from documents generated once instead of on every request.
+
+``drf_yasg`` walks every view and ``swagger_auto_schema`` decorator each time the schema
+is requested. ``manage.py generate_openapi_schema`` renders the JSON and YAML documents at
+build time into ``settings.OPENAPI_SCHEMA_DIR``; each process reads them on first use and
+answers from memory with a content-hash ``ETag``, so a poller that sends ``If-None-Match``
+gets a bodiless 304. With ``DEBUG`` the files are ignored and the documents are generated
+on first use, which the autoreloader repeats after every code change.
+
+The documents are generated without a request, so they carry no ``host`` or ``schemes``
+and clients resolve the API against the URL they fetched the schema from.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+from .conditional import not_modified, set_validators
+
+logger = logging.getLogger(__name__)
+
+API_INFO = openapi.Info(
+    title="Todo API",
+    default_version="v1",
+    description="API documentation for the Todo project.",
+    contact=openapi.Contact(email="support@example.com"),
+    license=openapi.License(name="MIT License"),
+)
+
+# Document file name and codec of each spec renderer format (``?format=``).
+SCHEMA_CODECS = {"json": OpenAPICodecJson, "yaml": OpenAPICodecYaml}
+SCHEMA_DOCUMENTS = {"openapi": "json", "json": "json", "yaml": "yaml"}
+
+SchemaDocument = namedtuple("SchemaDocument", "content etag")
+
+
+def generate_schema_documents():
+    """Generates the public schema and renders it in every document format.
+
+    Returns:
+        dict: The rendered bytes by document name (``json``, ``yaml``).
+    """
+    schema = OpenAPISchemaGenerator(API_INFO).get_schema(request=None, public=True)
+    return {name: codec([]).encode(schema) for name, codec in SCHEMA_CODECS.items()}
+
+
+def schema_document_path(name, directory=None):
+    """Returns the path of the ``name`` document, by default in ``OPENAPI_SCHEMA_DIR``."""
+    return Path(directory or settings.OPENAPI_SCHEMA_DIR) / f"openapi.{name}"
+
+
+def write_schema_documents(directory=None):
+    """Generates the documents and replaces their files.
+
+    Args:
+        directory (str): Where to write them; defaults to ``settings.OPENAPI_SCHEMA_DIR``.
+
+    Returns:
+        dict: The ``SchemaDocument`` written for each document name.
+    """
+    documents = {}
+    for name, content in generate_schema_documents().items():
+        path = schema_document_path(name, directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_name(path.name + ".part")
+        partial_path.write_bytes(content)
+        os.replace(partial_path, path)
+        documents[name] = _document(content)
+    return documents
+
+
+def _document(content):
+    digest = hashlib.sha256(content).hexdigest()
+    return SchemaDocument(content, f'"{digest[:32]}"')
+
+
+class SchemaDocuments:
+    """The process's schema documents, loaded or generated once on first use."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = None
+
+    def get(self, name):
+        """Returns the ``SchemaDocument`` for ``name``, loading the documents if needed."""
+        if self._documents is None:
+            with self._lock:
+                if self._documents is None:
+                    self._documents = self._load()
+        return self._documents[name]
+
+    def _load(self):
+        if not settings.DEBUG:
+            try:
+                return {
+                    name: _document(schema_document_path(name).read_bytes())
+                    for name in SCHEMA_CODECS
+                }
+            except FileNotFoundError:
+                logger.warning(
+                    "No OpenAPI documents in %s; generating them in this process. "
+                    "Run `manage.py generate_openapi_schema` when building the image.",
+                    settings.OPENAPI_SCHEMA_DIR,
+                )
+        return {
+            name: _document(content)
+            for name, content in generate_schema_documents().items()
+        }
+
+    def clear(self):
+        """Forgets the loaded documents, so the next request reads them again."""
+        with self._lock:
+            self._documents = None
+
+
+schema_documents = SchemaDocuments()
+
+
+class SchemaView(
+    get_schema_view(
+        API_INFO,
+        public=True,  # allow public access to docs, only for demo
+        permission_classes=[
+            permissions.AllowAny
+        ],  # no auth required to view docs for demo
+    )
+):
+    """``drf_yasg`` schema view answering spec formats from ``schema_documents``.
+
+    The Swagger UI and ReDoc pages still go through ``drf_yasg``, which renders them
+    without walking the API; the schema they then fetch comes from memory.
+    """
+
+    def get(self, request, version="", format=None):
+        renderer = request.accepted_renderer
+        name = SCHEMA_DOCUMENTS.get(renderer.format)
+        if name is None:
+            return super().get(request, version, format)
+
+        document = schema_documents.get(name)
+        response = not_modified(request, document.etag, None)
+        if response is None:
+            response = HttpResponse(
+                document.content,
+                content_type=f"{renderer.media_type}; charset={renderer.charset}",
+            )
+            set_validators(response, document.etag, None)
+        # Let clients keep a copy but revalidate it, which costs them a 304 at most.
+        response["Cache-Control"] = "no-cache"
+        return response
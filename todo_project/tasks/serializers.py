@@ -1,17 +1,221 @@
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
-from .models import Task
+from .constants import (
+    BULK_ERROR_DUPLICATE_IDS,
+    BULK_ERROR_EMPTY,
+    BULK_ERROR_TOO_MANY_OPERATIONS,
+    BULK_MAX_OPERATIONS,
+    BULK_OP_CREATE,
+    BULK_OP_DELETE,
+    BULK_OP_UPDATE,
+    EXPORT_CONTENT_TYPES,
+    EXPORT_FORMAT_JSON,
+    JOB_ERROR_TOO_MANY_TASKS,
+    JOB_IMPORT_MAX_TASKS,
+    JOB_KIND_EXPORT,
+    JOB_KIND_IMPORT,
+    JOB_KIND_PURGE,
+)
+from .metrics import serialization_timer
+from .models import Job, Task
+
+TASK_FIELDS = ("id", "title", "description", "is_completed", "created", "modified")
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """``ListSerializer`` whose ``data`` counts as request serialization time."""
+
+    @property
+    def data(self):
+        with serialization_timer():
+            return super().data
 
 
 class TaskSerializer(serializers.ModelSerializer):
+    @property
+    def data(self):
+        with serialization_timer():
+            return super().data
+
     class Meta:
         model = Task
+        fields = list(TASK_FIELDS)
+        read_only_fields = ["id", "created", "modified"]
+        list_serializer_class = TimedListSerializer
+
+
+def datetime_formatter():
+    """Returns a function that formats datetimes exactly like DRF's ``DateTimeField``.
+
+    The output format and the current timezone are resolved once, when the formatter is
+    built, instead of for every value. Non-ISO formats use the field itself.
+    """
+    field = serializers.DateTimeField()
+    output_format = api_settings.DATETIME_FORMAT
+    field_timezone = field.default_timezone()
+    if (
+        output_format is None
+        or output_format.lower() != ISO_8601
+        or field_timezone is None
+    ):
+        return field.to_representation
+
+    def format_datetime(value):
+        if not value:
+            return None
+        text = value.astimezone(field_timezone).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return format_datetime
+
+
+class TaskRowSerializer:
+    """Read-only fast path that produces the same output as ``TaskSerializer``.
+
+    Rows are fetched with ``values_list(named=True)`` on ``TASK_FIELDS``, so no model
+    instances are built, and each row becomes a dict directly instead of going through
+    every field's ``to_representation``. A ``modified`` equal to ``created`` (tasks never
+    edited since creation) reuses the formatted ``created`` string.
+
+    Example::
+
+        serializer = TaskRowSerializer()
+        data = serializer.serialize(serializer.rows(queryset))
+    """
+
+    def __init__(self):
+        self.format_datetime = datetime_formatter()
+
+    @staticmethod
+    def rows(queryset):
+        """Returns ``queryset`` as named rows holding only the serialized fields."""
+        return queryset.values_list(*TASK_FIELDS, named=True)
+
+    def to_representation(self, row):
+        task_id, title, description, is_completed, created, modified = row
+        created_text = self.format_datetime(created)
+        return {
+            "id": task_id,
+            "title": title,
+            "description": description,
+            "is_completed": is_completed,
+            "created": created_text,
+            "modified": (
+                created_text if modified == created else self.format_datetime(modified)
+            ),
+        }
+
+    def serialize(self, rows):
+        """Returns the representation of every row, timed as serialization."""
+        with serialization_timer():
+            return [self.to_representation(row) for row in rows]
+
+
+class TaskBulkUpdateItemSerializer(TaskSerializer):
+    """A partial task update addressed by ``id`` inside a bulk request."""
+
+    id = serializers.IntegerField(min_value=1)
+
+    class Meta(TaskSerializer.Meta):
+        read_only_fields = ["created", "modified"]
+        extra_kwargs = {"title": {"required": False}}
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """Validates a batch of task operations for the bulk endpoint."""
+
+    create = TaskSerializer(many=True, required=False)
+    update = TaskBulkUpdateItemSerializer(many=True, required=False)
+    delete = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
+
+    def validate(self, attrs):
+        creates = attrs.setdefault(BULK_OP_CREATE, [])
+        updates = attrs.setdefault(BULK_OP_UPDATE, [])
+        deletes = attrs.setdefault(BULK_OP_DELETE, [])
+
+        total = len(creates) + len(updates) + len(deletes)
+        if not total:
+            raise serializers.ValidationError(BULK_ERROR_EMPTY)
+        if total > BULK_MAX_OPERATIONS:
+            raise serializers.ValidationError(
+                BULK_ERROR_TOO_MANY_OPERATIONS.format(limit=BULK_MAX_OPERATIONS)
+            )
+
+        ids = [item["id"] for item in updates] + deletes
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError(BULK_ERROR_DUPLICATE_IDS)
+        return attrs
+
+
+class JobImportParamsSerializer(serializers.Serializer):
+    """Input of an ``import`` job: the tasks to create."""
+
+    tasks = TaskSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=JOB_IMPORT_MAX_TASKS,
+        error_messages={
+            "max_length": JOB_ERROR_TOO_MANY_TASKS.format(limit=JOB_IMPORT_MAX_TASKS)
+        },
+    )
+
+
+class JobExportParamsSerializer(serializers.Serializer):
+    """Input of an ``export`` job: the file format."""
+
+    format = serializers.ChoiceField(
+        choices=list(EXPORT_CONTENT_TYPES), default=EXPORT_FORMAT_JSON
+    )
+
+
+class JobPurgeParamsSerializer(serializers.Serializer):
+    """Input of a ``purge`` job: whether to keep the pending tasks."""
+
+    completed_only = serializers.BooleanField(default=False)
+
+
+JOB_PARAMS_SERIALIZERS = {
+    JOB_KIND_IMPORT: JobImportParamsSerializer,
+    JOB_KIND_EXPORT: JobExportParamsSerializer,
+    JOB_KIND_PURGE: JobPurgeParamsSerializer,
+}
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """A background job. ``params`` is validated per ``kind`` and not echoed back."""
+
+    params = serializers.JSONField(write_only=True, required=False)
+
+    class Meta:
+        model = Job
         fields = [
             "id",
-            "title",
-            "description",
-            "is_completed",
+            "kind",
+            "status",
+            "params",
+            "result",
+            "error",
             "created",
             "modified",
+            "started_at",
+            "finished_at",
         ]
-        read_only_fields = ["id", "created", "modified"]
+        read_only_fields = [
+            "status",
+            "result",
+            "error",
+            "created",
+            "modified",
+            "started_at",
+            "finished_at",
+        ]
+
+    def validate(self, attrs):
+        params = JOB_PARAMS_SERIALIZERS[attrs["kind"]](data=attrs.get("params") or {})
+        if not params.is_valid():
+            raise serializers.ValidationError({"params": params.errors})
+        attrs["params"] = params.validated_data
+        return attrs
@@ -0,0 +1,437 @@
+"""Write paths for tasks and the per-user bookkeeping that must change with them.
+
+Besides the counters, every task write replaces the owner's response cache generation once
+its transaction commits.
+"""
+
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import exceptions, serializers
+
+from .constants import (
+    BULK_OP_UPDATE,
+    DELETE_BATCH_PAUSE,
+    DELETE_BATCH_SIZE,
+    JSON_KEY_ID,
+    TASK_ERROR_NOT_FOUND,
+)
+from .hashing import ahash_password, hash_password
+from .models import (
+    IdempotencyKey,
+    Job,
+    Task,
+    TaskDailyStats,
+    TaskTombstone,
+    UserTaskSummary,
+)
+from .response_cache import response_cache
+
+
+def _build_user(username, email, encoded_password):
+    user_model = get_user_model()
+    return user_model(
+        username=user_model.normalize_username(username),
+        email=user_model.objects.normalize_email(email),
+        password=encoded_password,
+    )
+
+
+def create_user(username, password, email=""):
+    """Creates a user, hashing the password on the hashing pool.
+
+    Mirrors ``UserManager.create_user`` but stores a precomputed hash, so the key stretching
+    does not run on the request thread when a pool is configured.
+
+    Args:
+        username (str): The new user's username.
+        password (str): The raw password.
+        email (str): The optional email address.
+
+    Returns:
+        User: The saved user.
+    """
+    user = _build_user(username, email, hash_password(password))
+    user.save()
+    return user
+
+
+async def acreate_user(username, password, email=""):
+    """Async counterpart of ``create_user``."""
+    user = _build_user(username, email, await ahash_password(password))
+    await user.asave()
+    return user
+
+
+def _update_or_create(model, lookup, changes):
+    """Applies ``changes`` to the row matching ``lookup``, creating the row if needed.
+
+    Values may be plain values or ``F()`` expressions; for a row that does not exist yet the
+    expressions are evaluated against the field defaults.
+    """
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup)
+    except IntegrityError:
+        pass  # Created concurrently; the update below still applies.
+    model.objects.filter(**lookup).update(**changes)
+
+
+class _StatsDelta:
+    """Net change a write makes to a user's task counters.
+
+    Every task contributes one to the total and to the ``created`` count of its creation
+    day and, while completed, one to the completed total and to the ``completed`` count of
+    its completion day. A write adds the contribution of the tasks as they are after it and
+    removes their contribution from before it.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.daily = defaultdict(lambda: [0, 0])
+
+    def add(self, created, completed_at, sign=1):
+        self.total += sign
+        self.daily[timezone.localdate(created)][0] += sign
+        if completed_at is not None:
+            self.completed += sign
+            self.daily[timezone.localdate(completed_at)][1] += sign
+
+    def remove(self, created, completed_at):
+        self.add(created, completed_at, sign=-1)
+
+    def apply(self, user_id, **summary_changes):
+        """Writes the delta, along with any other ``summary_changes``, to the counters.
+
+        Takes one summary update and one upsert per calendar day touched.
+        """
+        if self.total:
+            summary_changes["total_count"] = F("total_count") + self.total
+        if self.completed:
+            summary_changes["completed_count"] = F("completed_count") + self.completed
+        if summary_changes:
+            _update_summary(user_id, **summary_changes)
+        for day, (created, completed) in sorted(self.daily.items()):
+            if created or completed:
+                _update_or_create(
+                    TaskDailyStats,
+                    {"user_id": user_id, "date": day},
+                    {
+                        "created_count": F("created_count") + created,
+                        "completed_count": F("completed_count") + completed,
+                    },
+                )
+
+
+def _update_summary(user_id, **changes):
+    """Applies ``changes`` to the user's summary row, creating the row if needed."""
+    _update_or_create(UserTaskSummary, {"user_id": user_id}, changes)
+
+
+def _locked_states(queryset):
+    """Returns ``{id: (created, completed_at)}`` for ``queryset``, locking the rows."""
+    return {
+        task_id: (created, completed_at)
+        for task_id, created, completed_at in queryset.select_for_update()
+        .order_by("id")
+        .values_list("id", "created", "completed_at")
+    }
+
+
+def record_task_deletions(user, states, stats=None):
+    """Leaves tombstones for deleted tasks and updates the user's summary.
+
+    Must run in the same transaction as the delete itself.
+
+    Args:
+        user (User): The owner of the deleted tasks.
+        states (dict): ``{id: (created, completed_at)}`` of the deleted tasks.
+        stats (_StatsDelta): Other counter changes of the same write, applied together.
+    """
+    stats = stats or _StatsDelta()
+    for created, completed_at in states.values():
+        stats.remove(created, completed_at)
+    if not states:
+        stats.apply(user.pk)
+        return
+    now = timezone.now()
+    TaskTombstone.objects.bulk_create(
+        [
+            TaskTombstone(user=user, task_id=task_id, deleted_at=now)
+            for task_id in states
+        ]
+    )
+    stats.apply(user.pk, delete_version=F("delete_version") + 1, last_deleted_at=now)
+
+
+def create_task(user, **data):
+    """Creates a task and counts it in the user's statistics in the same transaction.
+
+    Args:
+        user (User): The owner of the new task.
+        **data: Validated task fields.
+
+    Returns:
+        Task: The saved task.
+    """
+    task = Task(user=user, **data)
+    stats = _StatsDelta()
+    with transaction.atomic():
+        task.save()
+        stats.add(task.created, task.completed_at)
+        stats.apply(user.pk)
+        response_cache.invalidate_user(user.pk)
+    return task
+
+
+def update_task(task, changes):
+    """Applies validated ``changes`` to ``task`` and adjusts the user's statistics.
+
+    The task's row is locked and re-read first, so the completion state the counters
+    are adjusted from is the committed one even when updates race.
+
+    Args:
+        task (Task): The task to update.
+        changes (dict): Validated task fields.
+
+    Returns:
+        Task: The saved task.
+
+    Raises:
+        NotFound: If the task was deleted in the meantime.
+    """
+    for field, value in changes.items():
+        setattr(task, field, value)
+    stats = _StatsDelta()
+    with transaction.atomic():
+        state = _locked_states(Task.objects.filter(pk=task.pk)).get(task.pk)
+        if state is None:
+            raise exceptions.NotFound(TASK_ERROR_NOT_FOUND)
+        task.completed_at = state[1]
+        task.save()
+        stats.remove(*state)
+        stats.add(task.created, task.completed_at)
+        stats.apply(task.user_id)
+        response_cache.invalidate_user(task.user_id)
+    return task
+
+
+def delete_task(user, task):
+    """Deletes a single task and records the deletion in the same transaction.
+
+    Args:
+        user (User): The owner of the task.
+        task (Task): The task to delete.
+    """
+    _delete_tasks(user, Task.objects.filter(pk=task.pk))
+
+
+def _delete_tasks(user, queryset):
+    """Deletes ``queryset`` (tasks of ``user``) and records the deletions atomically.
+
+    Returns:
+        set: The ids that were deleted.
+    """
+    with transaction.atomic():
+        states = _locked_states(queryset)
+        Task.objects.filter(pk__in=states).delete()
+        record_task_deletions(user, states)
+        response_cache.invalidate_user(user.pk)
+    return set(states)
+
+
+def apply_bulk_operations(user, creates, updates, deletes):
+    """Applies a validated batch of task operations inside a single transaction.
+
+    The update and delete targets are locked first, and the updates are applied to the
+    locked rows, so a concurrent write either lands before the batch reads them or waits
+    for it. Each update only writes the fields its item sends (plus ``modified``), with
+    one ``bulk_update`` per distinct set of fields, so fields the batch does not touch
+    keep whatever another request wrote to them.
+
+    Apart from that ``bulk_update`` per field set, the number of queries does not depend
+    on the size of the batch: one locking read of the update targets, one ``bulk_create``,
+    one locking read of the delete targets, a single ``DELETE ... WHERE id IN (...)``, one
+    tombstone insert, one summary update and one statistics upsert per calendar day
+    touched.
+
+    Args:
+        user (User): The owner of every task in the batch.
+        creates (list[dict]): Validated data for the tasks to create.
+        updates (list[dict]): Validated partial data for the tasks to update, each with an ``id``.
+        deletes (list[int]): Ids of the tasks to delete.
+
+    Returns:
+        tuple: The created tasks, the updated tasks and the set of ids that were deleted.
+
+    Raises:
+        ValidationError: If an update targets a task the user does not own, or one that no
+            longer exists.
+    """
+    queryset = Task.objects.filter(user=user)
+    stats = _StatsDelta()
+    with transaction.atomic():
+        targets = {}
+        if updates:
+            targets = (
+                queryset.select_for_update()
+                .order_by("id")
+                .in_bulk([item[JSON_KEY_ID] for item in updates])
+            )
+            errors = [
+                (
+                    {}
+                    if item[JSON_KEY_ID] in targets
+                    else {JSON_KEY_ID: [TASK_ERROR_NOT_FOUND]}
+                )
+                for item in updates
+            ]
+            if any(errors):
+                raise serializers.ValidationError({BULK_OP_UPDATE: errors})
+        states = {}
+        if deletes:
+            states = _locked_states(queryset.filter(id__in=deletes))
+        # Stamped once the rows are locked, so no write that commits after this batch can
+        # carry an older ``modified``.
+        now = timezone.now()
+
+        created = [Task(user=user, **item) for item in creates]
+        for task in created:
+            task.sync_completed_at(now)
+        created = Task.objects.bulk_create(created)
+        for task in created:
+            stats.add(task.created, task.completed_at)
+
+        updated = []
+        field_sets = defaultdict(list)
+        for item in updates:
+            task = targets[item[JSON_KEY_ID]]
+            stats.remove(task.created, task.completed_at)
+            fields = {"modified"}
+            for field, value in item.items():
+                if field != JSON_KEY_ID:
+                    setattr(task, field, value)
+                    fields.add(field)
+            if "is_completed" in fields:
+                task.sync_completed_at(now)
+                fields.add("completed_at")
+            task.modified = now
+            stats.add(task.created, task.completed_at)
+            field_sets[tuple(sorted(fields))].append(task)
+            updated.append(task)
+        for fields, tasks in field_sets.items():
+            Task.objects.bulk_update(tasks, fields)
+
+        if states:
+            queryset.filter(id__in=states).delete()
+        record_task_deletions(user, states, stats)
+        response_cache.invalidate_user(user.pk)
+
+    return created, updated, set(states)
+
+
+# Rows owned by a user that ``delete_user`` removes in batches before the user itself.
+# None of them has delete signals or rows depending on it, so Django deletes them with a
+# single DELETE per batch instead of collecting them first.
+USER_BATCH_DELETED_MODELS = (Task, TaskTombstone, TaskDailyStats, Job, IdempotencyKey)
+
+
+def id_batches(queryset, batch_size, pause):
+    """Yields the ids of ``queryset`` in ascending lists of at most ``batch_size``.
+
+    Each lookup starts after the last id of the previous batch, so it is a range scan that
+    never revisits deleted rows (or, on PostgreSQL, their dead tuples). The caller deletes
+    each batch before asking for the next one, which comes ``pause`` seconds later: SQLite
+    does not queue writers, and without a gap the deleting loop takes the lock back before
+    a writer backing off in its busy handler retries.
+    """
+    last_id = 0
+    while True:
+        if last_id:
+            time.sleep(pause)
+        ids = list(
+            queryset.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def purge_tasks(
+    user,
+    completed_only=False,
+    batch_size=DELETE_BATCH_SIZE,
+    pause=DELETE_BATCH_PAUSE,
+    progress=None,
+):
+    """Deletes the user's tasks in id-ordered batches, one short transaction each.
+
+    Unlike a single ``QuerySet.delete()``, the rows locked and the ids held in memory are
+    bounded by ``batch_size`` however many tasks the user owns, and other writers get the
+    database between batches. Every batch leaves tombstones and updates the statistics
+    like any other delete.
+
+    Args:
+        user (User): The owner of the tasks.
+        completed_only (bool): Keep the pending tasks.
+        batch_size (int): Tasks deleted per transaction.
+        pause (float): Seconds to wait between batches.
+        progress (callable): Called with the running total after every batch.
+
+    Returns:
+        int: The number of tasks deleted.
+    """
+    queryset = Task.objects.filter(user=user)
+    if completed_only:
+        queryset = queryset.filter(is_completed=True)
+    purged = 0
+    for ids in id_batches(queryset, batch_size, pause):
+        # Re-filtered under the lock, so a task reopened meanwhile is kept.
+        purged += len(_delete_tasks(user, queryset.filter(pk__in=ids)))
+        if progress is not None:
+            progress(purged)
+    return purged
+
+
+def delete_user(user, batch_size=DELETE_BATCH_SIZE, pause=DELETE_BATCH_PAUSE):
+    """Deletes a user and everything they own without one long cascading transaction.
+
+    The rows of ``USER_BATCH_DELETED_MODELS`` are deleted first, in id-ordered batches of
+    ``batch_size`` with a transaction each; the user and the few rows left (token,
+    summary) then go in one small cascade. No tombstones or statistics are written for
+    the tasks, since they disappear with the user. If this is interrupted, the user is
+    left with fewer rows and stale counters (``rebuild_task_stats`` fixes them), and
+    running it again finishes the job.
+
+    Args:
+        user (User): The user to delete.
+        batch_size (int): Rows deleted per transaction.
+        pause (float): Seconds to wait between batches.
+
+    Returns:
+        dict: ``{model label: rows deleted}``, like the second item of
+            ``QuerySet.delete()``.
+    """
+    deleted = defaultdict(int)
+    for model in USER_BATCH_DELETED_MODELS:
+        queryset = model.objects.filter(user=user)
+        for ids in id_batches(queryset, batch_size, pause):
+            with transaction.atomic():
+                _, counts = model.objects.filter(pk__in=ids).delete()
+            for label, count in counts.items():
+                deleted[label] += count
+    with transaction.atomic():
+        _, counts = user.delete()
+    for label, count in counts.items():
+        deleted[label] += count
+    return dict(deleted)
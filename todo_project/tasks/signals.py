@@ -0,0 +1,45 @@
+"""Signal receivers that keep caches consistent with the database and wire up metrics."""
+
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .metrics import record_query
+
+
+def _revoke_cached_tokens(user_id):
+    # Right away, so this process stops serving the old entries, and again once the change
+    # has committed: a request that read the old row in between is then discarded too.
+    token_cache.invalidate_user(user_id)
+    transaction.on_commit(partial(token_cache.invalidate_user, user_id))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Stops a deleted token (e.g. on logout) from authenticating from cache."""
+    _revoke_cached_tokens(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """Drops cached tokens whenever a user changes (password, ``is_active``, ...)."""
+    if not created:
+        _revoke_cached_tokens(instance.pk)
+
+
+@receiver(connection_created)
+def install_query_metrics(sender, connection, **kwargs):
+    """Times every statement on new connections for the request metrics.
+
+    The wrapper is installed on the connection rather than per request because async views
+    run their queries on executor threads with their own connection objects; it finds the
+    current request's measurements through a context variable, which does follow them.
+    """
+    if settings.METRICS["ENABLED"] and record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
@@ -0,0 +1,189 @@
+"""Per-user task statistics: reading the maintained counters and rebuilding them.
+
+The counters live in ``UserTaskSummary`` (totals) and ``TaskDailyStats`` (per day) and are
+updated by ``tasks.services`` in the same transaction as every task write, so reading them
+costs two indexed lookups whatever the number of tasks.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .constants import (
+    JSON_KEY_COMPLETED,
+    JSON_KEY_CREATED,
+    JSON_KEY_DAILY,
+    JSON_KEY_DATE,
+    JSON_KEY_PENDING,
+    JSON_KEY_TOTAL,
+    STATS_DAYS_PARAM,
+    STATS_DEFAULT_DAYS,
+    STATS_MAX_DAYS,
+    STATS_REBUILD_BATCH_SIZE,
+)
+from .models import Task, TaskDailyStats, UserTaskSummary
+
+
+def stats_days(params):
+    """Reads the ``days`` query parameter, clamped between 1 and ``STATS_MAX_DAYS``."""
+    try:
+        days = int(params.get(STATS_DAYS_PARAM, STATS_DEFAULT_DAYS))
+    except ValueError:
+        days = STATS_DEFAULT_DAYS
+    return min(max(days, 1), STATS_MAX_DAYS)
+
+
+def _stats_queries(user, days):
+    since = timezone.localdate() - timedelta(days=days - 1)
+    summary = UserTaskSummary.objects.filter(user=user).values_list(
+        "total_count", "completed_count"
+    )
+    daily = (
+        TaskDailyStats.objects.filter(user=user, date__gte=since)
+        .exclude(created_count=0, completed_count=0)
+        .order_by("date")
+        .values_list("date", "created_count", "completed_count")
+    )
+    return summary, daily
+
+
+def _stats_payload(counts, daily):
+    total, completed = counts or (0, 0)
+    return {
+        JSON_KEY_TOTAL: total,
+        JSON_KEY_COMPLETED: completed,
+        JSON_KEY_PENDING: total - completed,
+        JSON_KEY_DAILY: [
+            {
+                JSON_KEY_DATE: date.isoformat(),
+                JSON_KEY_CREATED: created,
+                JSON_KEY_COMPLETED: completed,
+            }
+            for date, created, completed in daily
+        ],
+    }
+
+
+def task_stats(user, days):
+    """Returns the user's task counts and the daily counts of the last ``days`` days.
+
+    Args:
+        user (User): The owner of the tasks.
+        days (int): How many days, today included, of daily counts to return.
+
+    Returns:
+        dict: ``total``, ``completed``, ``pending`` and ``daily``, the days with activity
+            in ascending order.
+    """
+    summary, daily = _stats_queries(user, days)
+    return _stats_payload(summary.first(), list(daily))
+
+
+async def atask_stats(user, days):
+    """Async counterpart of ``task_stats``."""
+    summary, daily = _stats_queries(user, days)
+    return _stats_payload(await summary.afirst(), [row async for row in daily])
+
+
+def rebuild_task_stats(
+    user_ids,
+    task_model=Task,
+    summary_model=UserTaskSummary,
+    daily_model=TaskDailyStats,
+):
+    """Recomputes the counters of ``user_ids`` from their tasks in one transaction.
+
+    The users' summary rows are locked first, so a task write racing with the rebuild
+    either is counted by it or applies its increment after it, never both. The model
+    arguments let migrations pass their historical models.
+
+    Args:
+        user_ids (Iterable[int]): The users whose counters are rebuilt.
+
+    Returns:
+        int: The number of tasks counted.
+    """
+    user_ids = list(user_ids)
+    with transaction.atomic():
+        existing = set(
+            summary_model.objects.select_for_update()
+            .filter(user_id__in=user_ids)
+            .values_list("user_id", flat=True)
+        )
+        tasks = task_model.objects.filter(user_id__in=user_ids).order_by()
+        totals = {
+            row["user_id"]: (row["total"], row["completed"])
+            for row in tasks.values("user_id").annotate(
+                total=Count("id"), completed=Count("id", filter=Q(is_completed=True))
+            )
+        }
+        daily = defaultdict(lambda: [0, 0])
+        for field, index in (("created", 0), ("completed_at", 1)):
+            rows = (
+                tasks.filter(**{f"{field}__isnull": False})
+                .annotate(day=TruncDate(field))
+                .values("user_id", "day")
+                .annotate(count=Count("id"))
+            )
+            for row in rows:
+                daily[row["user_id"], row["day"]][index] = row["count"]
+
+        daily_model.objects.filter(user_id__in=user_ids).delete()
+        daily_model.objects.bulk_create(
+            daily_model(
+                user_id=user_id,
+                date=day,
+                created_count=created,
+                completed_count=completed,
+            )
+            for (user_id, day), (created, completed) in daily.items()
+        )
+        summaries = [
+            summary_model(
+                user_id=user_id,
+                total_count=totals.get(user_id, (0, 0))[0],
+                completed_count=totals.get(user_id, (0, 0))[1],
+            )
+            for user_id in existing | set(totals)
+        ]
+        summary_model.objects.bulk_update(
+            [summary for summary in summaries if summary.user_id in existing],
+            ["total_count", "completed_count"],
+        )
+        summary_model.objects.bulk_create(
+            [summary for summary in summaries if summary.user_id not in existing]
+        )
+    return sum(total for total, _ in totals.values())
+
+
+def rebuild_all_task_stats(user_model, batch_size=STATS_REBUILD_BATCH_SIZE, **models):
+    """Rebuilds the counters of every user, ``batch_size`` users per transaction.
+
+    Returns:
+        int: The number of tasks counted.
+    """
+    user_ids = list(user_model.objects.order_by("pk").values_list("pk", flat=True))
+    return sum(
+        rebuild_task_stats(user_ids[start : start + batch_size], **models)
+        for start in range(0, len(user_ids), batch_size)
+    )
+
+
+def backfill_task_stats(apps, schema_editor):
+    """Data migration: stamps completed tasks and builds every user's counters."""
+    task_model = apps.get_model("tasks", "Task")
+    # The completion time of older tasks is unknown; their last change is the best guess.
+    task_model.objects.filter(is_completed=True, completed_at__isnull=True).update(
+        completed_at=F("modified")
+    )
+    rebuild_all_task_stats(
+        apps.get_model(settings.AUTH_USER_MODEL),
+        task_model=task_model,
+        summary_model=apps.get_model("tasks", "UserTaskSummary"),
+        daily_model=apps.get_model("tasks", "TaskDailyStats"),
+    )
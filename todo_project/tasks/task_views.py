@@ -1,17 +1,55 @@
-from rest_framework.authentication import TokenAuthentication
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from .docs.task_docs import (
-    create_task_schema,
-    delete_task_schema,
-    list_tasks_schema,
-    partial_update_task_schema,
-    retrieve_task_schema,
-    update_task_schema,
+from .authentication import CachedTokenAuthentication
+from .conditional import (
+    not_modified,
+    set_validators,
+    task_list_validators,
+    task_validators,
 )
+from .constants import (
+    BULK_OP_CREATE,
+    BULK_OP_DELETE,
+    BULK_OP_UPDATE,
+    EXPORT_CONTENT_TYPES,
+    EXPORT_ERROR_INVALID_FORMAT,
+    EXPORT_FORMAT_JSON,
+    EXPORT_FORMAT_PARAM,
+    JSON_KEY_CHANGED,
+    JSON_KEY_CURSOR,
+    JSON_KEY_DELETED,
+    JSON_KEY_DETAIL,
+    JSON_KEY_HAS_MORE,
+    JSON_KEY_ID,
+    JSON_KEY_STATUS,
+    JSON_KEY_TASK,
+    ORDERING_FIELDS,
+    SYNC_ERROR_EXPIRED_CURSOR,
+    SYNC_ERROR_INVALID_CURSOR,
+    SYNC_MAX_PAGE_SIZE,
+    SYNC_PAGE_SIZE,
+    SYNC_PAGE_SIZE_PARAM,
+    SYNC_SINCE_PARAM,
+)
+from .docs import load_docs
+from .exports import EXPORT_STREAMERS
+from .filters import TaskFilterBackend, TaskOrderingFilter
+from .idempotency import idempotent
 from .models import Task
-from .serializers import TaskSerializer
+from .pagination import TaskCursorPagination
+from .response_cache import cache_response
+from .serializers import TaskBulkSerializer, TaskRowSerializer, TaskSerializer
+from .services import apply_bulk_operations, create_task, delete_task, update_task
+from .stats import stats_days, task_stats
+from .sync import ExpiredCursor, InvalidCursor, collect_changes, decode_cursor
+from .throttling import TaskUserThrottle
+
+task_docs = load_docs("task_docs")
 
 
 class TaskViewSet(ModelViewSet):
@@ -22,8 +60,13 @@ class TaskViewSet(ModelViewSet):
     """
 
     serializer_class = TaskSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [TaskUserThrottle]
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend, TaskOrderingFilter]
+    ordering_fields = ORDERING_FIELDS
+    ordering = TaskCursorPagination.ordering
 
     def get_queryset(self):
         """Returns the queryset of tasks belonging to the authenticated user.
@@ -41,18 +84,47 @@ class TaskViewSet(ModelViewSet):
     def perform_create(self, serializer):
         """Associates the newly created task with the authenticated user.
 
-        Ensures that tasks are always created for the user making the request.
+        Ensures that tasks are always created for the user making the request, and counts
+        the task in the user's statistics in the same transaction.
 
         Args:
             serializer (TaskSerializer): The serializer instance used to save the new task.
         """
-        serializer.save(user=self.request.user)
+        serializer.instance = create_task(
+            self.request.user, **serializer.validated_data
+        )
+
+    def perform_update(self, serializer):
+        """Saves the validated changes and adjusts the user's statistics.
+
+        Args:
+            serializer (TaskSerializer): The serializer bound to the task being updated.
+        """
+        serializer.instance = update_task(
+            serializer.instance, serializer.validated_data
+        )
+
+    def perform_destroy(self, instance):
+        """Deletes the task, leaving a tombstone and updating the user's task summary.
+
+        Args:
+            instance (Task): The task to delete.
+        """
+        delete_task(self.request.user, instance)
 
-    @list_tasks_schema
+    @task_docs.list_tasks_schema
+    @cache_response("tasks-list")
     def list(self, request, *args, **kwargs):
         """Lists all tasks belonging to the authenticated user.
 
-        Returns a paginated response containing the user's tasks.
+        Returns a paginated response containing the user's tasks, optionally filtered by
+        ``is_completed``, ``created_*``/``modified_*`` ranges and ``search``, and ordered by a
+        whitelisted field through ``ordering``. Rows are read and serialized through
+        ``TaskRowSerializer``, which skips model instances. The response carries an ETag
+        and Last-Modified header computed from a single aggregate, and a matching
+        ``If-None-Match``/``If-Modified-Since`` is answered with 304 before any row is read.
+        With ``TASK_RESPONSE_CACHE`` enabled, repeated requests are served from the
+        per-user response cache without querying the database.
 
         Args:
             request (Request): The HTTP request object.
@@ -60,15 +132,29 @@ class TaskViewSet(ModelViewSet):
             **kwargs: Additional keyword arguments.
 
         Returns:
-            Response: A paginated list of Task objects for the user.
+            Response: A paginated list of Task objects for the user, or 304 Not Modified.
         """
-        return super().list(request, *args, **kwargs)
-
-    @create_task_schema
+        etag, last_modified = task_list_validators(request, self.get_queryset())
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        serializer = TaskRowSerializer()
+        rows = serializer.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            response = Response(serializer.serialize(rows))
+        else:
+            response = self.get_paginated_response(serializer.serialize(page))
+        return set_validators(response, etag, last_modified)
+
+    @task_docs.create_task_schema
+    @idempotent
     def create(self, request, *args, **kwargs):
         """Creates a new task for the authenticated user.
 
-        Accepts task data and returns the created task in the response.
+        Accepts task data and returns the created task in the response. A retry sent with
+        the same ``Idempotency-Key`` header returns the stored response instead of creating
+        the task again.
 
         Args:
             request (Request): The HTTP request object containing task data.
@@ -80,11 +166,15 @@ class TaskViewSet(ModelViewSet):
         """
         return super().create(request, *args, **kwargs)
 
-    @retrieve_task_schema
+    @task_docs.retrieve_task_schema
+    @cache_response("tasks-detail")
     def retrieve(self, request, *args, **kwargs):
         """Retrieves a specific task belonging to the authenticated user.
 
-        Returns the details of the requested task if it exists and belongs to the user.
+        Returns the details of the requested task if it exists and belongs to the user. The
+        response carries an ETag and Last-Modified header derived from the task's ``modified``
+        timestamp, and a matching conditional request is answered with 304. Responses are
+        served from the per-user response cache when it is enabled.
 
         Args:
             request (Request): The HTTP request object.
@@ -92,11 +182,17 @@ class TaskViewSet(ModelViewSet):
             **kwargs: Additional keyword arguments.
 
         Returns:
-            Response: The requested Task object.
+            Response: The requested Task object, or 304 Not Modified.
         """
-        return super().retrieve(request, *args, **kwargs)
-
-    @update_task_schema
+        instance = self.get_object()
+        etag, last_modified = task_validators(request, instance)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = Response(self.get_serializer(instance).data)
+        return set_validators(response, etag, last_modified)
+
+    @task_docs.update_task_schema
     def update(self, request, *args, **kwargs):
         """Updates an existing task for the authenticated user.
 
@@ -112,7 +208,7 @@ class TaskViewSet(ModelViewSet):
         """
         return super().update(request, *args, **kwargs)
 
-    @partial_update_task_schema
+    @task_docs.partial_update_task_schema
     def partial_update(self, request, *args, **kwargs):
         """Partially updates an existing task for the authenticated user.
 
@@ -128,7 +224,7 @@ class TaskViewSet(ModelViewSet):
         """
         return super().partial_update(request, *args, **kwargs)
 
-    @delete_task_schema
+    @task_docs.delete_task_schema
     def destroy(self, request, *args, **kwargs):
         """Deletes a specific task belonging to the authenticated user.
 
@@ -143,3 +239,159 @@ class TaskViewSet(ModelViewSet):
             Response: An empty response indicating successful deletion.
         """
         return super().destroy(request, *args, **kwargs)
+
+    @task_docs.export_tasks_schema
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """Streams every task belonging to the authenticated user.
+
+        Rows are read with a chunked iterator and encoded one at a time, so memory stays flat
+        regardless of how many tasks the user owns.
+
+        Args:
+            request (Request): The HTTP request object. The ``as`` query parameter selects
+                ``json`` (default) or ``ndjson`` output.
+
+        Returns:
+            StreamingHttpResponse: The user's tasks, or a 400 Response for an unknown format.
+        """
+        export_format = request.query_params.get(
+            EXPORT_FORMAT_PARAM, EXPORT_FORMAT_JSON
+        )
+        streamer = EXPORT_STREAMERS.get(export_format)
+        if streamer is None:
+            return Response(
+                {JSON_KEY_DETAIL: EXPORT_ERROR_INVALID_FORMAT},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response = StreamingHttpResponse(
+            streamer(self.get_queryset()),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{export_format}"'
+        )
+        return response
+
+    @task_docs.bulk_tasks_schema
+    @action(detail=False, methods=["post"], url_path="bulk")
+    @idempotent
+    def bulk(self, request):
+        """Creates, updates and deletes many tasks for the authenticated user at once.
+
+        The whole batch is validated first and then applied in one transaction with a constant
+        number of queries, so either every operation succeeds or none is applied. Like
+        ``create``, the batch is applied at most once per ``Idempotency-Key``.
+
+        Args:
+            request (Request): The HTTP request object containing ``create``, ``update`` and
+                ``delete`` lists.
+
+        Returns:
+            Response: One result per submitted item, grouped by operation.
+        """
+        serializer = TaskBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created, updated, deleted_ids = apply_bulk_operations(
+            request.user,
+            serializer.validated_data[BULK_OP_CREATE],
+            serializer.validated_data[BULK_OP_UPDATE],
+            serializer.validated_data[BULK_OP_DELETE],
+        )
+
+        return Response(
+            {
+                BULK_OP_CREATE: [
+                    {JSON_KEY_STATUS: status.HTTP_201_CREATED, JSON_KEY_TASK: data}
+                    for data in TaskSerializer(created, many=True).data
+                ],
+                BULK_OP_UPDATE: [
+                    {
+                        JSON_KEY_ID: data[JSON_KEY_ID],
+                        JSON_KEY_STATUS: status.HTTP_200_OK,
+                        JSON_KEY_TASK: data,
+                    }
+                    for data in TaskSerializer(updated, many=True).data
+                ],
+                BULK_OP_DELETE: [
+                    {
+                        JSON_KEY_ID: task_id,
+                        JSON_KEY_STATUS: (
+                            status.HTTP_204_NO_CONTENT
+                            if task_id in deleted_ids
+                            else status.HTTP_404_NOT_FOUND
+                        ),
+                    }
+                    for task_id in serializer.validated_data[BULK_OP_DELETE]
+                ],
+            }
+        )
+
+    @task_docs.task_changes_schema
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """Returns the tasks changed and deleted since the client's last sync.
+
+        Clients send back the cursor from the previous call as ``since``; the response holds the
+        tasks created or modified after it, the ids of tasks deleted after it and a new cursor.
+        When ``has_more`` is true the client should call again right away. Changes committed
+        shortly after the previous sync read may be sent again, so clients apply them by id.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The changes and the next cursor, 400 for a malformed cursor, or 410 when
+                the cursor is older than the tombstone retention window.
+        """
+        since = request.query_params.get(SYNC_SINCE_PARAM)
+        try:
+            since = decode_cursor(since) if since else None
+        except InvalidCursor:
+            return Response(
+                {JSON_KEY_DETAIL: SYNC_ERROR_INVALID_CURSOR},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except ExpiredCursor:
+            return Response(
+                {JSON_KEY_DETAIL: SYNC_ERROR_EXPIRED_CURSOR},
+                status=status.HTTP_410_GONE,
+            )
+
+        try:
+            page_size = int(
+                request.query_params.get(SYNC_PAGE_SIZE_PARAM, SYNC_PAGE_SIZE)
+            )
+        except ValueError:
+            page_size = SYNC_PAGE_SIZE
+        page_size = min(max(page_size, 1), SYNC_MAX_PAGE_SIZE)
+
+        changed, deleted, cursor, has_more = collect_changes(
+            request.user, since, page_size
+        )
+        return Response(
+            {
+                JSON_KEY_CHANGED: self.get_serializer(changed, many=True).data,
+                JSON_KEY_DELETED: deleted,
+                JSON_KEY_CURSOR: cursor,
+                JSON_KEY_HAS_MORE: has_more,
+            }
+        )
+
+    @task_docs.task_stats_schema
+    @action(detail=False, methods=["get"], url_path="stats")
+    def stats(self, request):
+        """Returns the user's task counts and per-day creation and completion counts.
+
+        The figures come from counters maintained on every write, so the response costs two
+        indexed lookups regardless of how many tasks the user owns.
+
+        Args:
+            request (Request): The HTTP request object. ``days`` selects how many days of
+                daily counts are returned.
+
+        Returns:
+            Response: ``total``, ``completed``, ``pending`` and ``daily``.
+        """
+        return Response(task_stats(request.user, stats_days(request.query_params)))
@@ -0,0 +1,303 @@
+"""Sliding-window rate limiting for the auth endpoints, token lookups and the task API.
+
+The limiter approximates a sliding window with two fixed windows: the current window's count
+plus the previous window's count weighted by how much of it the sliding window still covers.
+That keeps two integers per key and constant work per request, where DRF's
+``SimpleRateThrottle`` reads, trims and rewrites a list of timestamps.
+
+``THROTTLING["BACKEND"]`` selects where the counts live:
+
+* ``memory`` (the default): a dict in the process, so every worker enforces its own limit.
+* ``cache``: the Django cache alias named by ``THROTTLING["CACHE"]``, shared by every worker.
+  Counters are bumped with ``incr``, which is atomic on memcached, Redis and the local memory
+  cache.
+
+Rates use DRF's ``<count>/<period>`` format and are read from
+``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]``; a scope set to None is not limited.
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from .constants import THROTTLE_CACHE_KEY_PREFIX, THROTTLE_PRUNE_THRESHOLD
+
+DEFAULT_THROTTLING = {
+    "ENABLED": True,
+    "BACKEND": "memory",
+    "CACHE": "default",
+}
+
+
+def _wait(previous, current, limit, window, elapsed):
+    """Returns the seconds until one more request fits, 0 if it fits now.
+
+    Args:
+        previous (int): Requests counted in the previous fixed window.
+        current (int): Requests counted in the current fixed window.
+        limit (int): Requests allowed per sliding window.
+        window (int): The window length in seconds.
+        elapsed (float): The fraction of the current fixed window that has passed.
+    """
+    if previous * (1 - elapsed) + current + 1 <= limit:
+        return 0.0
+    if limit < 1:
+        return float(window)
+    if current + 1 <= limit:
+        # The previous window's weight has to shrink enough within this window.
+        return (1 - (limit - 1 - current) / previous - elapsed) * window
+    # This window alone is full: wait for it to become the previous one and shrink.
+    return (1 - elapsed + max(0.0, 1 - (limit - 1) / current)) * window
+
+
+def _counts(entry, index):
+    """Returns ``(previous, current)`` for the window ``index`` from a stored entry."""
+    if entry is None:
+        return 0, 0
+    if entry[0] == index:
+        return entry[1], entry[2]
+    if entry[0] == index - 1:
+        return entry[2], 0
+    return 0, 0
+
+
+class MemoryBackend:
+    """Window counts of every key in a dict, pruned of expired keys as it grows."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._prune_at = THROTTLE_PRUNE_THRESHOLD
+
+    def hit(self, key, limit, window, now, count):
+        index, elapsed = divmod(now, window)
+        with self._lock:
+            previous, current = _counts(self._windows.get(key), index)
+            wait = _wait(previous, current, limit, window, elapsed / window)
+            if count and not wait:
+                self._store(key, index, previous, current + 1, window, now)
+        return wait
+
+    def record(self, key, window, now):
+        index = now // window
+        with self._lock:
+            previous, current = _counts(self._windows.get(key), index)
+            self._store(key, index, previous, current + 1, window, now)
+
+    def _store(self, key, index, previous, current, window, now):
+        # The entry stops mattering once its window is no longer the previous one.
+        self._windows[key] = (index, previous, current, (index + 2) * window)
+        if len(self._windows) > self._prune_at:
+            self._windows = {
+                key: entry for key, entry in self._windows.items() if entry[3] > now
+            }
+            self._prune_at = max(THROTTLE_PRUNE_THRESHOLD, 2 * len(self._windows))
+
+
+class CacheBackend:
+    """Window counts in a Django cache alias, one counter per key and fixed window."""
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    @staticmethod
+    def _key(key, index):
+        # Idents may hold characters some cache backends reject in keys (spaces, ...).
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return f"{THROTTLE_CACHE_KEY_PREFIX}{digest}:{int(index)}"
+
+    def hit(self, key, limit, window, now, count):
+        index, elapsed = divmod(now, window)
+        previous_key, current_key = self._key(key, index - 1), self._key(key, index)
+        counts = self.cache.get_many([previous_key, current_key])
+        wait = _wait(
+            counts.get(previous_key, 0),
+            counts.get(current_key, 0),
+            limit,
+            window,
+            elapsed / window,
+        )
+        if count and not wait:
+            self._increment(current_key, window)
+        return wait
+
+    def record(self, key, window, now):
+        self._increment(self._key(key, now // window), window)
+
+    def _increment(self, key, window):
+        if self.cache.add(key, 1, 2 * window):
+            return
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Expired between ``add`` and ``incr``.
+            self.cache.add(key, 1, 2 * window)
+
+
+class RateLimiter:
+    """Counts requests per key in the configured backend.
+
+    Configuration is read from the ``THROTTLING`` setting on first use.
+    """
+
+    def __init__(self):
+        self._config = None
+        self._backend = None
+
+    @property
+    def config(self):
+        if self._config is None:
+            self._config = {**DEFAULT_THROTTLING, **getattr(settings, "THROTTLING", {})}
+        return self._config
+
+    @property
+    def enabled(self):
+        return self.config["ENABLED"]
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            if self.config["BACKEND"] == "cache":
+                self._backend = CacheBackend(self.config["CACHE"])
+            else:
+                self._backend = MemoryBackend()
+        return self._backend
+
+    def hit(self, key, limit, window, count=True):
+        """Counts one request for ``key`` if it is within ``limit`` per ``window`` seconds.
+
+        Args:
+            key (str): What the limit applies to (scope and client).
+            limit (int): Requests allowed per sliding window.
+            window (int): The window length in seconds.
+            count (bool): False only checks the limit without counting a request.
+
+        Returns:
+            float: 0 when the request is allowed, otherwise the seconds to wait.
+        """
+        return self.backend.hit(key, limit, window, time.time(), count)
+
+    def record(self, key, window):
+        """Counts one event for ``key`` without checking the limit."""
+        self.backend.record(key, window, time.time())
+
+    def clear(self):
+        """Forgets every count and the configuration."""
+        self._backend = None
+        self._config = None
+
+
+limiter = RateLimiter()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """``SimpleRateThrottle`` counted by ``limiter`` instead of a timestamp list.
+
+    Subclasses set ``scope`` and implement ``get_cache_key`` exactly as with DRF's throttles.
+    """
+
+    def __init__(self):
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self._wait = None
+
+    def get_rate(self):
+        # Read on every instantiation rather than at import, so the rates follow settings.
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for '{self.scope}' scope"
+            )
+
+    def allow_request(self, request, view):
+        if self.rate is None or not limiter.enabled:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self._wait = limiter.hit(self.key, self.num_requests, self.duration)
+        return not self._wait
+
+    def wait(self):
+        return self._wait
+
+
+class AuthIPThrottle(SlidingWindowThrottle):
+    """Limits login and registration attempts per client IP."""
+
+    scope = "auth_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class LoginUsernameThrottle(SlidingWindowThrottle):
+    """Limits login attempts per username, whichever IPs they come from."""
+
+    scope = "login_username"
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        username = data.get("username") if hasattr(data, "get") else None
+        if not isinstance(username, str) or not username:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": username.casefold()}
+
+
+class TaskUserThrottle(SlidingWindowThrottle):
+    """Limits task API requests per authenticated user."""
+
+    scope = "tasks"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class TokenFailureThrottle(SlidingWindowThrottle):
+    """Limits failed token lookups per client IP.
+
+    Only failures are counted, and the limit is only checked on token cache misses, so
+    clients with valid tokens are not slowed down while guessed tokens stop reaching the
+    database once an IP is over its budget.
+    """
+
+    scope = "token_failures"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+    def check(self, request):
+        """Raises ``Throttled`` if ``request``'s IP is over its failure budget."""
+        if self.rate is None or not limiter.enabled:
+            return
+        wait = limiter.hit(
+            self.get_cache_key(request, None),
+            self.num_requests,
+            self.duration,
+            count=False,
+        )
+        if wait:
+            raise exceptions.Throttled(wait=wait)
+
+    def record_failure(self, request):
+        """Counts a failed lookup for ``request``'s IP."""
+        if self.rate is not None and limiter.enabled:
+            limiter.record(self.get_cache_key(request, None), self.duration)
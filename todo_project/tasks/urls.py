@@ -3,13 +3,16 @@ from django.conf.urls.static import static
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from . import auth_views
+from . import auth_views, health_views
+from .job_views import JobViewSet
 from .task_views import TaskViewSet
 
 router = DefaultRouter()
 router.register("tasks", TaskViewSet, basename="tasks")
+router.register("jobs", JobViewSet, basename="jobs")
 
 urlpatterns = [
+    path("health/", health_views.health, name="api-health"),
     path("auth/register/", auth_views.register, name="auth-register"),
     path("auth/login/", auth_views.login, name="auth-login"),
     path("auth/logout/", auth_views.logout, name="auth-logout"),
@@ -1,8 +1,24 @@
 import pytest
+from django.test import Client
 from rest_framework.test import APIClient
+from tasks.authentication import token_cache
+from tasks.response_cache import response_cache
+from tasks.throttling import limiter
 from tests.factories.users import UserFactory
 
 
+@pytest.fixture(autouse=True)
+def _reset_token_cache():
+    """Start every test with empty caches, no rate limit counts and fresh configuration."""
+    token_cache.clear()
+    response_cache.clear()
+    limiter.clear()
+    yield
+    token_cache.clear()
+    response_cache.clear()
+    limiter.clear()
+
+
 @pytest.fixture
 def user():
     """Provide a persisted user instance."""
@@ -21,3 +37,14 @@ def api_client(user):
 def auth_client(api_client, user):
     """Return the authenticated client along with its user for convenience."""
     return api_client, user
+
+
+@pytest.fixture
+def staff_client():
+    """Return a Django test client logged in as a staff user."""
+    staff = UserFactory(is_staff=True)
+    # The factory does not save the hashed password, which the session is checked against.
+    staff.refresh_from_db()
+    client = Client()
+    client.force_login(staff)
+    return client
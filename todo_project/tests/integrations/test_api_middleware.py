@@ -0,0 +1,72 @@
+"""Integration tests for the lean middleware stack of the API routes."""
+
+import pytest
+from asgiref.sync import async_to_sync
+from benchmarks.middleware import stacks
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+def test_health_answers_without_queries():
+    """The no-op endpoint needs neither a token nor the database."""
+
+    with CaptureQueriesContext(connection) as queries:
+        response = Client().get(reverse("api-health"))
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert len(queries) == 0
+    assert Client().post(reverse("api-health")).status_code == 405
+
+
+def test_api_requests_skip_the_browser_middleware(auth_client):
+    """API responses carry no session, CSRF or framing side effects; the admin keeps them."""
+
+    _, user = auth_client
+    client = Client(enforce_csrf_checks=True)
+
+    api = client.get(reverse("api-health"))
+    login = client.post(
+        reverse("auth-login"), {"username": user.username, "password": "wrong"}
+    )
+    admin = client.get(reverse("admin:login"))
+
+    assert "X-Frame-Options" not in api
+    assert "Cookie" not in api.get("Vary", "")
+    # Reaching the view at all shows the CSRF middleware did not reject the POST.
+    assert login.status_code == 401
+    assert admin["X-Frame-Options"] == "DENY"
+    assert "csrftoken" in admin.cookies
+
+
+def test_async_chain_passes_api_requests_through():
+    """The path-scoped middleware also hands API requests on in an async handler."""
+
+    response = async_to_sync(AsyncClient().get)(reverse("api-health"))
+    admin = async_to_sync(AsyncClient().get)(reverse("admin:login"))
+
+    assert response.status_code == 200
+    assert "X-Frame-Options" not in response
+    assert admin["X-Frame-Options"] == "DENY"
+
+
+def test_full_stack_runs_every_middleware_for_the_api(settings):
+    """With API_LEAN_MIDDLEWARE off the API gets the original middleware again."""
+
+    settings.MIDDLEWARE = stacks()["full"]
+
+    response = Client().get(reverse("api-health"))
+
+    assert not any("Browser" in path for path in settings.MIDDLEWARE)
+    assert response["X-Frame-Options"] == "DENY"
+
+
+def test_admin_checks_accept_the_path_scoped_middleware():
+    """The admin's middleware system checks see the subclasses as the real thing."""
+
+    call_command("check", fail_level="ERROR")
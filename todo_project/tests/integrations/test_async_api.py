@@ -0,0 +1,183 @@
+"""Integration tests for the async task and auth API served by the ASGI URLconf."""
+
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import URLResolver, get_resolver, resolve, reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory, force_authenticate
+from tasks.models import Task, TaskTombstone
+from tasks.task_views import TaskViewSet
+from tests.factories.tasks import TaskFactory
+
+pytestmark = [pytest.mark.django_db, pytest.mark.urls("todo_project.async_urls")]
+
+
+@pytest.fixture
+def token_headers(user):
+    """Return the ``Authorization`` header for a fresh token of ``user``."""
+    token = Token.objects.create(user=user)
+    return {"Authorization": f"Token {token.key}"}
+
+
+def _call(method, path, data=None, headers=None):
+    # AsyncClient only forwards per-request headers into the ASGI scope.
+    handler = getattr(AsyncClient(enforce_csrf_checks=True), method)
+    extra = {"headers": headers or {}}
+    if data is not None:
+        extra.update(data=data, content_type="application/json")
+    return async_to_sync(handler)(path, **extra)
+
+
+def test_task_and_auth_routes_resolve_to_async_views():
+    """CRUD and auth run natively async; endpoints without an async port stay sync."""
+
+    for name, args in [
+        ("tasks-list", []),
+        ("tasks-detail", [1]),
+        ("auth-login", []),
+        ("auth-logout", []),
+    ]:
+        assert asyncio.iscoroutinefunction(resolve(reverse(name, args=args)).func)
+    assert not asyncio.iscoroutinefunction(resolve(reverse("tasks-bulk")).func)
+
+
+def test_sync_routes_are_mounted_once():
+    """The sync API is included a single time, behind the async routes."""
+
+    def includes(resolver):
+        for pattern in resolver.url_patterns:
+            if isinstance(pattern, URLResolver):
+                yield pattern.urlconf_name
+                yield from includes(pattern)
+
+    mounted = [
+        urlconf
+        for urlconf in includes(get_resolver())
+        if getattr(urlconf, "__name__", urlconf) == "tasks.urls"
+    ]
+    assert len(mounted) == 1
+
+
+def test_async_crud_round_trip(token_headers, user):
+    """Create, read, update and delete should behave like the sync viewset."""
+
+    created = _call("post", "/api/tasks/", {"title": "Async"}, headers=token_headers)
+    task_id = created.json()["id"]
+    detail = f"/api/tasks/{task_id}/"
+
+    patched = _call("patch", detail, {"is_completed": True}, headers=token_headers)
+    replaced = _call("put", detail, {"title": "Renamed"}, headers=token_headers)
+    fetched = _call("get", detail, headers=token_headers)
+    deleted = _call("delete", detail, headers=token_headers)
+    missing = _call("get", detail, headers=token_headers)
+
+    assert created.status_code == status.HTTP_201_CREATED
+    assert patched.json()["is_completed"] is True
+    assert replaced.json()["title"] == "Renamed"
+    assert fetched.json()["title"] == "Renamed"
+    assert deleted.status_code == status.HTTP_204_NO_CONTENT
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+    assert missing.json() == {"detail": "No Task matches the given query."}
+    assert not Task.objects.filter(pk=task_id).exists()
+    assert TaskTombstone.objects.filter(user=user, task_id=task_id).exists()
+
+
+def test_async_list_matches_sync_list(token_headers, user):
+    """Filters, ordering and cursors must match the sync API page for page."""
+
+    TaskFactory.create_batch(3, user=user, is_completed=True)
+    TaskFactory.create_batch(2, user=user)
+    TaskFactory(is_completed=True)
+    sync_list = TaskViewSet.as_view({"get": "list"})
+    factory = APIRequestFactory()
+
+    def sync_get(path, params=None):
+        request = factory.get(path, params)
+        force_authenticate(request, user=user)
+        return sync_list(request).render()
+
+    params = {"is_completed": "true", "ordering": "title", "page_size": 2}
+
+    async_page = _call("get", "/api/tasks/", params, headers=token_headers).json()
+    sync_page = json.loads(sync_get("/api/tasks/", params).content)
+    async_next = _call("get", async_page["next"], headers=token_headers).json()
+    sync_next = json.loads(sync_get(sync_page["next"]).content)
+
+    assert async_page == sync_page
+    assert async_next == sync_next
+    assert len(async_page["results"]) + len(async_next["results"]) == 3
+
+
+def test_async_list_answers_conditional_requests(token_headers, user):
+    """A matching ETag should short-circuit with 304."""
+
+    TaskFactory(user=user)
+    first = _call("get", "/api/tasks/", headers=token_headers)
+
+    second = _call(
+        "get", "/api/tasks/", headers={**token_headers, "If-None-Match": first["ETag"]}
+    )
+
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_async_task_access_is_scoped_to_owner(token_headers):
+    """Another user's task should be reported as missing."""
+
+    foreign = TaskFactory()
+
+    response = _call(
+        "patch", f"/api/tasks/{foreign.id}/", {"title": "x"}, headers=token_headers
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert Task.objects.get(pk=foreign.id).title == foreign.title
+
+
+@pytest.mark.parametrize("header", [None, "Token invalid", "Token"])
+def test_async_api_rejects_missing_or_invalid_tokens(header):
+    """Unauthenticated requests get DRF's 401 with a ``WWW-Authenticate`` challenge."""
+
+    headers = {"Authorization": header} if header else {}
+
+    response = _call("get", "/api/tasks/", headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response["WWW-Authenticate"] == "Token"
+    assert "detail" in response.json()
+
+
+def test_async_register_login_logout_flow():
+    """The async auth endpoints should issue and revoke tokens."""
+
+    credentials = {"username": "async-user", "password": "Password123!"}
+
+    registered = _call("post", "/api/auth/register/", credentials)
+    duplicate = _call("post", "/api/auth/register/", credentials)
+    wrong = _call("post", "/api/auth/login/", {**credentials, "password": "nope"})
+    logged_in = _call("post", "/api/auth/login/", credentials)
+    token = logged_in.json()["token"]
+    logged_out = _call(
+        "post", "/api/auth/logout/", headers={"Authorization": f"Token {token}"}
+    )
+
+    assert registered.status_code == status.HTTP_201_CREATED
+    assert duplicate.status_code == status.HTTP_400_BAD_REQUEST
+    assert wrong.status_code == status.HTTP_401_UNAUTHORIZED
+    assert token == registered.json()["token"]
+    assert logged_out.status_code == status.HTTP_204_NO_CONTENT
+    assert not Token.objects.filter(key=token).exists()
+
+
+def test_async_view_rejects_unsupported_methods(token_headers):
+    """Unknown methods get a JSON 405 with an ``Allow`` header."""
+
+    response = _call("delete", "/api/tasks/", headers=token_headers)
+
+    assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+    assert response["Allow"] == "GET, POST, HEAD"
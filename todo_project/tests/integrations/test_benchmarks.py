@@ -0,0 +1,154 @@
+"""Smoke tests keeping the benchmark suite runnable."""
+
+import pytest
+from benchmarks.api import run_scenarios
+from benchmarks.deletion import run_strategies
+from benchmarks.harness import compare
+from benchmarks.middleware import run_stacks
+from benchmarks.renderers import run_variants
+from benchmarks.serialization import PATHS, run_path
+from benchmarks.server import run_modes
+from benchmarks.throttling import run_variants as run_throttle_variants
+from rest_framework.authtoken.models import Token
+from tasks.models import Task
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+ENDPOINTS = {
+    "tasks-list",
+    "tasks-list-filtered",
+    "tasks-list-search",
+    "tasks-retrieve",
+    "tasks-create",
+    "tasks-update",
+    "tasks-partial-update",
+    "tasks-destroy",
+    "tasks-export",
+    "tasks-bulk",
+    "tasks-changes",
+    "tasks-stats",
+    "auth-register",
+    "auth-login",
+    "auth-logout",
+}
+
+
+def test_scenarios_cover_every_endpoint(settings):
+    """Every endpoint should be measured and answer successfully."""
+
+    settings.PASSWORD_HASHING = {**settings.PASSWORD_HASHING, "PBKDF2_ITERATIONS": 1000}
+
+    results, users = run_scenarios([5], iterations=1)
+
+    assert {key.split("/", 1)[1] for key in results} == ENDPOINTS
+    assert all(row["status"] < 400 for row in results.values())
+    assert results["5/tasks-retrieve"]["queries"] >= 1
+    assert users[5][0].tasks.count() >= 5
+
+
+def test_compare_reports_regressions_beyond_tolerance():
+    """Latency may drift within the tolerance; extra queries never may."""
+
+    row = {"p50_ms": 10, "p99_ms": 20, "peak_kib": 100, "queries": 2}
+    baseline = {
+        "results": {"10/tasks-list": row},
+        "load": {"wsgi": {"requests_per_second": 100}},
+    }
+    within = {
+        "results": {"10/tasks-list": {**row, "p50_ms": 11}},
+        "load": {"wsgi": {"requests_per_second": 95}},
+    }
+    worse = {
+        "results": {"10/tasks-list": {**row, "p99_ms": 30, "queries": 3}},
+        "load": {"wsgi": {"requests_per_second": 50}},
+    }
+
+    assert compare(within, baseline, tolerance=0.2) == []
+    assert compare(worse, baseline, tolerance=0.2) == [
+        "10/tasks-list: p99_ms 20 -> 30",
+        "10/tasks-list: queries 2 -> 3",
+        "load/wsgi: requests_per_second 100 -> 50",
+    ]
+
+
+def test_serialization_paths_render_the_same_body(user):
+    """Both serialization paths should time successfully and render identical JSON."""
+
+    TaskFactory.create_batch(3, user=user)
+    queryset = user.tasks.order_by("-created", "id")
+
+    runs = {path: run_path(path, queryset, repeat=1) for path in PATHS}
+
+    assert len({body for _, body in runs.values()}) == 1
+    assert all(len(timings) == 3 for timings, _ in runs.values())
+
+
+def test_renderer_variants_measure_the_list_endpoint(user):
+    """Every renderer should serve the list, with MessagePack producing the smaller body."""
+
+    TaskFactory.create_batch(3, user=user)
+
+    results = run_variants(Token.objects.create(user=user), [2], iterations=1)
+
+    assert set(results) == {"stdlib-json/2", "orjson/2", "msgpack/2"}
+    assert all(row["status"] == 200 for row in results.values())
+    assert results["stdlib-json/2"]["body_bytes"] == results["orjson/2"]["body_bytes"]
+    assert results["msgpack/2"]["body_bytes"] < results["orjson/2"]["body_bytes"]
+
+
+def test_throttle_variants_time_both_paths():
+    """Every throttle should let the generous rate through and refuse past the strict one."""
+
+    results = run_throttle_variants(iterations=100, clients=5)
+
+    assert set(results) == {
+        f"{name}/{rate}"
+        for name in ("drf-cache", "sliding-memory", "sliding-cache")
+        for rate in ("allowed", "refused")
+    }
+    for key, row in results.items():
+        assert row["allowed"] == (100 if key.endswith("allowed") else 25)
+        assert row["us_per_request"] > 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_deletion_strategies_remove_the_seeded_tasks():
+    """Both deletion strategies should run with the concurrent writer and leave no tasks."""
+
+    results = run_strategies([20], batch_size=5, pause=0)
+
+    assert set(results) == {"20/cascade", "20/batched"}
+    assert all(row["peak_kib"] > 0 for row in results.values())
+    assert not Task.objects.exclude(title="Concurrent write").exists()
+
+
+def test_middleware_stacks_time_the_noop_endpoint():
+    """Every stack should be timed under both interfaces, relative to the full stack."""
+
+    results = run_stacks(iterations=5)
+
+    assert set(results) == {
+        f"{interface}/{stack}"
+        for interface in ("wsgi", "asgi")
+        for stack in ("full", "lean", "bare")
+    }
+    assert all(row["us_per_request"] > 0 for row in results.values())
+    assert results["wsgi/full"]["us_saved"] == 0.0
+
+
+def test_server_modes_answer_over_http():
+    """Every gunicorn worker mode should start from the config file and serve requests."""
+
+    pytest.importorskip("gunicorn")
+
+    results = run_modes(
+        ["sync", "gthread", "asgi"],
+        {"health": (["/api/health/"], {})},
+        concurrency=2,
+        requests=20,
+        env={"GUNICORN_WORKERS": "1"},
+    )
+
+    assert set(results) == {"sync/health", "gthread/health", "asgi/health"}
+    assert all(row["requests"] == 20 and not row["errors"] for row in results.values())
@@ -0,0 +1,111 @@
+"""Integration tests for ETag / Last-Modified handling on task reads."""
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from tasks.models import Task
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_list_returns_not_modified_for_matching_etag(auth_client):
+    """A repeated list request with the previous ETag should get an empty 304."""
+
+    client, user = auth_client
+    TaskFactory.create_batch(2, user=user)
+    url = reverse("tasks-list")
+
+    first = client.get(url)
+    second = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+    assert second["ETag"] == first["ETag"]
+    assert second.content == b""
+
+
+@pytest.mark.parametrize("change", ["create", "update", "delete"])
+def test_list_etag_changes_after_writes(auth_client, change):
+    """Creates, updates and deletes must all invalidate the list ETag."""
+
+    client, user = auth_client
+    task, other = TaskFactory.create_batch(2, user=user)
+    url = reverse("tasks-list")
+    etag = client.get(url)["ETag"]
+
+    if change == "create":
+        client.post(url, {"title": "New"}, format="json")
+    elif change == "update":
+        client.patch(reverse("tasks-detail", args=[task.id]), {"title": "Renamed"})
+    else:
+        client.delete(reverse("tasks-detail", args=[task.id]))
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_list_etag_depends_on_query_string(auth_client):
+    """Different pages must not share a validator."""
+
+    client, user = auth_client
+    TaskFactory.create_batch(3, user=user)
+    url = reverse("tasks-list")
+
+    assert client.get(url)["ETag"] != client.get(url, {"page_size": 1})["ETag"]
+
+
+def test_list_if_modified_since_reflects_deletes(auth_client):
+    """Last-Modified should move forward when a task is deleted."""
+
+    client, user = auth_client
+    task, _ = TaskFactory.create_batch(2, user=user)
+    past = task.modified - timedelta(minutes=5)
+    Task.objects.filter(user=user).update(modified=past)
+    url = reverse("tasks-list")
+
+    since = http_date(past.timestamp() + 60)
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code == 304
+
+    client.delete(reverse("tasks-detail", args=[task.id]))
+
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code == 200
+
+
+def test_list_validators_do_not_read_task_rows(auth_client, django_assert_num_queries):
+    """A 304 on the list should cost a single aggregate query."""
+
+    client, user = auth_client
+    TaskFactory.create_batch(3, user=user)
+    url = reverse("tasks-list")
+    etag = client.get(url)["ETag"]
+
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_retrieve_honours_etag_and_last_modified(auth_client):
+    """Detail requests should be answered with 304 until the task changes."""
+
+    client, user = auth_client
+    task = TaskFactory(user=user)
+    url = reverse("tasks-detail", args=[task.id])
+
+    first = client.get(url)
+    assert first["Last-Modified"] == http_date(int(task.modified.timestamp()))
+    assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+    assert (
+        client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code
+        == 304
+    )
+
+    client.patch(url, {"is_completed": True}, format="json")
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 200
@@ -0,0 +1,87 @@
+"""Integration tests for the gunicorn configuration."""
+
+import os
+import runpy
+
+import pytest
+from django.conf import settings
+
+CONFIG = settings.BASE_DIR / "gunicorn.conf.py"
+
+
+@pytest.fixture
+def load_config(monkeypatch):
+    """Evaluates ``gunicorn.conf.py`` with the given environment and a fixed CPU count."""
+
+    def load(cpus=4, **env):
+        for name in (
+            "GUNICORN_WORKER_MODE",
+            "GUNICORN_WORKERS",
+            "WEB_CONCURRENCY",
+            "GUNICORN_THREADS",
+        ):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.setattr("os.sched_getaffinity", lambda pid: set(range(cpus)))
+        return runpy.run_path(str(CONFIG))
+
+    return load
+
+
+@pytest.mark.parametrize(
+    "mode, worker_class, app, workers, threads",
+    [
+        ("sync", "sync", "todo_project.wsgi:application", 9, 1),
+        ("gthread", "gthread", "todo_project.wsgi:application", 5, 4),
+        (
+            "asgi",
+            "uvicorn.workers.UvicornWorker",
+            "todo_project.asgi:application",
+            4,
+            1,
+        ),
+    ],
+)
+def test_worker_modes_size_from_cpus(
+    load_config, mode, worker_class, app, workers, threads
+):
+    """Each mode picks its worker class, application and CPU-based pool size."""
+
+    config = load_config(GUNICORN_WORKER_MODE=mode)
+
+    assert config["worker_class"] == worker_class
+    assert config["wsgi_app"] == app
+    assert (config["workers"], config["threads"]) == (workers, threads)
+    assert config["preload_app"] is True
+    assert config["max_requests"] > 0 and config["max_requests_jitter"] > 0
+
+
+def test_environment_overrides_the_sizing(load_config):
+    """Explicit worker and thread counts win over the CPU-based defaults.
+
+    The resulting count is exported as ``WEB_CONCURRENCY`` for the settings to read.
+    """
+
+    assert load_config(WEB_CONCURRENCY="3")["workers"] == 3
+    config = load_config(
+        GUNICORN_WORKERS="2", GUNICORN_THREADS="8", WEB_CONCURRENCY="3"
+    )
+    assert (config["workers"], config["threads"]) == (2, 8)
+    assert os.environ["WEB_CONCURRENCY"] == "2"
+    with pytest.raises(RuntimeError, match="GUNICORN_WORKER_MODE"):
+        load_config(GUNICORN_WORKER_MODE="eventlet")
+
+
+def test_fork_hooks_close_database_connections(load_config, monkeypatch):
+    """The master drops its connections before forking and each worker starts without any."""
+
+    # The in-memory test database ignores close(), so the calls are recorded instead.
+    closed = []
+    monkeypatch.setattr("django.db.connections.close_all", lambda: closed.append(True))
+    config = load_config()
+
+    config["pre_fork"](None, None)
+    config["post_fork"](None, None)
+
+    assert closed == [True, True]
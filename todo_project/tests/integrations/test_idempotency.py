@@ -0,0 +1,166 @@
+"""Integration tests for ``Idempotency-Key`` support on task writes."""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from tasks.models import IdempotencyKey
+from tasks.services import delete_user
+from tests.factories.users import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+REPLAYED = "Idempotent-Replayed"
+
+
+def _post(client, url, data, key=None):
+    headers = {"Idempotency-Key": key} if key is not None else {}
+    return client.post(url, data, format="json", headers=headers)
+
+
+def test_retried_create_is_answered_from_the_store(auth_client):
+    """A retry with the same key returns the first response and creates nothing."""
+
+    client, user = auth_client
+    url = reverse("tasks-list")
+
+    first = _post(client, url, {"title": "Once"}, key="k-1")
+    retry = _post(client, url, {"title": "Once"}, key="k-1")
+    unkeyed = [_post(client, url, {"title": "Twice"}) for _ in range(2)]
+
+    assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+    assert retry.json() == first.json()
+    assert retry[REPLAYED] == "true"
+    assert REPLAYED not in first
+    assert user.tasks.filter(title="Once").count() == 1
+    assert all(response.status_code == 201 for response in unkeyed)
+    assert user.tasks.filter(title="Twice").count() == 2
+    user.task_summary.refresh_from_db()
+    assert user.task_summary.total_count == 3
+
+
+def test_key_reused_for_another_request_is_refused(auth_client, user):
+    """A key belongs to one request of one user; other users have their own keys."""
+
+    client, _ = auth_client
+    other = UserFactory()
+    url = reverse("tasks-list")
+
+    _post(client, url, {"title": "A"}, key="shared")
+    reused = _post(client, url, {"title": "B"}, key="shared")
+    elsewhere = client.post(
+        reverse("tasks-bulk"),
+        {"create": [{"title": "A"}]},
+        format="json",
+        headers={"Idempotency-Key": "shared"},
+    )
+    client.force_authenticate(user=other)
+    other_user = _post(client, url, {"title": "B"}, key="shared")
+
+    assert reused.status_code == elsewhere.status_code == 422
+    assert reused.json()["detail"] == (
+        "This Idempotency-Key was already used for a different request."
+    )
+    assert other_user.status_code == status.HTTP_201_CREATED
+    assert REPLAYED not in other_user
+    assert list(user.tasks.values_list("title", flat=True)) == ["A"]
+
+
+def test_failed_requests_are_not_stored(auth_client):
+    """Only successes are replayed: a rejected request can be fixed and sent again."""
+
+    client, user = auth_client
+    url = reverse("tasks-list")
+
+    invalid = _post(client, url, {"title": ""}, key="fix-me")
+    fixed = _post(client, url, {"title": "Fixed"}, key="fix-me")
+    too_long = _post(client, url, {"title": "X"}, key="x" * 256)
+    blank = _post(client, url, {"title": "X"}, key=" ")
+
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+    assert fixed.status_code == status.HTTP_201_CREATED
+    assert REPLAYED not in fixed
+    assert too_long.status_code == blank.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Idempotency-Key" in too_long.json()
+    assert user.tasks.count() == 1
+
+
+def test_retried_bulk_is_applied_once(auth_client):
+    """The whole batch result is stored and replayed."""
+
+    client, user = auth_client
+    url = reverse("tasks-bulk")
+    payload = {"create": [{"title": f"T{i}"} for i in range(3)]}
+
+    first = _post(client, url, payload, key="batch-1")
+    retry = _post(client, url, payload, key="batch-1")
+
+    assert first.status_code == retry.status_code == status.HTTP_200_OK
+    assert retry.json() == first.json()
+    assert retry[REPLAYED] == "true"
+    assert user.tasks.count() == 3
+
+
+def test_expired_keys_are_ignored_and_purged_in_batches(auth_client):
+    """Past the TTL a key starts over, and the command deletes only expired keys."""
+
+    client, user = auth_client
+    url = reverse("tasks-list")
+    _post(client, url, {"title": "Old"}, key="old")
+    for index in range(4):
+        _post(client, url, {"title": f"Stale {index}"}, key=f"stale-{index}")
+    _post(client, url, {"title": "Fresh"}, key="fresh")
+    IdempotencyKey.objects.exclude(key="fresh").update(
+        created=timezone.now() - timedelta(hours=25)
+    )
+
+    with override_settings(IDEMPOTENCY_KEY_TTL_HOURS=24):
+        again = _post(client, url, {"title": "Old"}, key="old")
+        out = StringIO()
+        call_command("purge_idempotency_keys", batch_size=2, pause=0, stdout=out)
+
+    assert again.status_code == status.HTTP_201_CREATED
+    assert REPLAYED not in again
+    assert user.tasks.filter(title="Old").count() == 2
+    assert "Deleted 4 expired keys." in out.getvalue()
+    assert sorted(IdempotencyKey.objects.values_list("key", flat=True)) == [
+        "fresh",
+        "old",
+    ]
+
+    delete_user(user, batch_size=1, pause=0)
+
+    assert not IdempotencyKey.objects.exists()
+
+
+@pytest.mark.urls("todo_project.async_urls")
+def test_async_create_honours_the_key(user):
+    """The ASGI API stores and replays creates like the sync viewset."""
+
+    token = Token.objects.create(user=user)
+    headers = {"Authorization": f"Token {token.key}", "Idempotency-Key": "async-1"}
+
+    def post(title):
+        return async_to_sync(AsyncClient().post)(
+            "/api/tasks/",
+            data={"title": title},
+            content_type="application/json",
+            headers=headers,
+        )
+
+    first = post("Async")
+    retry = post("Async")
+    reused = post("Other")
+
+    assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+    assert retry.json() == first.json()
+    assert retry[REPLAYED] == "true"
+    assert reused.status_code == 422
+    assert user.tasks.count() == 1
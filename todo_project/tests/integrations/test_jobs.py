@@ -0,0 +1,278 @@
+"""Integration tests for the background job queue and its worker command."""
+
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from tasks.constants import JOB_ERROR_STALE, JOB_IMPORT_MAX_TASKS
+from tasks.jobs import JOB_HANDLERS, claim_job, purge_expired_exports, run_job
+from tasks.management.commands import run_jobs
+from tasks.models import Job, Task, TaskTombstone, UserTaskSummary
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def export_dir(settings, tmp_path):
+    """Writes export files to a per-test directory."""
+    settings.JOBS = {**settings.JOBS, "EXPORT_DIR": str(tmp_path)}
+    return tmp_path
+
+
+def _submit(client, kind, **params):
+    response = client.post(
+        reverse("jobs-list"), {"kind": kind, "params": params}, format="json"
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED, response.content
+    return response
+
+
+def _run_all():
+    call_command("run_jobs", workers=0, once=True, stdout=StringIO())
+
+
+def _job(client, job_id):
+    return client.get(reverse("jobs-detail", args=[job_id])).json()
+
+
+def test_submitted_job_is_pending_until_a_worker_runs_it(auth_client):
+    """Submitting only queues the job; the worker imports the tasks in chunks."""
+
+    client, user = auth_client
+    tasks = [
+        {"title": f"Imported {i}", "is_completed": i % 2 == 0} for i in range(1201)
+    ]
+
+    response = _submit(client, "import", tasks=tasks)
+    job = response.json()
+
+    assert response["Location"].endswith(reverse("jobs-detail", args=[job["id"]]))
+    assert job["status"] == "pending" and "params" not in job
+    assert not Task.objects.filter(user=user).exists()
+
+    _run_all()
+    job = _job(client, job["id"])
+
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"imported": 1201}
+    assert job["started_at"] and job["finished_at"]
+    summary = UserTaskSummary.objects.get(user=user)
+    assert (summary.total_count, summary.completed_count) == (1201, 601)
+
+
+def test_export_job_writes_a_file_to_download(auth_client):
+    """The export matches the streaming endpoint and is served once the job succeeded."""
+
+    client, user = auth_client
+    TaskFactory.create_batch(3, user=user)
+    job_id = _submit(client, "export", format="ndjson").json()["id"]
+    download_url = reverse("jobs-download", args=[job_id])
+
+    assert client.get(download_url).status_code == status.HTTP_409_CONFLICT
+
+    _run_all()
+    response = client.get(download_url)
+    streamed = client.get(reverse("tasks-export"), {"as": "ndjson"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert 'filename="tasks.ndjson"' in response["Content-Disposition"]
+    body = b"".join(response.streaming_content)
+    assert body == b"".join(streamed.streaming_content)
+    assert len([json.loads(line) for line in body.splitlines()]) == 3
+    assert _job(client, job_id)["result"]["bytes"] == len(body)
+
+
+def test_purge_job_deletes_in_chunks_and_keeps_counters(auth_client):
+    """Purging leaves tombstones and exact statistics, optionally sparing open tasks."""
+
+    client, user = auth_client
+    client.post(
+        reverse("tasks-bulk"),
+        {"create": [{"title": f"T{i}", "is_completed": i < 300} for i in range(500)]},
+        format="json",
+    )
+    completed_job = _submit(client, "purge", completed_only=True).json()["id"]
+    _run_all()
+
+    assert _job(client, completed_job)["result"] == {"purged": 300}
+    assert not Task.objects.filter(user=user, is_completed=True).exists()
+
+    everything = _submit(client, "purge").json()["id"]
+    _run_all()
+
+    assert _job(client, everything)["result"] == {"purged": 200}
+    assert client.get(reverse("tasks-stats")).json()["total"] == 0
+    assert TaskTombstone.objects.filter(user=user).count() == 500
+
+
+def test_failed_job_records_the_error(auth_client, monkeypatch):
+    """An exception in a job marks it failed with the error, and the worker carries on."""
+
+    client, _ = auth_client
+
+    def explode(job):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setitem(JOB_HANDLERS, "export", explode)
+    failed = _submit(client, "export").json()["id"]
+    succeeded = _submit(client, "purge").json()["id"]
+    _run_all()
+
+    assert _job(client, failed)["status"] == "failed"
+    assert _job(client, failed)["error"] == "RuntimeError: disk full"
+    assert _job(client, succeeded)["status"] == "succeeded"
+
+
+@pytest.mark.parametrize(
+    "payload, field",
+    [
+        ({"kind": "reindex"}, "kind"),
+        ({"kind": "export", "params": {"format": "xml"}}, "params"),
+        ({"kind": "import", "params": {"tasks": []}}, "params"),
+        ({"kind": "import", "params": {"tasks": [{"description": "x"}]}}, "params"),
+        (
+            {
+                "kind": "import",
+                "params": {"tasks": [{"title": "x"}] * (JOB_IMPORT_MAX_TASKS + 1)},
+            },
+            "params",
+        ),
+    ],
+)
+def test_invalid_jobs_are_rejected(auth_client, payload, field):
+    """Unknown kinds and params that do not validate for the kind never reach the queue."""
+
+    client, _ = auth_client
+
+    response = client.post(reverse("jobs-list"), payload, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert field in response.json()
+    assert not Job.objects.exists()
+
+
+def test_jobs_are_private_to_their_owner(auth_client):
+    """Other users can neither list, poll nor download someone else's jobs."""
+
+    client, user = auth_client
+    job_id = _submit(client, "export").json()["id"]
+    _run_all()
+    other = APIClient()
+    other.force_authenticate(TaskFactory().user)
+
+    assert [
+        job["id"] for job in client.get(reverse("jobs-list")).json()["results"]
+    ] == [job_id]
+    assert other.get(reverse("jobs-list")).json()["results"] == []
+    assert other.get(reverse("jobs-detail", args=[job_id])).status_code == 404
+    assert other.get(reverse("jobs-download", args=[job_id])).status_code == 404
+
+
+def test_a_job_is_claimed_once(user):
+    """Claims take the oldest pending job and never hand the same job out twice."""
+
+    first = Job.objects.create(user=user, kind="purge")
+    second = Job.objects.create(user=user, kind="purge")
+
+    claims = [claim_job("a"), claim_job("b"), claim_job("c")]
+
+    assert [job.pk for job in claims[:2]] == [first.pk, second.pk]
+    assert claims[2] is None
+    assert Job.objects.get(pk=first.pk).worker == "a"
+    run_job(first.pk)
+    assert Job.objects.get(pk=first.pk).status == "succeeded"
+
+
+def test_jobs_abandoned_by_a_dead_worker_are_failed(user, settings):
+    """A running job with no progress for ``STALE_AFTER`` is failed; live ones are kept."""
+
+    settings.JOBS = {**settings.JOBS, "STALE_AFTER": 600}
+    abandoned = Job.objects.create(user=user, kind="purge")
+    live = Job.objects.create(user=user, kind="purge")
+    claim_job("dead:1")
+    claim_job("live:2")
+    Job.objects.filter(pk=abandoned.pk).update(
+        modified=timezone.now() - timedelta(seconds=601)
+    )
+    err = StringIO()
+
+    call_command("run_jobs", workers=0, once=True, stdout=StringIO(), stderr=err)
+
+    abandoned.refresh_from_db()
+    assert abandoned.status == "failed"
+    assert abandoned.error == JOB_ERROR_STALE
+    assert abandoned.finished_at is not None
+    assert Job.objects.get(pk=live.pk).status == "running"
+    assert "Marked 1 stale jobs as failed." in err.getvalue()
+
+
+def test_expired_export_files_are_deleted(auth_client, export_dir, settings):
+    """Exports and leftover partial files past their retention are removed."""
+
+    settings.JOBS = {**settings.JOBS, "EXPORT_RETENTION_HOURS": 24}
+    client, user = auth_client
+    TaskFactory(user=user)
+    job_id = _submit(client, "export", format="json").json()["id"]
+    _run_all()
+    expired = export_dir / f"tasks-{job_id}.json"
+    leftover = export_dir / "tasks-999.ndjson.part"
+    leftover.write_bytes(b"{")
+    recent = export_dir / "tasks-1000.json"
+    recent.write_bytes(b"[]")
+    two_days_ago = time.time() - 48 * 3600
+    for path in (expired, leftover):
+        os.utime(path, (two_days_ago, two_days_ago))
+
+    assert purge_expired_exports() == 2
+
+    assert not expired.exists() and not leftover.exists()
+    assert recent.exists()
+    download = client.get(reverse("jobs-download", args=[job_id]))
+    assert download.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.django_db(transaction=True)
+def test_thread_pool_worker_runs_every_job(user, monkeypatch):
+    """The pooled worker runs all queued jobs on its threads and exits with ``--once``."""
+
+    # The shared in-memory test database fails concurrent writers instead of making them
+    # wait on busy_timeout like a database file, so database work is taken in turns here.
+    lock = threading.Lock()
+    threads = set()
+
+    def locked(function):
+        def wrapper(*args):
+            with lock:
+                threads.add(threading.current_thread().name)
+                return function(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(run_jobs, "claim_job", locked(claim_job))
+    monkeypatch.setattr(run_jobs, "run_job", locked(run_job))
+    for index in range(6):
+        Job.objects.create(
+            user=user,
+            kind="import",
+            params={"tasks": [{"title": f"Job {index} task {i}"} for i in range(50)]},
+        )
+    out = StringIO()
+
+    call_command("run_jobs", workers=3, pool="thread", once=True, stdout=out)
+
+    assert "Ran 6 jobs." in out.getvalue()
+    assert any(name.startswith("job") for name in threads)
+    assert set(Job.objects.values_list("status", flat=True)) == {"succeeded"}
+    assert Task.objects.filter(user=user).count() == 300
+    assert UserTaskSummary.objects.get(user=user).total_count == 300
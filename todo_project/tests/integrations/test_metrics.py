@@ -0,0 +1,139 @@
+"""Integration tests for the request metrics middleware and the /metrics endpoint."""
+
+import logging
+import re
+import threading
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from tasks.metrics import RequestMetrics, registry
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+def _sample(text, name, **labels):
+    selector = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{name}{{{re.escape(selector)}}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_metrics_expose_per_endpoint_counts_and_histograms(auth_client, staff_client):
+    """Requests should show up by URL name with query and serialization figures."""
+
+    client, user = auth_client
+    TaskFactory.create_batch(3, user=user)
+    client.get(reverse("tasks-list"))
+    client.get(reverse("tasks-list"))
+    client.post(reverse("tasks-list"), {"title": "New"}, format="json")
+
+    response = staff_client.get("/metrics")
+    text = response.content.decode()
+    labels = {"endpoint": "tasks-list", "method": "GET"}
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert _sample(text, "http_requests_total", **labels, status=200) == 2
+    assert (
+        _sample(
+            text,
+            "http_requests_total",
+            endpoint="tasks-list",
+            method="POST",
+            status=201,
+        )
+        == 1
+    )
+    assert _sample(text, "http_request_queries_count", **labels) == 2
+    assert _sample(text, "http_request_queries_sum", **labels) >= 4
+    assert (
+        _sample(text, "http_request_serialization_duration_seconds_sum", **labels) > 0
+    )
+    assert (
+        'http_request_duration_seconds_bucket{endpoint="tasks-list",method="GET",le="+Inf"} 2'
+        in text
+    )
+    assert 'endpoint="metrics"' not in text
+
+
+def test_buffers_from_several_threads_are_merged():
+    """Each thread records into its own buffer; a scrape sums them."""
+
+    def record():
+        for _ in range(50):
+            registry.record("tasks-list", "GET", 200, RequestMetrics(), 0.01)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    text = registry.render()
+
+    assert (
+        _sample(
+            text, "http_requests_total", endpoint="tasks-list", method="GET", status=200
+        )
+        == 200
+    )
+    assert (
+        'http_request_duration_seconds_bucket{endpoint="tasks-list",method="GET",le="0.01"} 200'
+        in text
+    )
+
+
+def test_slow_requests_are_logged_with_their_sql(auth_client, settings, caplog):
+    """Above the threshold, the request and every statement it ran are logged."""
+
+    settings.METRICS = {**settings.METRICS, "SLOW_REQUEST_MS": 0.001}
+    client, user = auth_client
+    TaskFactory(user=user)
+
+    with caplog.at_level(logging.WARNING, logger="tasks.metrics.slow"):
+        client.get(reverse("tasks-list"))
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages[0].startswith("Slow request GET /api/tasks/ (tasks-list)")
+    assert any('FROM "tasks_task"' in message for message in messages[1:])
+
+
+def test_metrics_endpoint_requires_configured_token(settings):
+    """With an auth token configured, scrapes must present it."""
+
+    settings.METRICS = {**settings.METRICS, "AUTH_TOKEN": "scrape-secret"}
+    client = APIClient()
+
+    denied = client.get("/metrics")
+    wrong = client.get("/metrics", HTTP_AUTHORIZATION="Bearer guess")
+    allowed = client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+
+    assert denied.status_code == wrong.status_code == status.HTTP_401_UNAUTHORIZED
+    assert allowed.status_code == status.HTTP_200_OK
+
+
+def test_metrics_endpoint_is_closed_without_a_token(settings, user, staff_client):
+    """Without a token only staff sessions can read the metrics."""
+
+    settings.METRICS = {**settings.METRICS, "AUTH_TOKEN": None}
+    user.refresh_from_db()
+    member = Client()
+    member.force_login(user)
+
+    anonymous = Client().get("/metrics")
+    not_staff = member.get("/metrics")
+    staff = staff_client.get("/metrics")
+
+    assert anonymous.status_code == not_staff.status_code == 401
+    assert anonymous["WWW-Authenticate"] == "Bearer"
+    assert staff.status_code == status.HTTP_200_OK
@@ -0,0 +1,111 @@
+"""Integration tests for the precomputed OpenAPI schema and its views."""
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from tasks import schema_views
+from tasks.schema_views import schema_documents
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def schema_dir(settings, tmp_path):
+    """Reads and writes the documents in a per-test directory, loaded afresh."""
+    settings.OPENAPI_SCHEMA_DIR = str(tmp_path)
+    schema_documents.clear()
+    yield tmp_path
+    schema_documents.clear()
+
+
+def _schema(client, **extra):
+    return client.get(reverse("schema-swagger-ui"), {"format": "openapi"}, **extra)
+
+
+def test_views_serve_the_generated_files_from_memory(schema_dir, monkeypatch):
+    """After the command ran, requests answer from the files without generating anything."""
+
+    out = StringIO()
+    call_command("generate_openapi_schema", stdout=out)
+    written = (schema_dir / "openapi.json").read_bytes()
+    monkeypatch.setattr(schema_views, "generate_schema_documents", pytest.fail)
+    client = Client()
+
+    first = _schema(client)
+    second = _schema(client)
+
+    assert "Wrote openapi.json" in out.getvalue()
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content == written
+    assert first["Content-Type"] == "application/openapi+json; charset=utf-8"
+    assert first["ETag"] in out.getvalue()
+    assert first["Cache-Control"] == "no-cache"
+    schema = json.loads(first.content)
+    assert "/tasks/" in schema["paths"] and "host" not in schema
+
+
+def test_unchanged_schema_answers_304(schema_dir):
+    """A poller sending the ETag back gets an empty 304 until the schema changes."""
+
+    call_command("generate_openapi_schema", stdout=StringIO())
+    client = Client()
+    etag = _schema(client)["ETag"]
+
+    response = _schema(client, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response["ETag"] == etag
+    assert _schema(client, HTTP_IF_NONE_MATCH='"stale"').status_code == 200
+
+
+def test_yaml_document_and_ui_pages(schema_dir):
+    """The YAML document has its own ETag; the Swagger UI and ReDoc pages still render."""
+
+    call_command("generate_openapi_schema", stdout=StringIO())
+    client = Client()
+
+    yaml = client.get(reverse("schema-redoc"), {"format": "yaml"})
+
+    assert yaml.status_code == 200
+    assert yaml.content == (schema_dir / "openapi.yaml").read_bytes()
+    assert yaml["ETag"] != _schema(client)["ETag"]
+    assert client.get(reverse("schema-swagger-ui")).status_code == 200
+    assert client.get(reverse("schema-redoc")).status_code == 200
+
+
+def test_missing_files_are_generated_once(schema_dir, monkeypatch, caplog):
+    """Without the build artifact the process generates the documents once and warns."""
+
+    calls = []
+    generate = schema_views.generate_schema_documents
+
+    def counting():
+        calls.append(1)
+        return generate()
+
+    monkeypatch.setattr(schema_views, "generate_schema_documents", counting)
+    client = Client()
+
+    _schema(client)
+    response = _schema(client)
+
+    assert response.status_code == 200
+    assert len(calls) == 1
+    assert "generate_openapi_schema" in caplog.text
+
+
+def test_debug_ignores_the_files(schema_dir, settings):
+    """In DEBUG the documents come from the code, not from a possibly stale build."""
+
+    settings.DEBUG = True
+    (schema_dir / "openapi.json").write_bytes(b'{"stale": true}')
+    (schema_dir / "openapi.yaml").write_bytes(b"stale: true")
+
+    response = _schema(Client())
+
+    assert "paths" in json.loads(response.content)
@@ -0,0 +1,115 @@
+"""Integration tests for configurable password hashing and rehash-on-login."""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from tasks import hashing
+from tests.factories.users import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+PASSWORD = "Password123!"
+
+
+@pytest.fixture
+def cheap_hashing(settings):
+    """Lower the hasher costs so tests can hash repeatedly."""
+    settings.PASSWORD_HASHING = {
+        **settings.PASSWORD_HASHING,
+        "PBKDF2_ITERATIONS": 1000,
+        "SCRYPT_WORK_FACTOR": 2**10,
+    }
+    return settings
+
+
+def _login(username, password=PASSWORD):
+    return APIClient().post(
+        reverse("auth-login"),
+        {"username": username, "password": password},
+        format="json",
+    )
+
+
+def test_login_upgrades_hash_from_older_algorithm(cheap_hashing):
+    """A valid login should re-encode a legacy PBKDF2-SHA1 hash with the preferred hasher."""
+
+    user = UserFactory()
+    user.password = make_password(PASSWORD, hasher="pbkdf2_sha1")
+    user.save()
+
+    response = _login(user.username)
+
+    user.refresh_from_db()
+    assert response.status_code == status.HTTP_200_OK
+    assert user.password.startswith("pbkdf2_sha256$1000$")
+    assert check_password(PASSWORD, user.password)
+
+
+def test_login_rehashes_when_cost_changes(cheap_hashing):
+    """Raising the configured cost should rehash each password on its next login."""
+
+    user = UserFactory()
+    user.password = make_password(PASSWORD)
+    user.save()
+    cheap_hashing.PASSWORD_HASHING = {
+        **cheap_hashing.PASSWORD_HASHING,
+        "PBKDF2_ITERATIONS": 2000,
+    }
+
+    _login(user.username)
+
+    user.refresh_from_db()
+    assert user.password.startswith("pbkdf2_sha256$2000$")
+
+
+def test_failed_login_keeps_stored_hash(cheap_hashing):
+    """A wrong password must never trigger a rehash."""
+
+    user = UserFactory()
+    user.password = make_password(PASSWORD, hasher="pbkdf2_sha1")
+    user.save()
+
+    response = _login(user.username, password="wrong")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert get_user_model().objects.get(pk=user.pk).password == user.password
+
+
+def test_scrypt_profile_is_used_for_new_passwords(cheap_hashing):
+    """Registering under the scrypt profile should store a tuned scrypt hash."""
+
+    cheap_hashing.PASSWORD_HASHERS = [
+        "tasks.hashers.TunedScryptPasswordHasher",
+        "tasks.hashers.TunedPBKDF2PasswordHasher",
+    ]
+
+    register = APIClient().post(
+        reverse("auth-register"),
+        {"username": "scrypt-user", "password": PASSWORD},
+        format="json",
+    )
+    login = _login("scrypt-user")
+
+    stored = get_user_model().objects.get(username="scrypt-user").password
+    assert register.status_code == status.HTTP_201_CREATED
+    assert login.status_code == status.HTTP_200_OK
+    assert stored.startswith("scrypt$1024$")
+
+
+def test_process_pool_hashes_and_verifies(settings):
+    """With workers configured, hashing runs in the pool and round-trips."""
+
+    settings.PASSWORD_HASHING = {**settings.PASSWORD_HASHING, "WORKERS": 1}
+    try:
+        assert hashing.get_executor() is not None
+        encoded = hashing.hash_password(PASSWORD)
+        verified = hashing.verify_password(PASSWORD, encoded)
+        rejected = hashing.verify_password("wrong", encoded)
+    finally:
+        hashing.shutdown()
+
+    assert verified == (True, None)
+    assert rejected == (False, None)
@@ -0,0 +1,145 @@
+"""Query plan regression tests for the task endpoints.
+
+Every SELECT an endpoint issues is captured and run through SQLite's ``EXPLAIN QUERY PLAN``.
+A plan that scans a whole table or index, or sorts in a temporary B-tree, means a query no
+longer matches one of the ``Task`` indexes and its cost now grows with the table.
+"""
+
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tests.factories.tasks import TaskFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="Checks SQLite query plans."
+    ),
+]
+
+# Scanning an FTS5 table is how a MATCH is looked up, not a full scan.
+FULL_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)\w+\b(?! VIRTUAL TABLE)")
+TEMP_SORT = "USE TEMP B-TREE"
+
+LIST_PARAMS = [
+    {},
+    {"page_size": 2},
+    {"is_completed": "true"},
+    {"is_completed": "false", "ordering": "title"},
+    {"ordering": "created"},
+    {"ordering": "modified"},
+    {"ordering": "-modified"},
+    {"ordering": "title"},
+    {"ordering": "-title"},
+    {"created_after": "2020-01-01", "created_before": "2999-01-01"},
+    {"modified_after": "2020-01-01", "ordering": "-modified"},
+    {"search": "task"},
+]
+
+
+@pytest.fixture
+def owned(auth_client):
+    """A user with a few pending, completed and deleted tasks, next to another user's."""
+    client, user = auth_client
+    TaskFactory.create_batch(4, user=user)
+    TaskFactory.create_batch(3, user=user, is_completed=True)
+    TaskFactory.create_batch(2)
+    client.delete(reverse("tasks-detail", args=[user.tasks.first().pk]))
+    return client, user
+
+
+def _plans(client, path, params=None):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(path, params or {})
+        if response.streaming:
+            b"".join(response.streaming_content)
+    assert response.status_code == 200, response.content
+
+    plans = {}
+    with connection.cursor() as cursor:
+        for query in queries:
+            if not query["sql"].startswith("SELECT"):
+                continue
+            cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+            plans[query["sql"]] = [row[-1] for row in cursor.fetchall()]
+    assert plans
+    return response, plans
+
+
+def _assert_indexed(plans):
+    for sql, plan in plans.items():
+        problems = [
+            step for step in plan if FULL_SCAN.search(step) or TEMP_SORT in step
+        ]
+        assert not problems, f"{sql}\n" + "\n".join(plan)
+
+
+@pytest.mark.parametrize(
+    "params", LIST_PARAMS, ids=lambda params: "&".join(params) or "default"
+)
+def test_list_queries_use_an_index(owned, params):
+    """Every filter and ordering is a range scan on one of the ``(user, ...)`` indexes."""
+
+    client, _ = owned
+
+    _, plans = _plans(client, reverse("tasks-list"), params)
+
+    _assert_indexed(plans)
+
+
+def test_following_pages_use_an_index(owned):
+    """A cursor page starts the range scan at the cursor instead of skipping rows."""
+
+    client, _ = owned
+    first = client.get(reverse("tasks-list"), {"page_size": 2, "ordering": "title"})
+
+    _, plans = _plans(client, first.data["next"])
+
+    _assert_indexed(plans)
+
+
+def test_detail_lookup_uses_the_primary_key(owned):
+    """``get_object`` finds the task by id and only then checks its owner."""
+
+    client, user = owned
+
+    _, plans = _plans(client, reverse("tasks-detail", args=[user.tasks.last().pk]))
+
+    _assert_indexed(plans)
+    assert any(
+        "USING INTEGER PRIMARY KEY" in step for plan in plans.values() for step in plan
+    )
+
+
+@pytest.mark.parametrize(
+    "name, params",
+    [
+        ("tasks-changes", {}),
+        ("tasks-stats", {}),
+        ("tasks-export", {}),
+        ("tasks-export", {"as": "ndjson"}),
+    ],
+)
+def test_other_read_endpoints_use_an_index(owned, name, params):
+    """Delta sync, statistics and exports read the same indexes as the list."""
+
+    client, _ = owned
+
+    _, plans = _plans(client, reverse(name), params)
+
+    _assert_indexed(plans)
+
+
+def test_changes_since_a_cursor_use_an_index(owned):
+    """A follow-up sync reads only tasks and tombstones after the cursor."""
+
+    client, user = owned
+    cursor = client.get(reverse("tasks-changes")).data["cursor"]
+    client.delete(reverse("tasks-detail", args=[user.tasks.first().pk]))
+
+    _, plans = _plans(client, reverse("tasks-changes"), {"since": cursor})
+
+    _assert_indexed(plans)
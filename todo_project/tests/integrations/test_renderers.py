@@ -0,0 +1,112 @@
+"""Integration tests for the orjson and MessagePack renderers and parsers."""
+
+import datetime
+import decimal
+import io
+
+import msgpack
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+from tasks.parsers import FastJSONParser
+from tasks.renderers import MSGPACK_MEDIA_TYPE, FastJSONRenderer
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_fast_json_renderer_matches_drf_byte_for_byte():
+    """Datetimes, Decimals, lazy strings and oversized ints encode exactly as before."""
+
+    data = ReturnDict(
+        {
+            "text": 'Ñandú \u2028 \u2029 "quoted"',
+            "at": datetime.datetime(2024, 1, 1, 12, 30, tzinfo=datetime.UTC),
+            "naive": datetime.datetime(2024, 1, 1, 12, 30, 0, 5),
+            "day": datetime.date(2024, 1, 1),
+            "amount": decimal.Decimal("12.50"),
+            "label": gettext_lazy("Not found."),
+            1: [True, None, 2**70],
+        },
+        serializer=None,
+    )
+
+    for accepted in (None, "application/json", "application/json; indent=2"):
+        assert FastJSONRenderer().render(data, accepted) == JSONRenderer().render(
+            data, accepted
+        )
+
+
+def test_fast_json_parser_matches_drf():
+    """Valid bodies parse the same and malformed ones raise DRF's error message."""
+
+    body = '{"title": "Ñandú", "big": 123456789012345678901234567890}'.encode()
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+        io.BytesIO(body)
+    )
+
+    with pytest.raises(ParseError) as fast_error:
+        FastJSONParser().parse(io.BytesIO(b'{"title": '))
+    with pytest.raises(ParseError) as drf_error:
+        JSONParser().parse(io.BytesIO(b'{"title": '))
+    assert fast_error.value.detail == drf_error.value.detail
+
+
+def test_msgpack_is_negotiated_for_reads_and_writes(auth_client):
+    """``Accept``/``Content-Type: application/msgpack`` switch the wire format."""
+
+    client, user = auth_client
+    TaskFactory(user=user, title="Existing")
+    url = reverse("tasks-list")
+
+    as_json = client.get(url)
+    as_msgpack = client.get(url, HTTP_ACCEPT=MSGPACK_MEDIA_TYPE)
+    created = client.post(
+        url,
+        msgpack.packb({"title": "Packed"}),
+        content_type=MSGPACK_MEDIA_TYPE,
+        HTTP_ACCEPT=MSGPACK_MEDIA_TYPE,
+    )
+    malformed = client.post(url, b"\xc1", content_type=MSGPACK_MEDIA_TYPE)
+
+    assert as_msgpack.status_code == status.HTTP_200_OK
+    assert as_msgpack["Content-Type"] == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+    assert as_msgpack["ETag"] != as_json["ETag"]
+    assert "Accept" in as_msgpack["Vary"]
+    assert created.status_code == status.HTTP_201_CREATED
+    assert msgpack.unpackb(created.content)["title"] == "Packed"
+    assert malformed.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.urls("todo_project.async_urls")
+def test_async_api_negotiates_the_same_renderers(user):
+    """The async views pick the renderer from ``Accept`` like the sync API."""
+
+    TaskFactory(user=user)
+    token = Token.objects.create(user=user)
+    client = AsyncClient()
+    headers = {"Authorization": f"Token {token.key}"}
+
+    as_json = async_to_sync(client.get)("/api/tasks/", headers=headers)
+    as_msgpack = async_to_sync(client.get)(
+        "/api/tasks/", headers={**headers, "Accept": MSGPACK_MEDIA_TYPE}
+    )
+    refused = async_to_sync(client.get)(
+        "/api/tasks/", headers={**headers, "Accept": "text/csv"}
+    )
+
+    assert as_json["Content-Type"] == "application/json"
+    assert as_msgpack["Content-Type"] == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+    assert "Accept" in as_msgpack["Vary"]
+    assert refused.status_code == status.HTTP_406_NOT_ACCEPTABLE
+    assert refused["Content-Type"] == "application/json"
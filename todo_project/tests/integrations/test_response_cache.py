@@ -0,0 +1,231 @@
+"""Integration tests for the per-user task response cache."""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from tasks.renderers import MSGPACK_MEDIA_TYPE
+from tasks.response_cache import (
+    CachedResponse,
+    MemoryStore,
+    SharedStore,
+    response_cache,
+)
+from tests.factories.tasks import TaskFactory
+
+# Generations are replaced on commit, so the writes must really commit.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def cache_backend(settings, tmp_path):
+    """Enables the response cache with the requested backend."""
+
+    def enable(backend, **config):
+        settings.CACHES = {
+            **settings.CACHES,
+            "task_responses": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path),
+            },
+        }
+        settings.TASK_RESPONSE_CACHE = {
+            **settings.TASK_RESPONSE_CACHE,
+            "BACKEND": backend,
+            **config,
+        }
+        response_cache.clear()
+
+    return enable
+
+
+def _get(client, url, **extra):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, **extra)
+    assert response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED)
+    return response, len(queries)
+
+
+@pytest.mark.parametrize("backend", ["memory", "file"])
+def test_repeated_reads_skip_the_database_until_a_write(
+    auth_client, cache_backend, backend
+):
+    """A hit costs no query, and every write path makes the next read a miss."""
+
+    cache_backend(backend)
+    client, user = auth_client
+    task = TaskFactory(user=user, title="Cached")
+    list_url = reverse("tasks-list")
+    detail_url = reverse("tasks-detail", args=[task.pk])
+
+    first, first_queries = _get(client, list_url)
+    second, second_queries = _get(client, list_url)
+    detail, _ = _get(client, detail_url)
+    cached_detail, detail_queries = _get(client, detail_url)
+
+    assert first_queries > 0 and second_queries == 0 and detail_queries == 0
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+    assert cached_detail.content == detail.content
+
+    client.patch(detail_url, {"title": "Renamed"}, format="json")
+    assert _get(client, detail_url)[0].json()["title"] == "Renamed"
+    client.post(list_url, {"title": "Second"}, format="json")
+    assert len(_get(client, list_url)[0].json()["results"]) == 2
+    client.delete(detail_url)
+    client.post(reverse("tasks-bulk"), {"create": [{"title": "Bulk"}]}, format="json")
+    titles = [row["title"] for row in _get(client, list_url)[0].json()["results"]]
+
+    assert titles == ["Bulk", "Second"]
+    counters = response_cache.counters()
+    assert counters["hit", "tasks-list"] == 1
+    assert counters["hit", "tasks-detail"] == 1
+    assert counters["invalidation", ""] == 4
+
+
+def test_entries_are_per_user_params_and_media_type(auth_client, cache_backend):
+    """Other users, other query strings and other media types never share an entry."""
+
+    cache_backend("memory")
+    client, user = auth_client
+    TaskFactory(user=user, is_completed=True)
+    TaskFactory(user=user, is_completed=False)
+    other = TaskFactory(title="Someone else's").user
+    other_client = APIClient()
+    other_client.force_authenticate(other)
+    url = reverse("tasks-list")
+
+    _get(client, url, data={"is_completed": "true", "page_size": 10})
+    reordered, queries = _get(
+        client, url, data={"page_size": 10, "is_completed": "true"}
+    )
+    unfiltered, unfiltered_queries = _get(client, url)
+    packed, packed_queries = _get(client, url, HTTP_ACCEPT=MSGPACK_MEDIA_TYPE)
+    others, _ = _get(other_client, url)
+
+    assert queries == 0
+    assert len(reordered.json()["results"]) == 1
+    assert unfiltered_queries > 0 and len(unfiltered.json()["results"]) == 2
+    assert packed_queries > 0 and packed["Content-Type"] == MSGPACK_MEDIA_TYPE
+    assert [row["title"] for row in others.json()["results"]] == ["Someone else's"]
+
+
+def test_cache_hit_answers_conditional_requests(auth_client, cache_backend):
+    """A matching ``If-None-Match`` gets a 304 straight from the cached validators."""
+
+    cache_backend("memory")
+    client, user = auth_client
+    TaskFactory(user=user)
+    url = reverse("tasks-list")
+    etag = _get(client, url)[0]["ETag"]
+
+    response, queries = _get(client, url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert queries == 0
+
+
+def test_file_backend_is_shared_between_workers(auth_client, cache_backend):
+    """A write seen by one worker's generation invalidates the entries of the others."""
+
+    cache_backend("file")
+    client, user = auth_client
+    TaskFactory(user=user)
+    url = reverse("tasks-list")
+    _get(client, url)
+
+    # A second process reads the same directory through its own store.
+    response_cache.clear()
+    cache_backend("file")
+    assert _get(client, url)[1] == 0
+
+    response_cache.store.bump(user.pk)
+    assert _get(client, url)[1] > 0
+
+
+def test_memory_backend_is_shared_with_several_workers(cache_backend, settings):
+    """Per-process generations cannot see other workers' writes, so they are not used."""
+
+    settings.SERVER_WORKERS = 2
+    cache_backend("memory")
+
+    assert isinstance(response_cache.store, SharedStore)
+
+
+@pytest.mark.parametrize("backend", ["memory", "file"])
+@pytest.mark.urls("todo_project.async_urls")
+def test_async_views_use_the_cache(user, cache_backend, backend):
+    """The ASGI list and detail views share the entries and invalidation of the sync ones."""
+
+    cache_backend(backend)
+    token = Token.objects.create(user=user)
+    task = TaskFactory(user=user, title="Cached")
+    list_url = reverse("tasks-list")
+    detail_url = reverse("tasks-detail", args=[task.pk])
+
+    def call(method, url, **data):
+        # AsyncClient only forwards per-request headers into the ASGI scope.
+        extra = {"headers": {"Authorization": f"Token {token.key}"}}
+        if data:
+            extra.update(data=data, content_type="application/json")
+        return async_to_sync(getattr(AsyncClient(), method))(url, **extra)
+
+    first = call("get", list_url)
+    second = call("get", list_url)
+    call("get", detail_url)
+    call("get", detail_url)
+    call("patch", detail_url, title="Renamed")
+
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+    assert call("get", list_url).json()["results"][0]["title"] == "Renamed"
+    assert call("get", detail_url).json()["title"] == "Renamed"
+    counters = response_cache.counters()
+    assert counters["hit", "tasks-list"] == counters["hit", "tasks-detail"] == 1
+    assert counters["miss", "tasks-list"] == counters["miss", "tasks-detail"] == 2
+
+
+def test_memory_store_stays_within_its_byte_budget():
+    """Least recently used entries are evicted once the bodies exceed ``MAX_BYTES``."""
+
+    store = MemoryStore(max_bytes=3000, ttl=60)
+    for key in "abcd":
+        store.set(key, CachedResponse("application/json", b"x" * 700, None, None))
+    store.get("b")
+    store.set("e", CachedResponse("application/json", b"x" * 700, None, None))
+    store.set("huge", CachedResponse("application/json", b"x" * 5000, None, None))
+
+    assert store.size <= 3000
+    assert store.evictions == 2
+    assert [key for key in "abcde" if store.get(key)] == ["b", "d", "e"]
+    assert store.get("huge") is None
+
+
+def test_metrics_expose_cache_counters(auth_client, cache_backend, staff_client):
+    """Hits, misses, invalidations, evictions and size show up on ``/metrics``."""
+
+    cache_backend("memory")
+    client, user = auth_client
+    client.get(reverse("tasks-list"))
+    client.get(reverse("tasks-list"))
+    client.post(reverse("tasks-list"), {"title": "New"}, format="json")
+
+    text = staff_client.get("/metrics").content.decode()
+
+    assert (
+        'task_response_cache_lookups_total{endpoint="tasks-list",result="hit"} 1'
+        in text
+    )
+    assert (
+        'task_response_cache_lookups_total{endpoint="tasks-list",result="miss"} 1'
+        in text
+    )
+    assert "task_response_cache_invalidations_total 1" in text
+    assert "task_response_cache_evictions_total 0" in text
+    assert "# TYPE task_response_cache_bytes gauge" in text
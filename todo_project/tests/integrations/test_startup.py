@@ -0,0 +1,82 @@
+"""Integration tests for lazily loaded API docs and the import-time report."""
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from tasks.docs import load_docs
+from tasks.management.commands.profile_imports import by_package, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       338 |        338 |   _io
+import time:       120 |        120 |     yaml.error
+import time:       450 |        570 |   yaml
+import time:        80 |       1000 | django_extensions
+some other stderr line
+"""
+
+
+def _profile(*overrides):
+    out = StringIO()
+    call_command(
+        "profile_imports",
+        overrides=list(overrides),
+        top=10000,
+        json=True,
+        stdout=out,
+    )
+    return json.loads(out.getvalue())
+
+
+def test_parse_importtime_reads_depths_and_times():
+    """Header and foreign lines are skipped; depth counts from the script's own imports."""
+
+    entries = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [(e.module, e.self_us, e.cumulative_us, e.depth) for e in entries] == [
+        ("_io", 338, 338, 1),
+        ("yaml.error", 120, 120, 2),
+        ("yaml", 450, 570, 1),
+        ("django_extensions", 80, 1000, 0),
+    ]
+    packages = {row.module: (row.self_us, row.depth) for row in by_package(entries)}
+    assert packages["yaml"] == (570, 2)
+
+
+def test_disabled_docs_keep_drf_yasg_out_of_the_worker():
+    """Without the docs a worker loads its URLconf without importing drf_yasg."""
+
+    enabled = {row["module"] for row in _profile()["rows"]}
+    disabled = _profile("API_DOCS_ENABLED=False")
+    modules = {row["module"] for row in disabled["rows"]}
+
+    assert "drf_yasg.openapi" in enabled and "tasks.docs.task_docs" in enabled
+    assert "tasks.task_views" in modules
+    assert not any(module.startswith("drf_yasg") for module in modules)
+    assert not any(module.startswith("tasks.docs.") for module in modules)
+    assert disabled["modules"] < len(enabled)
+
+
+def test_profile_imports_rejects_malformed_overrides():
+    """``--set`` needs a NAME=VALUE pair."""
+
+    with pytest.raises(CommandError, match="NAME=VALUE"):
+        call_command("profile_imports", overrides=["API_DOCS_ENABLED"])
+
+
+def test_disabled_docs_make_schema_decorators_inert(settings):
+    """With the docs off every decorator returns the view untouched."""
+
+    settings.API_DOCS_ENABLED = False
+
+    def view(request):
+        return None
+
+    docs = load_docs("task_docs")
+
+    assert docs.list_tasks_schema(view) is view
+    assert not hasattr(view, "_swagger_auto_schema")
+    with pytest.raises(CommandError, match="API_DOCS_ENABLED"):
+        call_command("generate_openapi_schema", stdout=StringIO())
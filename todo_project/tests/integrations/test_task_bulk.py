@@ -0,0 +1,166 @@
+"""Integration tests for the bulk task endpoint."""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from tasks.constants import BULK_MAX_OPERATIONS, TASK_ERROR_NOT_FOUND
+from tasks.models import Task
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _bulk(client, payload):
+    return client.post(reverse("tasks-bulk"), payload, format="json")
+
+
+def test_bulk_applies_create_update_and_delete(auth_client):
+    """A mixed batch should be applied and reported item by item."""
+
+    client, user = auth_client
+    to_update = TaskFactory(user=user, title="Old", is_completed=False)
+    to_delete = TaskFactory(user=user)
+    payload = {
+        "create": [{"title": "First"}, {"title": "Second", "is_completed": True}],
+        "update": [{"id": to_update.id, "is_completed": True}],
+        "delete": [to_delete.id],
+    }
+
+    response = _bulk(client, payload)
+
+    assert response.status_code == status.HTTP_200_OK
+    created = response.data["create"]
+    assert [item["status"] for item in created] == [201, 201]
+    assert [item["task"]["title"] for item in created] == ["First", "Second"]
+    assert Task.objects.filter(user=user, title__in=["First", "Second"]).count() == 2
+
+    assert response.data["update"][0]["status"] == 200
+    to_update.refresh_from_db()
+    assert to_update.is_completed is True
+    assert to_update.title == "Old"
+    assert to_update.modified > to_update.created
+
+    assert response.data["delete"] == [{"id": to_delete.id, "status": 204}]
+    assert not Task.objects.filter(id=to_delete.id).exists()
+
+
+def test_bulk_reports_missing_deletes_without_touching_other_users(auth_client):
+    """Deleting tasks owned by someone else should report 404 and leave them alone."""
+
+    client, _ = auth_client
+    foreign = TaskFactory()
+
+    response = _bulk(client, {"delete": [foreign.id]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["delete"] == [{"id": foreign.id, "status": 404}]
+    assert Task.objects.filter(id=foreign.id).exists()
+
+
+def test_bulk_invalid_item_rejects_whole_batch(auth_client):
+    """A single invalid item should prevent every operation from being applied."""
+
+    client, user = auth_client
+    to_delete = TaskFactory(user=user)
+    payload = {"create": [{"title": "Valid"}, {"title": ""}], "delete": [to_delete.id]}
+
+    response = _bulk(client, payload)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["create"][0] == {}
+    assert "title" in response.data["create"][1]
+    assert not Task.objects.filter(title="Valid").exists()
+    assert Task.objects.filter(id=to_delete.id).exists()
+
+
+def test_bulk_update_of_foreign_task_rejects_whole_batch(auth_client):
+    """Updates must only target the requester's tasks."""
+
+    client, _ = auth_client
+    foreign = TaskFactory(title="Theirs")
+
+    response = _bulk(
+        client,
+        {"create": [{"title": "Mine"}], "update": [{"id": foreign.id, "title": "x"}]},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["update"][0]["id"] == [TASK_ERROR_NOT_FOUND]
+    foreign.refresh_from_db()
+    assert foreign.title == "Theirs"
+    assert not Task.objects.filter(title="Mine").exists()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {"create": [{"title": "t"}] * (BULK_MAX_OPERATIONS + 1)},
+        {"update": [{"id": 1, "title": "t"}], "delete": [1]},
+    ],
+    ids=["empty", "too-many", "duplicate-ids"],
+)
+def test_bulk_rejects_invalid_batches(auth_client, payload):
+    """Empty, oversized and ambiguous batches should be rejected."""
+
+    client, _ = auth_client
+
+    response = _bulk(client, payload)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_bulk_query_count_does_not_grow_with_batch_size(auth_client):
+    """The number of queries should be the same for small and large batches."""
+
+    client, user = auth_client
+
+    def run(size):
+        updates = TaskFactory.create_batch(size, user=user)
+        deletes = TaskFactory.create_batch(size, user=user)
+        payload = {
+            "create": [{"title": f"New {i}"} for i in range(size)],
+            "update": [{"id": task.id, "is_completed": True} for task in updates],
+            "delete": [task.id for task in deletes],
+        }
+        with CaptureQueriesContext(connection) as queries:
+            assert _bulk(client, payload).status_code == status.HTTP_200_OK
+        return len(queries)
+
+    run(1)  # Creates the user's summary row.
+    assert run(2) == run(40)
+
+
+def test_bulk_update_writes_only_the_fields_each_item_sends(auth_client):
+    """A field no item of the batch sends keeps the value another request wrote to it."""
+
+    client, user = auth_client
+    renamed, completed = TaskFactory.create_batch(2, user=user, description="old")
+    # Written by a concurrent request after the client built its batch.
+    Task.objects.filter(pk=renamed.pk).update(description="theirs", is_completed=True)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = _bulk(
+            client,
+            {
+                "update": [
+                    {"id": renamed.id, "title": "Renamed"},
+                    {"id": completed.id, "is_completed": True},
+                ]
+            },
+        )
+
+    updates = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "tasks_task"')]
+    renamed.refresh_from_db()
+    completed.refresh_from_db()
+    assert response.status_code == status.HTTP_200_OK
+    assert len(updates) == 2
+    assert not any('"description"' in sql for sql in updates)
+    assert (renamed.title, renamed.description, renamed.is_completed) == (
+        "Renamed",
+        "theirs",
+        True,
+    )
+    assert completed.is_completed and completed.completed_at is not None
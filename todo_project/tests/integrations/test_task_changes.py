@@ -0,0 +1,154 @@
+"""Integration tests for the delta sync endpoint and tombstone compaction."""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from tasks.models import Task, TaskTombstone
+from tasks.sync import encode_cursor
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _changes(client, **params):
+    return client.get(reverse("tasks-changes"), params)
+
+
+def test_initial_sync_returns_every_task_and_a_cursor(auth_client):
+    """Without ``since`` the endpoint should behave like a full fetch."""
+
+    client, user = auth_client
+    tasks = TaskFactory.create_batch(3, user=user)
+    TaskFactory()
+
+    response = _changes(client)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {item["id"] for item in response.data["changed"]} == {t.id for t in tasks}
+    assert response.data["deleted"] == []
+    assert response.data["cursor"]
+    assert response.data["has_more"] is False
+
+
+def test_sync_returns_only_changes_and_tombstones_after_cursor(auth_client, settings):
+    """Subsequent syncs should carry only what changed, including deletes."""
+
+    client, user = auth_client
+    settings.SYNC_LATE_COMMIT_WINDOW_SECONDS = 0
+    unchanged, edited, removed = TaskFactory.create_batch(3, user=user)
+    cursor = _changes(client).data["cursor"]
+
+    client.patch(reverse("tasks-detail", args=[edited.id]), {"title": "Edited"})
+    client.delete(reverse("tasks-detail", args=[removed.id]))
+    created = client.post(reverse("tasks-list"), {"title": "New"}).data
+
+    response = _changes(client, since=cursor)
+
+    assert [item["id"] for item in response.data["changed"]] == [
+        edited.id,
+        created["id"],
+    ]
+    assert response.data["deleted"] == [removed.id]
+
+    follow_up = _changes(client, since=response.data["cursor"])
+    assert follow_up.data["changed"] == []
+    assert follow_up.data["deleted"] == []
+
+
+def test_sync_picks_up_writes_committed_after_the_cursor(auth_client, settings):
+    """A change stamped before a cursor but committed after it is sent on the next sync."""
+
+    client, user = auth_client
+    settings.SYNC_LATE_COMMIT_WINDOW_SECONDS = 10
+    old, synced, removed = TaskFactory.create_batch(3, user=user)
+    Task.objects.filter(id=old.id).update(
+        modified=timezone.now() - timedelta(minutes=5)
+    )
+    cursor = _changes(client).data["cursor"]
+    stamped = timezone.now() - timedelta(seconds=1)
+
+    # Both writes were stamped before the sync above read and only committed now.
+    late = TaskFactory(user=user)
+    Task.objects.filter(id=late.id).update(modified=stamped)
+    client.delete(reverse("tasks-detail", args=[removed.id]))
+    TaskTombstone.objects.filter(task_id=removed.id).update(deleted_at=stamped)
+    response = _changes(client, since=cursor)
+    follow_up = _changes(client, since=response.data["cursor"])
+
+    changed = [item["id"] for item in response.data["changed"]]
+    assert late.id in changed
+    assert old.id not in changed
+    assert response.data["deleted"] == [removed.id]
+    assert late.id in [item["id"] for item in follow_up.data["changed"]]
+
+
+def test_bulk_deletes_leave_tombstones(auth_client):
+    """Deletes through the bulk endpoint must be visible to sync clients."""
+
+    client, user = auth_client
+    tasks = TaskFactory.create_batch(2, user=user)
+    cursor = _changes(client).data["cursor"]
+
+    client.post(
+        reverse("tasks-bulk"), {"delete": [task.id for task in tasks]}, format="json"
+    )
+
+    assert sorted(_changes(client, since=cursor).data["deleted"]) == sorted(
+        task.id for task in tasks
+    )
+
+
+def test_sync_pages_through_tasks_sharing_a_timestamp(auth_client):
+    """Paging must not skip or repeat tasks with identical ``modified`` values."""
+
+    client, user = auth_client
+    tasks = TaskFactory.create_batch(5, user=user)
+    Task.objects.filter(user=user).update(modified=tasks[0].modified)
+
+    seen = []
+    response = _changes(client, page_size=2)
+    while True:
+        seen += [item["id"] for item in response.data["changed"]]
+        if not response.data["has_more"]:
+            break
+        response = _changes(client, since=response.data["cursor"], page_size=2)
+
+    assert seen == [task.id for task in tasks]
+
+
+def test_malformed_cursor_is_rejected(auth_client):
+    """Garbage cursors should produce a 400."""
+
+    client, _ = auth_client
+
+    assert _changes(client, since="not-a-cursor").status_code == 400
+
+
+def test_cursor_older_than_retention_requires_full_resync(auth_client, settings):
+    """Cursors older than the tombstone retention window should be gone."""
+
+    client, _ = auth_client
+    settings.TASK_TOMBSTONE_RETENTION_DAYS = 7
+    stale = encode_cursor(timezone.now() - timedelta(days=8), 0)
+
+    assert _changes(client, since=stale).status_code == status.HTTP_410_GONE
+
+
+def test_compact_tombstones_removes_only_expired_rows(user):
+    """Compaction should delete tombstones past retention and keep the rest."""
+
+    now = timezone.now()
+    old = TaskTombstone.objects.create(
+        user=user, task_id=1, deleted_at=now - timedelta(days=40)
+    )
+    recent = TaskTombstone.objects.create(user=user, task_id=2, deleted_at=now)
+
+    call_command("compact_tombstones", days=30, batch_size=1, stdout=StringIO())
+
+    assert not TaskTombstone.objects.filter(id=old.id).exists()
+    assert TaskTombstone.objects.filter(id=recent.id).exists()
@@ -0,0 +1,78 @@
+"""Integration tests for the streaming task export endpoint."""
+
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _content(response) -> bytes:
+    """Drain a streaming response into bytes."""
+
+    return b"".join(response.streaming_content)
+
+
+def test_export_defaults_to_json_array_of_own_tasks(auth_client):
+    """Export should stream a JSON array with every task owned by the requester."""
+
+    client, user = auth_client
+    own_tasks = TaskFactory.create_batch(3, user=user)
+    TaskFactory.create_batch(2)
+
+    response = client.get(reverse("tasks-export"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/json"
+    payload = json.loads(_content(response))
+    assert {item["id"] for item in payload} == {task.id for task in own_tasks}
+
+
+def test_export_matches_detail_representation(auth_client):
+    """Exported rows should be identical to what the detail endpoint returns."""
+
+    client, user = auth_client
+    task = TaskFactory(user=user, description="Ünïcode ✓")
+
+    exported = json.loads(_content(client.get(reverse("tasks-export"))))
+    detail = client.get(reverse("tasks-detail", args=[task.id]))
+
+    assert exported == [json.loads(detail.content)]
+
+
+def test_export_ndjson_emits_one_task_per_line(auth_client):
+    """NDJSON export should emit one JSON document per line."""
+
+    client, user = auth_client
+    TaskFactory.create_batch(3, user=user)
+
+    response = client.get(reverse("tasks-export"), {"as": "ndjson"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = _content(response).splitlines()
+    assert len(lines) == 3
+    assert all(json.loads(line)["title"] for line in lines)
+
+
+def test_export_empty_task_set_returns_empty_array(auth_client):
+    """Users without tasks should receive an empty JSON array."""
+
+    client, _ = auth_client
+
+    response = client.get(reverse("tasks-export"))
+
+    assert json.loads(_content(response)) == []
+
+
+def test_export_rejects_unknown_format(auth_client):
+    """Unknown export formats should be rejected."""
+
+    client, _ = auth_client
+
+    response = client.get(reverse("tasks-export"), {"as": "xml"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,132 @@
+"""Integration tests for task filtering, ordering and search."""
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from tasks import fts
+from tasks.models import Task
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _ids(client, **params):
+    response = client.get(reverse("tasks-list"), params)
+    assert response.status_code == status.HTTP_200_OK
+    return [item["id"] for item in response.data["results"]]
+
+
+def test_filter_by_completion_state(auth_client):
+    """``is_completed`` should split done and pending tasks."""
+
+    client, user = auth_client
+    done = TaskFactory(user=user, is_completed=True)
+    pending = TaskFactory(user=user, is_completed=False)
+
+    assert _ids(client, is_completed="true") == [done.id]
+    assert _ids(client, is_completed="0") == [pending.id]
+
+
+def test_filter_by_created_and_modified_ranges(auth_client):
+    """Date range parameters should bound ``created`` and ``modified``."""
+
+    client, user = auth_client
+    old, recent = TaskFactory.create_batch(2, user=user)
+    week_ago = recent.created - timedelta(days=7)
+    Task.objects.filter(id=old.id).update(created=week_ago, modified=week_ago)
+    boundary = (recent.created - timedelta(days=1)).isoformat()
+
+    assert _ids(client, created_after=boundary) == [recent.id]
+    assert _ids(client, created_before=boundary) == [old.id]
+    assert _ids(client, modified_before=boundary) == [old.id]
+    assert _ids(client, modified_after=week_ago.date().isoformat()) == [
+        recent.id,
+        old.id,
+    ]
+
+
+@pytest.mark.parametrize(
+    "params", [{"is_completed": "maybe"}, {"created_after": "yesterday"}]
+)
+def test_invalid_filter_values_are_rejected(auth_client, params):
+    """Malformed filter values should produce a 400 naming the parameter."""
+
+    client, _ = auth_client
+
+    response = client.get(reverse("tasks-list"), params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == set(params)
+
+
+def test_ordering_by_title_pages_through_every_task(auth_client):
+    """Whitelisted ordering should drive cursor pagination."""
+
+    client, user = auth_client
+    for title in ["b", "d", "a", "c"]:
+        TaskFactory(user=user, title=title)
+
+    response = client.get(reverse("tasks-list"), {"ordering": "title", "page_size": 3})
+    titles = [item["title"] for item in response.data["results"]]
+    titles += [
+        item["title"] for item in client.get(response.data["next"]).data["results"]
+    ]
+
+    assert titles == ["a", "b", "c", "d"]
+
+
+def test_unknown_ordering_falls_back_to_newest_first(auth_client):
+    """Non-whitelisted fields should be ignored."""
+
+    client, user = auth_client
+    first, second = TaskFactory.create_batch(2, user=user)
+
+    assert _ids(client, ordering="description") == [second.id, first.id]
+
+
+def test_search_matches_title_and_description_prefixes(auth_client):
+    """Search should match word prefixes in either text field, for the requester only."""
+
+    client, user = auth_client
+    groceries = TaskFactory(user=user, title="Buy groceries", description="")
+    report = TaskFactory(user=user, title="Report", description="Quarterly numbers")
+    TaskFactory(title="Buy groceries")
+
+    assert _ids(client, search="grocer") == [groceries.id]
+    assert _ids(client, search="quarter") == [report.id]
+    assert _ids(client, search="buy groceries") == [groceries.id]
+
+
+def test_search_index_follows_updates_and_deletes(auth_client):
+    """The FTS table must stay in sync with the task table."""
+
+    client, user = auth_client
+    task = TaskFactory(user=user, title="Draft")
+    client.patch(reverse("tasks-detail", args=[task.id]), {"title": "Final"})
+
+    assert _ids(client, search="draft") == []
+    assert _ids(client, search="final") == [task.id]
+
+    client.delete(reverse("tasks-detail", args=[task.id]))
+    assert _ids(client, search="final") == []
+
+
+def test_search_treats_fts_syntax_as_plain_text(auth_client):
+    """Quotes and operators in the query must not break the search."""
+
+    client, user = auth_client
+    TaskFactory(user=user, title="Plain")
+
+    assert _ids(client, search='" OR title:* NEAR(') == []
+
+
+def test_search_falls_back_without_fts(auth_client, monkeypatch):
+    """Backends without the FTS table should use substring matching."""
+
+    client, user = auth_client
+    task = TaskFactory(user=user, title="Renew passport")
+    monkeypatch.setattr(fts, "is_available", lambda connection: False)
+
+    assert _ids(client, search="pass") == [task.id]
@@ -0,0 +1,59 @@
+"""Integration tests for the fast read path of task serialization."""
+
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from tasks.models import Task
+from tasks.serializers import TaskRowSerializer, TaskSerializer
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _tasks_with_edge_cases(user):
+    TaskFactory(user=user, title='Ñandú «quoted» "title"', description="")
+    TaskFactory(user=user, description="line\nbreak\t\u2028 \u2029", is_completed=True)
+    on_the_second = TaskFactory(user=user)
+    Task.objects.filter(pk=on_the_second.pk).update(
+        created=datetime.datetime(2024, 2, 29, 23, 59, 59, tzinfo=datetime.UTC),
+        modified=datetime.datetime(2024, 3, 1, 0, 0, 0, 1, tzinfo=datetime.UTC),
+    )
+    untouched = TaskFactory(user=user)
+    Task.objects.filter(pk=untouched.pk).update(modified=untouched.created)
+    return Task.objects.filter(user=user)
+
+
+@pytest.mark.parametrize("zone", ["UTC", "America/Argentina/Buenos_Aires"])
+def test_row_serializer_renders_the_same_bytes_as_task_serializer(user, zone):
+    """The fast path must be byte-identical to ``TaskSerializer`` in any timezone."""
+
+    queryset = _tasks_with_edge_cases(user)
+    renderer = JSONRenderer()
+
+    with timezone.override(zone):
+        expected = renderer.render(TaskSerializer(queryset, many=True).data)
+        serializer = TaskRowSerializer()
+        actual = renderer.render(serializer.serialize(serializer.rows(queryset)))
+
+    assert actual == expected
+
+
+def test_list_and_export_match_task_serializer(auth_client):
+    """List pages and the export should carry exactly what ``TaskSerializer`` produced."""
+
+    client, user = auth_client
+    queryset = _tasks_with_edge_cases(user).order_by("-created", "id")
+    expected = JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+
+    page = client.get(reverse("tasks-list"), {"page_size": 2})
+    following = client.get(page.data["next"])
+    export = client.get(reverse("tasks-export"))
+
+    assert page.status_code == status.HTTP_200_OK
+    listed = JSONRenderer().render(page.data["results"] + following.data["results"])
+    assert listed == expected
+    assert b"".join(export.streaming_content) == expected
@@ -0,0 +1,146 @@
+"""Integration tests for the incrementally maintained task statistics."""
+
+import datetime
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from tasks.models import Task, UserTaskSummary
+from tasks.stats import task_stats
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _stats(client, **params):
+    response = client.get(reverse("tasks-stats"), params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def _rebuilt(user):
+    call_command("rebuild_task_stats", user_ids=[user.pk], stdout=StringIO())
+    return task_stats(user, 30)
+
+
+def test_counters_follow_every_write_path(auth_client):
+    """Creates, updates, deletes and bulk batches keep the counters exact."""
+
+    client, user = auth_client
+    url = reverse("tasks-list")
+    first = client.post(url, {"title": "One"}, format="json").json()
+    second = client.post(url, {"title": "Two", "is_completed": True}, format="json")
+    client.patch(
+        reverse("tasks-detail", args=[first["id"]]),
+        {"is_completed": True},
+        format="json",
+    )
+    client.put(
+        reverse("tasks-detail", args=[first["id"]]),
+        {"title": "One", "is_completed": False},
+        format="json",
+    )
+    client.delete(reverse("tasks-detail", args=[second.json()["id"]]))
+    client.post(
+        reverse("tasks-bulk"),
+        {
+            "create": [{"title": "Bulk", "is_completed": True}, {"title": "Bulk 2"}],
+            "update": [{"id": first["id"], "is_completed": True}],
+        },
+        format="json",
+    )
+
+    stats = _stats(client)
+    today = timezone.localdate().isoformat()
+
+    assert stats == {
+        "total": 3,
+        "completed": 2,
+        "pending": 1,
+        "daily": [{"date": today, "created": 3, "completed": 2}],
+    }
+    assert stats == _rebuilt(user)
+    assert Task.objects.get(pk=first["id"]).completed_at is not None
+
+
+def test_daily_counts_use_creation_and_completion_days(auth_client):
+    """A task counts on the day it was created and, separately, the day it was completed."""
+
+    client, user = auth_client
+    task_id = client.post(
+        reverse("tasks-list"), {"title": "Old"}, format="json"
+    ).json()["id"]
+    old = timezone.now() - datetime.timedelta(days=40)
+    Task.objects.filter(pk=task_id).update(created=old)
+    call_command("rebuild_task_stats", user_ids=[user.pk], stdout=StringIO())
+    client.patch(
+        reverse("tasks-detail", args=[task_id]), {"is_completed": True}, format="json"
+    )
+
+    recent = _stats(client)
+    wide = _stats(client, days=60)
+    today = timezone.localdate().isoformat()
+
+    assert recent["daily"] == [{"date": today, "created": 0, "completed": 1}]
+    assert wide["daily"] == [
+        {"date": timezone.localdate(old).isoformat(), "created": 1, "completed": 0},
+        {"date": today, "created": 0, "completed": 1},
+    ]
+    assert wide == {**_rebuilt(user), "daily": wide["daily"]}
+
+
+def test_stats_read_cost_does_not_depend_on_task_count(auth_client):
+    """Reading the statistics takes the same queries for 1 or 200 tasks."""
+
+    client, user = auth_client
+
+    def queries_with(count):
+        client.post(
+            reverse("tasks-bulk"),
+            {"create": [{"title": f"T{i}"} for i in range(count)]},
+            format="json",
+        )
+        with CaptureQueriesContext(connection) as queries:
+            _stats(client)
+        return len(queries)
+
+    assert queries_with(1) == queries_with(200) == 2
+    assert _stats(client)["total"] == 201
+
+
+def test_rebuild_command_repairs_counters_of_writes_outside_the_api(user):
+    """Tasks written directly (factories, admin scripts) are counted after a rebuild."""
+
+    TaskFactory.create_batch(3, user=user)
+    TaskFactory(user=user, is_completed=True)
+    assert not UserTaskSummary.objects.filter(user=user).exists()
+
+    call_command("rebuild_task_stats", stdout=StringIO())
+
+    summary = UserTaskSummary.objects.get(user=user)
+    assert (summary.total_count, summary.completed_count) == (4, 1)
+
+
+@pytest.mark.urls("todo_project.async_urls")
+def test_async_stats_match_sync_stats(user):
+    """The async endpoint returns the same figures as the sync one."""
+
+    TaskFactory.create_batch(2, user=user, is_completed=True)
+    call_command("rebuild_task_stats", user_ids=[user.pk], stdout=StringIO())
+    token = Token.objects.create(user=user)
+
+    response = async_to_sync(AsyncClient().get)(
+        "/api/tasks/stats/?days=7", headers={"Authorization": f"Token {token.key}"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == task_stats(user, 7)
+    assert response.json()["completed"] == 2
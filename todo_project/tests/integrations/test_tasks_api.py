@@ -18,10 +18,47 @@ def test_list_returns_only_authenticated_user_tasks(auth_client):
     response = client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
-    returned_ids = {item["id"] for item in response.data}
+    returned_ids = {item["id"] for item in response.data["results"]}
     assert returned_ids == {task.id for task in own_tasks}
 
 
+def test_list_is_cursor_paginated_newest_first(auth_client):
+    """List endpoint should walk every task once, newest first, page by page."""
+
+    client, user = auth_client
+    tasks = TaskFactory.create_batch(5, user=user)
+
+    url = reverse("tasks-list")
+    response = client.get(url, {"page_size": 2})
+    returned_ids = []
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) <= 2
+        returned_ids += [item["id"] for item in response.data["results"]]
+        if not response.data["next"]:
+            break
+        response = client.get(response.data["next"])
+
+    expected = sorted(tasks, key=lambda task: (-task.created.timestamp(), task.id))
+    assert returned_ids == [task.id for task in expected]
+
+
+def test_list_pages_share_created_timestamp_without_duplicates(auth_client):
+    """Tasks with identical creation times must be split across pages by id."""
+
+    client, user = auth_client
+    tasks = TaskFactory.create_batch(4, user=user)
+    Task.objects.filter(user=user).update(created=tasks[0].created)
+
+    url = reverse("tasks-list")
+    first = client.get(url, {"page_size": 3})
+    second = client.get(first.data["next"])
+
+    returned_ids = [item["id"] for item in first.data["results"]]
+    returned_ids += [item["id"] for item in second.data["results"]]
+    assert returned_ids == sorted(task.id for task in tasks)
+
+
 def test_create_task_assigns_authenticated_user(auth_client):
     """Creating a task should automatically bind it to the requester."""
 
@@ -0,0 +1,174 @@
+"""Integration tests for the sliding-window throttles."""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from tasks import auth_views
+from tasks.throttling import CacheBackend, MemoryBackend, limiter
+from tests.factories.users import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def rates(settings):
+    """Sets the throttle rates of the given scopes, leaving the others unlimited."""
+
+    def configure(**scopes):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                "auth_ip": None,
+                "login_username": None,
+                "token_failures": None,
+                "tasks": None,
+                **scopes,
+            },
+        }
+        limiter.clear()
+
+    return configure
+
+
+def _login(username, ip, password="wrong"):
+    return APIClient().post(
+        reverse("auth-login"),
+        {"username": username, "password": password},
+        format="json",
+        REMOTE_ADDR=ip,
+    )
+
+
+def test_login_is_refused_per_username_before_authenticating(rates, monkeypatch):
+    """Attempts past the username's budget get 429 without running ``authenticate()``."""
+
+    rates(login_username="3/min")
+    user = UserFactory()
+    calls = []
+    monkeypatch.setattr(
+        auth_views,
+        "authenticate",
+        lambda **credentials: calls.append(credentials["username"]),
+    )
+
+    responses = [_login(user.username, f"10.0.0.{i}") for i in range(5)]
+    other = _login("someone-else", "10.0.0.9")
+
+    assert [response.status_code for response in responses] == [401] * 3 + [429] * 2
+    assert int(responses[-1]["Retry-After"]) > 0
+    assert calls == [user.username] * 3 + ["someone-else"]
+    assert other.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_register_and_login_share_the_ip_budget(rates):
+    """The per-IP limit counts both endpoints and leaves other IPs alone."""
+
+    rates(auth_ip="2/min")
+    client = APIClient()
+    url = reverse("auth-register")
+
+    first = client.post(url, {"username": "a", "password": "x"}, REMOTE_ADDR="1.1.1.1")
+    login = _login("a", "1.1.1.1", password="x")
+    refused = client.post(
+        url, {"username": "b", "password": "x"}, REMOTE_ADDR="1.1.1.1"
+    )
+    elsewhere = client.post(
+        url, {"username": "b", "password": "x"}, REMOTE_ADDR="2.2.2.2"
+    )
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert login.status_code == status.HTTP_200_OK
+    assert refused.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert elsewhere.status_code == status.HTTP_201_CREATED
+
+
+def test_failed_token_lookups_stop_reaching_the_database(rates):
+    """After too many invalid tokens, lookups are refused without a query; valid ones pass."""
+
+    rates(token_failures="2/min")
+    token = Token.objects.create(user=UserFactory())
+    client = APIClient(REMOTE_ADDR="3.3.3.3")
+    url = reverse("tasks-list")
+    client.get(url, HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    failures = [
+        client.get(url, HTTP_AUTHORIZATION=f"Token guess{i}").status_code
+        for i in range(2)
+    ]
+    with CaptureQueriesContext(connection) as queries:
+        refused = client.get(url, HTTP_AUTHORIZATION="Token guess3")
+    cached = client.get(url, HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    assert failures == [401, 401]
+    assert refused.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert len(queries) == 0
+    assert cached.status_code == status.HTTP_200_OK
+
+
+def test_task_api_is_limited_per_user(rates, auth_client):
+    """Each user has their own task API budget."""
+
+    rates(tasks="2/min")
+    client, _ = auth_client
+    other = APIClient()
+    other.force_authenticate(UserFactory())
+    url = reverse("tasks-list")
+
+    statuses = [client.get(url).status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+    assert other.get(url).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.urls("todo_project.async_urls")
+def test_async_api_applies_the_same_throttles(rates, user):
+    """The async login and task views refuse with the same status and headers."""
+
+    rates(login_username="1/min", tasks="1/min")
+    token = Token.objects.create(user=user)
+    client = AsyncClient()
+    headers = {"Authorization": f"Token {token.key}"}
+
+    logins = [
+        async_to_sync(client.post)(
+            "/api/auth/login/",
+            {"username": user.username, "password": "wrong"},
+            content_type="application/json",
+        )
+        for _ in range(2)
+    ]
+    reads = [
+        async_to_sync(client.get)("/api/tasks/", headers=headers) for _ in range(2)
+    ]
+
+    assert [response.status_code for response in logins] == [401, 429]
+    assert [response.status_code for response in reads] == [200, 429]
+    assert int(reads[1]["Retry-After"]) > 0
+    assert reads[1].json()["detail"].startswith("Request was throttled.")
+
+
+@pytest.mark.parametrize("backend", [MemoryBackend, lambda: CacheBackend("default")])
+def test_window_slides_across_fixed_windows(backend):
+    """The previous window's count weighs in proportionally to its remaining overlap."""
+
+    backend = backend()
+    key = "scope:client"
+
+    allowed = [backend.hit(key, 4, 60, 100.0 + i, True) == 0 for i in range(5)]
+    # Halfway through the next window, half of the previous 4 requests still count.
+    halfway = [backend.hit(key, 4, 60, 150.0, True) == 0 for _ in range(3)]
+    wait = backend.hit(key, 4, 60, 150.0, False)
+    later = backend.hit(key, 4, 60, 150.0 + wait + 0.01, True)
+    backend.record(key, 60, 300.0)
+
+    assert allowed == [True] * 4 + [False]
+    assert halfway == [True, True, False]
+    assert 0 < wait < 60
+    assert later == 0
+    assert backend.hit(key, 1, 60, 300.0, False) > 0
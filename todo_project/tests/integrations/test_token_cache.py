@@ -0,0 +1,219 @@
+"""Integration tests for cached token authentication."""
+
+import time
+
+import pytest
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from tasks.authentication import TokenCache, token_cache
+from tests.factories.users import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _token_client(user):
+    token = Token.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client, token
+
+
+def _token_queries(client):
+    """Perform an authenticated list request and count token lookups."""
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("tasks-list"))
+    lookups = [q for q in queries if "authtoken_token" in q["sql"]]
+    return response, len(lookups)
+
+
+def test_repeated_requests_skip_token_lookup():
+    """Only the first request for a token should hit the database."""
+
+    client, _ = _token_client(UserFactory())
+
+    first, first_lookups = _token_queries(client)
+    second, second_lookups = _token_queries(client)
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first_lookups == 1
+    assert second_lookups == 0
+
+
+def test_logout_revokes_cached_token_immediately():
+    """A token deleted on logout must stop working even if it was cached."""
+
+    client, _ = _token_client(UserFactory())
+    _token_queries(client)
+
+    assert client.post(reverse("auth-logout")).status_code == status.HTTP_204_NO_CONTENT
+    response, _ = _token_queries(client)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_password_change_invalidates_cached_user():
+    """Saving the user should force the next request to reload it."""
+
+    user = UserFactory()
+    client, _ = _token_client(user)
+    _token_queries(client)
+
+    user.set_password("Another123!")
+    user.save()
+    _, lookups = _token_queries(client)
+
+    assert lookups == 1
+
+
+def test_deactivated_user_is_rejected_despite_cache():
+    """Deactivating a user should take effect right away."""
+
+    user = UserFactory()
+    client, _ = _token_client(user)
+    _token_queries(client)
+
+    user.is_active = False
+    user.save()
+    response, _ = _token_queries(client)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@override_settings(TOKEN_AUTH_CACHE={"MAX_SIZE": 2})
+def test_local_cache_evicts_least_recently_used():
+    """The local tier should never hold more than ``MAX_SIZE`` tokens."""
+
+    clients = [_token_client(UserFactory())[0] for _ in range(3)]
+    for client in clients:
+        _token_queries(client)
+
+    _, newest_lookups = _token_queries(clients[2])
+    _, oldest_lookups = _token_queries(clients[0])
+
+    assert newest_lookups == 0
+    assert oldest_lookups == 1
+
+
+@override_settings(TOKEN_AUTH_CACHE={"TTL": 30})
+def test_entries_expire_after_ttl(monkeypatch):
+    """Entries older than the TTL should be looked up again."""
+
+    client, _ = _token_client(UserFactory())
+    _token_queries(client)
+
+    real_monotonic = time.monotonic
+    monkeypatch.setattr(time, "monotonic", lambda: real_monotonic() + 31)
+    _, lookups = _token_queries(client)
+
+    assert lookups == 1
+
+
+@override_settings(
+    TOKEN_AUTH_CACHE={"MAX_SIZE": 0, "SHARED_CACHE": "default"},
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+def test_shared_cache_tier_serves_and_invalidates_tokens():
+    """With only the shared tier enabled, lookups and revocations go through it."""
+
+    client, token = _token_client(UserFactory())
+    _token_queries(client)
+
+    _, cached_lookups = _token_queries(client)
+    key = token.key
+    token.delete()
+    response, _ = _token_queries(client)
+
+    assert cached_lookups == 0
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert token_cache.get(key) is None
+
+
+@override_settings(
+    TOKEN_AUTH_CACHE={"SHARED_CACHE": "default"},
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+def test_revocation_reaches_the_local_tier_of_other_workers():
+    """A token cached locally by another worker stops working once it is revoked."""
+
+    user = UserFactory()
+    client, token = _token_client(user)
+    _token_queries(client)
+    other_worker = TokenCache()
+    other_worker.set(token.key, (user, token), time.time())
+    key = token.key
+
+    token.delete()
+
+    assert other_worker.get(key) is None
+    assert token_cache.get(key) is None
+
+
+def test_revocation_survives_culling_of_the_token_cache(tmp_path):
+    """Filling the shared token cache past its limit must not drop revocation markers."""
+
+    def file_cache(name, **options):
+        return {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / name),
+            "OPTIONS": options,
+        }
+
+    caches = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        # Every cull empties the whole directory.
+        "auth_tokens": file_cache("tokens", MAX_ENTRIES=5, CULL_FREQUENCY=1),
+        "auth_revocations": file_cache("revocations", MAX_ENTRIES=10**9),
+    }
+    config = {"SHARED_CACHE": "auth_tokens", "REVOCATION_CACHE": "auth_revocations"}
+    with override_settings(CACHES=caches, TOKEN_AUTH_CACHE=config):
+        token_cache.clear()
+        user = UserFactory()
+        token = Token.objects.create(user=user)
+        other_worker = TokenCache()
+        other_worker.set(token.key, (user, token), time.time())
+        key = token.key
+
+        token.delete()
+        for _ in range(20):
+            other = Token.objects.create(user=UserFactory())
+            token_cache.set(other.key, (other.user, other), time.time())
+
+        assert other_worker.get(key) is None
+    token_cache.clear()
+
+
+def test_lookup_started_before_a_revocation_is_not_served():
+    """A pair read before the revocation committed is stored, but never used."""
+
+    user = UserFactory()
+    token = Token.objects.create(user=user)
+    looked_up_at = time.time()
+
+    user.save()
+    token_cache.set(token.key, (user, token), looked_up_at)
+
+    assert token_cache.get(token.key) is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revocation_is_repeated_after_commit():
+    """The revocation runs again once the transaction that made it has committed."""
+
+    user = UserFactory()
+    client, token = _token_client(user)
+    with transaction.atomic():
+        user.is_active = False
+        user.save()
+        # A concurrent request reads the still active user before the commit.
+        looked_up_at = time.time()
+        token_cache.set(token.key, (user, token), looked_up_at)
+        assert token_cache.get(token.key) is not None
+
+    assert token_cache.get(token.key) is None
+    assert client.get(reverse("tasks-list")).status_code == 401
@@ -0,0 +1,178 @@
+"""Integration tests for batched user and task deletion."""
+
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from tasks import services
+from tasks.models import Job, Task, TaskDailyStats, TaskTombstone, UserTaskSummary
+from tasks.services import delete_user, id_batches
+from tasks.stats import task_stats
+from tests.factories.tasks import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def _owned(auth_client, count=25, completed_every=2):
+    client, user = auth_client
+    client.post(
+        reverse("tasks-bulk"),
+        {
+            "create": [
+                {"title": f"T{i}", "is_completed": i % completed_every == 0}
+                for i in range(count)
+            ]
+        },
+        format="json",
+    )
+    client.delete(reverse("tasks-detail", args=[user.tasks.first().pk]))
+    Job.objects.create(user=user, kind="purge")
+    Token.objects.create(user=user)
+    return user
+
+
+def test_delete_user_removes_everything_in_bounded_batches(auth_client):
+    """Tasks go in ``DELETE ... WHERE id IN`` batches and are never loaded as rows."""
+
+    user = _owned(auth_client)
+    bystander = TaskFactory().user
+
+    with CaptureQueriesContext(connection) as queries:
+        deleted = delete_user(user, batch_size=10)
+
+    # The user's own cascade still issues one (by then empty) fast delete per model.
+    task_deletes = [
+        q["sql"]
+        for q in queries
+        if q["sql"].startswith('DELETE FROM "tasks_task" WHERE "tasks_task"."id" IN')
+    ]
+    assert deleted["tasks.Task"] == 24
+    assert deleted["tasks.TaskTombstone"] == 1
+    assert deleted["tasks.Job"] == 1
+    assert len(task_deletes) == 3
+    assert not any(
+        '"tasks_task"."title"' in q["sql"]
+        for q in queries
+        if q["sql"].startswith("SELECT")
+    )
+    assert not User.objects.filter(pk=user.pk).exists()
+    for model in (Task, TaskTombstone, TaskDailyStats, Job, UserTaskSummary, Token):
+        assert not model.objects.filter(user_id=user.pk).exists()
+    assert Task.objects.filter(user=bystander).count() == 1
+
+
+def test_tasks_only_command_keeps_tombstones_and_statistics(auth_client):
+    """Purging tasks through the command behaves like deleting them through the API."""
+
+    user = _owned(auth_client)
+    out = StringIO()
+
+    call_command(
+        "delete_users",
+        usernames=[user.username],
+        tasks_only=True,
+        completed_only=True,
+        batch_size=4,
+        stdout=out,
+    )
+
+    assert f"Deleted 12 tasks of {user.username}." in out.getvalue()
+    assert User.objects.filter(pk=user.pk).exists()
+    assert not user.tasks.filter(is_completed=True).exists()
+    assert TaskTombstone.objects.filter(user=user).count() == 13
+    assert task_stats(user, 30)["total"] == 12 == user.tasks.count()
+
+
+def test_command_deletes_users_by_id(auth_client):
+    """``--user`` deletes the account with its tasks; unknown users are an error."""
+
+    user = _owned(auth_client)
+    out = StringIO()
+
+    call_command("delete_users", user_ids=[user.pk], stdout=out)
+
+    assert f"Deleted {user.username} and 24 tasks." in out.getvalue()
+    assert not User.objects.filter(pk=user.pk).exists()
+    with pytest.raises(CommandError, match="No such users: 999999"):
+        call_command("delete_users", user_ids=[999999], stdout=StringIO())
+    with pytest.raises(CommandError):
+        call_command("delete_users", stdout=StringIO())
+
+
+# The admin deletes the user once the delete view's transaction has committed.
+@pytest.mark.django_db(transaction=True)
+def test_admin_confirmation_counts_rows_instead_of_listing_them(
+    admin_client, auth_client
+):
+    """The delete page summarizes the tasks, and confirming deletes them in batches."""
+
+    user = _owned(auth_client)
+    url = reverse("admin:auth_user_delete", args=[user.pk])
+
+    page = admin_client.get(url)
+
+    assert page.status_code == 200
+    assert dict(page.context["model_count"])["tasks"] == 24
+    assert "T1" not in page.content.decode()
+
+    response = admin_client.post(url, {"post": "yes"})
+
+    assert response.status_code == 302
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not Task.objects.filter(user_id=user.pk).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_admin_delete_batches_run_outside_the_view_transaction(
+    admin_client, auth_client, monkeypatch
+):
+    """Each batch of the admin delete is its own transaction, not a savepoint."""
+
+    user = _owned(auth_client)
+    in_atomic_block = []
+
+    def recording_batches(queryset, batch_size, pause):
+        for ids in id_batches(queryset, 10, 0):
+            in_atomic_block.append(connection.in_atomic_block)
+            yield ids
+
+    monkeypatch.setattr(services, "id_batches", recording_batches)
+
+    admin_client.post(
+        reverse("admin:auth_user_delete", args=[user.pk]), {"post": "yes"}
+    )
+
+    assert not User.objects.filter(pk=user.pk).exists()
+    # Three batches of tasks, then one of each other model the user has rows in.
+    assert len(in_atomic_block) == 6
+    assert not any(in_atomic_block)
+
+
+def test_admin_actions_delete_users_and_purge_tasks(admin_client, auth_client):
+    """The bulk delete action and the purge action both go through the batched path."""
+
+    user = _owned(auth_client)
+    other = TaskFactory().user
+    changelist = reverse("admin:auth_user_changelist")
+
+    admin_client.post(
+        changelist,
+        {"action": "purge_selected_tasks", "_selected_action": [user.pk]},
+    )
+
+    assert not user.tasks.exists()
+    assert task_stats(user, 30)["total"] == 0
+
+    admin_client.post(
+        changelist,
+        {"action": "delete_selected", "_selected_action": [other.pk], "post": "yes"},
+    )
+
+    assert not User.objects.filter(pk=other.pk).exists()
@@ -2,6 +2,14 @@
 ASGI config for todo_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server such as uvicorn::
+
+    uvicorn todo_project.asgi:application --workers 4
+
+Unless ``ASGI_ASYNC_API`` is ``False``, requests are routed through
+``todo_project.async_urls`` so the task API runs on the event loop, and static
+files are served by Django's async static handler instead of the sync-only
+WhiteNoise middleware (see ``SERVER_INTERFACE`` in settings).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -9,8 +17,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo_project.settings")
+os.environ.setdefault("DJANGO_SERVER_INTERFACE", "asgi")
 
 application = get_asgi_application()
+
+if settings.ASGI_ASYNC_API:
+    application = ASGIStaticFilesHandler(application)
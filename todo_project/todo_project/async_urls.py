@@ -0,0 +1,14 @@
+"""URLconf used by the ASGI entry point.
+
+Mounts the async task API in front of the regular URLconf, which still serves the admin,
+the API docs and the endpoints that have no async implementation.
+"""
+
+from django.urls import include, path
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path("api/", include("tasks.async_urls")),
+    *sync_urlpatterns,
+]
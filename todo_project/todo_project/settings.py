@@ -1,6 +1,8 @@
 """Django settings for todo_project project."""
 
 import os
+import tempfile
+from importlib.util import find_spec
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -22,6 +24,21 @@ DEBUG = os.getenv("DEBUG", "False") == "True"
 ALLOWED_HOSTS = ["*"]
 
 
+# Swagger UI, ReDoc and the OpenAPI schema. With API_DOCS_ENABLED=False their routes are not
+# mounted and neither drf_yasg nor the schema decorators in ``tasks.docs`` are imported, which
+# shortens worker startup (see ``manage.py profile_imports``).
+API_DOCS_ENABLED = os.getenv("API_DOCS_ENABLED", "True") == "True"
+
+# Apps only used while developing (django_extensions' shell_plus, show_urls, ...), as a
+# comma-separated DJANGO_DEV_APPS; installed by default only with DEBUG.
+DEV_APPS = [
+    app
+    for app in os.getenv("DJANGO_DEV_APPS", "django_extensions" if DEBUG else "").split(
+        ","
+    )
+    if app
+]
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -33,8 +50,8 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "rest_framework.authtoken",
-    "drf_yasg",
-    "django_extensions",
+    *(["drf_yasg"] if API_DOCS_ENABLED else []),
+    *DEV_APPS,
     "tasks",
 ]
 
@@ -51,6 +68,53 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "todo_project.urls"
 
+# ``todo_project.asgi`` sets DJANGO_SERVER_INTERFACE=asgi. There the async task API is mounted
+# and WhiteNoise, which only has a sync implementation and would hold a worker thread for every
+# request, is left out of the middleware chain; static files are served by the ASGI handler.
+SERVER_INTERFACE = os.getenv("DJANGO_SERVER_INTERFACE", "wsgi")
+ASGI_ASYNC_API = (
+    SERVER_INTERFACE == "asgi" and os.getenv("ASGI_ASYNC_API", "True") == "True"
+)
+if ASGI_ASYNC_API:
+    ROOT_URLCONF = "todo_project.async_urls"
+    MIDDLEWARE.remove("whitenoise.middleware.WhiteNoiseMiddleware")
+
+# Per-endpoint request metrics exposed at /metrics in the Prometheus text format, readable
+# with METRICS_AUTH_TOKEN as a bearer token or a staff session. Requests slower than
+# METRICS_SLOW_REQUEST_MS (0 disables it) are logged with their SQL.
+METRICS = {
+    "ENABLED": os.getenv("METRICS_ENABLED", "True") == "True",
+    "AUTH_TOKEN": os.getenv("METRICS_AUTH_TOKEN") or None,
+    "SLOW_REQUEST_MS": int(os.getenv("METRICS_SLOW_REQUEST_MS", "0")),
+    "EXCLUDED_ENDPOINTS": ["metrics"],
+}
+if METRICS["ENABLED"]:
+    MIDDLEWARE.insert(0, "tasks.middleware.MetricsMiddleware")
+
+# Requests under API_PATH_PREFIX (the ``tasks.urls`` routes) authenticate with tokens and skip
+# the middleware below, which only the admin, the API docs and static files use: each is
+# replaced by its ``tasks.middleware.Browser*`` subclass, which hands API requests straight to
+# the next middleware. API_LEAN_MIDDLEWARE=False runs the full stack for every request.
+API_PATH_PREFIX = "/api/"
+API_LEAN_MIDDLEWARE = os.getenv("API_LEAN_MIDDLEWARE", "True") == "True"
+BROWSER_ONLY_MIDDLEWARE = [
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+if API_LEAN_MIDDLEWARE:
+    MIDDLEWARE = [
+        (
+            "tasks.middleware.Browser" + path.rsplit(".", 1)[1]
+            if path in BROWSER_ONLY_MIDDLEWARE
+            else path
+        )
+        for path in MIDDLEWARE
+    ]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -72,12 +136,58 @@ WSGI_APPLICATION = "todo_project.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    # Django's psycopg pool and persistent connections are mutually exclusive.
+    DB_POOL = os.getenv("DB_POOL", "False") == "True"
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME", "todo"),
+            "USER": os.getenv("DB_USER", "todo"),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": (
+                {
+                    "pool": {
+                        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                        "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+                    }
+                }
+                if DB_POOL
+                else {}
+            ),
+        }
     }
-}
+elif DB_ENGINE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
+        }
+    }
+    if os.getenv("DB_SQLITE_TUNING", "True") == "True":
+        # WAL lets readers run alongside the single writer, IMMEDIATE transactions take the
+        # write lock up front instead of failing on upgrade, and busy_timeout makes writers
+        # queue for the lock instead of raising "database is locked".
+        DATABASES["default"]["OPTIONS"] = {
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                f"PRAGMA busy_timeout={int(os.getenv('DB_SQLITE_BUSY_TIMEOUT', '5000'))};"
+                f"PRAGMA mmap_size={int(os.getenv('DB_SQLITE_MMAP_SIZE', str(128 * 1024 * 1024)))};"
+            ),
+            "transaction_mode": "IMMEDIATE",
+        }
+else:
+    raise RuntimeError(
+        f"Unsupported DB_ENGINE {DB_ENGINE!r}. Use 'sqlite' or 'postgres'."
+    )
 
 
 # Password validation
@@ -98,16 +208,178 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing. PASSWORD_HASHER_PROFILE picks the hasher for new hashes; the stock Django
+# hashers stay listed so older hashes still verify and are upgraded on the next login.
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": "tasks.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "tasks.hashers.TunedScryptPasswordHasher",
+    "argon2": "tasks.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHER_PROFILE = os.getenv("PASSWORD_HASHER_PROFILE", "pbkdf2")
+if PASSWORD_HASHER_PROFILE not in PASSWORD_HASHER_PROFILES:
+    raise RuntimeError(
+        f"Unsupported PASSWORD_HASHER_PROFILE {PASSWORD_HASHER_PROFILE!r}. "
+        f"Use one of: {', '.join(PASSWORD_HASHER_PROFILES)}."
+    )
+if PASSWORD_HASHER_PROFILE == "argon2" and find_spec("argon2") is None:
+    raise RuntimeError("PASSWORD_HASHER_PROFILE=argon2 requires argon2-cffi.")
+
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE],
+    *(
+        hasher
+        for name, hasher in PASSWORD_HASHER_PROFILES.items()
+        if name != PASSWORD_HASHER_PROFILE
+    ),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
+# Hasher costs (changing one rehashes each password on its next login) and the size of the
+# process pool that computes hashes off the request thread (0 hashes inline).
+PASSWORD_HASHING = {
+    "PBKDF2_ITERATIONS": int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "1000000")),
+    "SCRYPT_WORK_FACTOR": int(os.getenv("PASSWORD_SCRYPT_WORK_FACTOR", str(2**14))),
+    "SCRYPT_BLOCK_SIZE": int(os.getenv("PASSWORD_SCRYPT_BLOCK_SIZE", "8")),
+    "SCRYPT_PARALLELISM": int(os.getenv("PASSWORD_SCRYPT_PARALLELISM", "1")),
+    "ARGON2_TIME_COST": int(os.getenv("PASSWORD_ARGON2_TIME_COST", "2")),
+    "ARGON2_MEMORY_COST": int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", "102400")),
+    "ARGON2_PARALLELISM": int(os.getenv("PASSWORD_ARGON2_PARALLELISM", "8")),
+    "WORKERS": int(os.getenv("PASSWORD_HASHING_WORKERS", "0")),
+}
+
+AUTHENTICATION_BACKENDS = ["tasks.backends.PooledHashingModelBackend"]
+
 # Django REST Framework configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "tasks.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_PAGINATION_CLASS": "tasks.pagination.TaskCursorPagination",
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "50")),
+    # orjson-backed JSON (stdlib fallback when orjson is missing), plus MessagePack through
+    # content negotiation when msgpack is installed.
+    "DEFAULT_RENDERER_CLASSES": [
+        "tasks.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "tasks.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Sliding-window limits (tasks.throttling); an empty variable disables the scope
+    "DEFAULT_THROTTLE_RATES": {
+        "auth_ip": os.getenv("THROTTLE_AUTH_IP_RATE", "20/min") or None,
+        "login_username": os.getenv("THROTTLE_LOGIN_USERNAME_RATE", "5/min") or None,
+        "token_failures": os.getenv("THROTTLE_TOKEN_FAILURES_RATE", "20/min") or None,
+        "tasks": os.getenv("THROTTLE_TASKS_RATE", "1200/min") or None,
+    },
+}
+if find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "tasks.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append("tasks.parsers.MessagePackParser")
+
+# Worker processes serving the application; gunicorn.conf.py exports its worker count as
+# WEB_CONCURRENCY. Caches kept per process are only coherent with a single one.
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Token lookups cached per process and in a shared Django cache alias (auth_tokens when
+# there are several workers). Token revocations reach the other workers through the
+# auth_revocations alias, which never culls its entries.
+TOKEN_AUTH_CACHE = {
+    "MAX_SIZE": int(os.getenv("TOKEN_AUTH_CACHE_SIZE", "1024")),
+    "TTL": int(os.getenv("TOKEN_AUTH_CACHE_TTL", "60")),
+    "SHARED_CACHE": os.getenv("TOKEN_AUTH_SHARED_CACHE")
+    or ("auth_tokens" if SERVER_WORKERS > 1 else None),
+    "REVOCATION_CACHE": os.getenv("TOKEN_AUTH_REVOCATION_CACHE")
+    or ("auth_revocations" if SERVER_WORKERS > 1 else None),
 }
 
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # Shared by every worker on the host, used by TASK_RESPONSE_CACHE_BACKEND=file
+    "task_responses": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv(
+            "TASK_RESPONSE_CACHE_DIR",
+            str(Path(tempfile.gettempdir()) / "todo_task_responses"),
+        ),
+        "TIMEOUT": int(os.getenv("TASK_RESPONSE_CACHE_TTL", "300")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("TASK_RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+        },
+    },
+    # Shared by every worker on the host, the default TOKEN_AUTH_SHARED_CACHE with several
+    "auth_tokens": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv(
+            "TOKEN_AUTH_CACHE_DIR",
+            str(Path(tempfile.gettempdir()) / "todo_auth_tokens"),
+        ),
+        "TIMEOUT": int(os.getenv("TOKEN_AUTH_CACHE_TTL", "60")),
+    },
+    # Revocation markers of TOKEN_AUTH_CACHE. Culling one would let a revoked token back in,
+    # so the limit is far above the number of users that can be revoked within a token TTL.
+    "auth_revocations": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv(
+            "TOKEN_AUTH_REVOCATION_DIR",
+            str(Path(tempfile.gettempdir()) / "todo_auth_revocations"),
+        ),
+        "TIMEOUT": int(os.getenv("TOKEN_AUTH_CACHE_TTL", "60")) + 1,
+        "OPTIONS": {"MAX_ENTRIES": 10**9},
+    },
+}
+
+# Rendered task list/detail responses cached per user: memory (one worker process only),
+# file (the task_responses alias, shared by all workers) or none
+TASK_RESPONSE_CACHE = {
+    "BACKEND": os.getenv("TASK_RESPONSE_CACHE_BACKEND", "none"),
+    "MAX_BYTES": int(os.getenv("TASK_RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    "TTL": int(os.getenv("TASK_RESPONSE_CACHE_TTL", "300")),
+    "FILE_CACHE": "task_responses",
+}
+
+# Rate limiter counts kept per process (memory) or in a Django cache alias (cache)
+THROTTLING = {
+    "ENABLED": os.getenv("THROTTLE_ENABLED", "True") == "True",
+    "BACKEND": os.getenv("THROTTLE_BACKEND", "memory"),
+    "CACHE": os.getenv("THROTTLE_CACHE", "default"),
+}
+
+# Background jobs run by `manage.py run_jobs`: pool size and kind (thread or process),
+# seconds between polls of an empty queue, where export jobs write their files and how long
+# they are kept, and the seconds a running job may go without reporting progress before it
+# is considered abandoned by a dead worker and marked failed
+JOBS = {
+    "WORKERS": int(os.getenv("JOBS_WORKERS", "2")),
+    "POOL": os.getenv("JOBS_POOL", "thread"),
+    "POLL_INTERVAL": float(os.getenv("JOBS_POLL_INTERVAL", "1.0")),
+    "EXPORT_DIR": os.getenv(
+        "JOBS_EXPORT_DIR", str(Path(tempfile.gettempdir()) / "todo_job_exports")
+    ),
+    "EXPORT_RETENTION_HOURS": float(os.getenv("JOBS_EXPORT_RETENTION_HOURS", "24")),
+    "STALE_AFTER": float(os.getenv("JOBS_STALE_AFTER", "3600")),
+}
+
+# Tombstones of deleted tasks are kept this long for delta sync clients
+TASK_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASK_TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Longest expected gap between stamping a task change and committing it. Delta sync
+# re-reads this much behind each cursor so late commits are not skipped.
+SYNC_LATE_COMMIT_WINDOW_SECONDS = int(
+    os.getenv("SYNC_LATE_COMMIT_WINDOW_SECONDS", "10")
+)
+
+# Responses stored for Idempotency-Key retries are replayed for this long
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -129,6 +401,11 @@ SWAGGER_USE_SESSION_AUTH = False
 
 SWAGGER_USE_COMPAT_RENDERERS = False
 
+# OpenAPI documents written by ``manage.py generate_openapi_schema`` (run in the Dockerfile)
+# and served from memory by the schema views. With DEBUG they are generated on first use
+# instead, so the docs follow the code.
+OPENAPI_SCHEMA_DIR = os.getenv("OPENAPI_SCHEMA_DIR", str(BASE_DIR / "openapi"))
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
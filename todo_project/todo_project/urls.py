@@ -1,28 +1,29 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Todo API",
-        default_version="v1",
-        description="API documentation for the Todo project.",
-        contact=openapi.Contact(email="support@example.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,  # allow public access to docs, only for demo
-    permission_classes=[permissions.AllowAny],  # no auth required to view docs for demo
-)
+from tasks import metrics_views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("tasks.urls")),
-    path(
-        "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
 ]
+
+if settings.API_DOCS_ENABLED:
+    # Imported here so that workers without the docs never load drf_yasg.
+    from tasks.schema_views import SchemaView
+
+    urlpatterns += [
+        path(
+            "swagger/",
+            SchemaView.with_ui("swagger", cache_timeout=0),
+            name="schema-swagger-ui",
+        ),
+        path(
+            "redoc/",
+            SchemaView.with_ui("redoc", cache_timeout=0),
+            name="schema-redoc",
+        ),
+    ]
+
+if settings.METRICS["ENABLED"]:
+    urlpatterns.append(path("metrics", metrics_views.metrics, name="metrics"))